@@ -0,0 +1,37 @@
+"""Import a settlement file and write the mismatch report as NDJSON.
+
+    python -m app.cli.import_payments settlements.csv --report mismatches.ndjson
+"""
+from app.database.db import SessionLocal
+from app.services.payment_import_service import PaymentImportService, iter_settlements, DEFAULT_CHUNK_SIZE
+import argparse
+import sys
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import card/bank settlements as payments")
+    parser.add_argument("path", help="CSV (with header) or NDJSON settlement file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--report", help="Mismatch report path (NDJSON); defaults to stdout")
+    args = parser.parse_args(argv)
+    
+    format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    report = open(args.report, "w") if args.report else sys.stdout
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as source:
+            summary = PaymentImportService(db).import_rows(
+                iter_settlements(source, format),
+                chunk_size=args.chunk_size,
+                on_mismatch=lambda item: report.write(item.model_dump_json() + "\n")
+            )
+    finally:
+        db.close()
+        if report is not sys.stdout:
+            report.close()
+    
+    print(summary.model_dump_json(exclude={"mismatches"}), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
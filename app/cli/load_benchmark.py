@@ -0,0 +1,588 @@
+"""Load benchmark: drive every API route in-process and record latency, throughput and queries.
+
+    alembic upgrade head && python -m app.cli.seed_dataset --sales 1000000
+    python -m app.cli.load_benchmark --requests 200 --concurrency 16 --output bench.json
+    python -m app.cli.load_benchmark --baseline bench.json          # exit 1 on regressions
+
+Requests go straight to the ASGI app (no sockets), with the lifespan running
+and all middleware in place, authenticated as the seeded benchmark admin.
+Each route in SCENARIOS gets --requests requests with --concurrency in
+flight; queries per request come from the X-Query-Count header. Routes
+the app serves that have no scenario are listed as not covered. The exit
+status is 1 if any route answered with an unexpected status, with or
+without a baseline.
+"""
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+class ASGIClient:
+    """Minimal in-process HTTP client for an ASGI app"""
+    
+    def __init__(self, app, headers: Optional[Dict[str, str]] = None):
+        self.app = app
+        self.headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json_body=None,
+        content: Optional[bytes] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        body = json.dumps(json_body).encode() if json_body is not None else (content or b"")
+        headers = list(self.headers) + [(b"host", b"benchmark"), (b"content-length", str(len(body)).encode())]
+        if json_body is not None:
+            headers.append((b"content-type", b"application/json"))
+        query = urlencode(params or {}, doseq=True).encode()
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query,
+            "root_path": "", "headers": headers, "client": ("127.0.0.1", 0), "server": ("benchmark", 80)
+        }
+        sent = False
+        status, response_headers, chunks = 0, {}, []
+        
+        async def receive():
+            nonlocal sent
+            if sent:
+                await asyncio.sleep(3600)
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+        
+        await self.app(scope, receive, send)
+        return status, response_headers, b"".join(chunks)
+
+class Context:
+    """Id pools for request builders: seeded rows plus rows created during the run"""
+    
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.ids: Dict[str, List[int]] = {}
+        self.created: Dict[str, List[int]] = {}
+        self.categories: List[str] = []
+        self.counter = itertools.count(int(time.time() * 1000))
+    
+    def pick(self, kind: str) -> int:
+        return self.rng.choice(self.ids[kind])
+    
+    def take_created(self, kind: str) -> Optional[int]:
+        pool = self.created.get(kind)
+        return pool.pop() if pool else None
+    
+    def unique(self) -> int:
+        return next(self.counter)
+
+class Scenario:
+    def __init__(self, method: str, path: str, build: Callable, expect=(200, 201), capture=None):
+        self.method = method
+        self.path = path
+        self.build = build
+        self.expect = expect
+        # Created ids go to ctx.created[kind]; a tuple of kinds fills them in turn
+        self.capture = (capture,) if isinstance(capture, str) else capture
+    
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.path}"
+
+SCENARIOS: List[Scenario] = []
+
+def scenario(method: str, path: str, expect=(200, 201), capture=None):
+    """Register a request builder: build(ctx) -> (path values, query params, JSON body or raw bytes)"""
+    def register(build):
+        SCENARIOS.append(Scenario(method, path, build, expect, capture))
+        return build
+    return register
+
+def _today(offset_days: int = 0) -> str:
+    return (date.today() + timedelta(days=offset_days)).isoformat()
+
+# --- auth ---------------------------------------------------------------------------------------
+@scenario("POST", "/api/auth/register")
+def _(ctx):
+    n = ctx.unique()
+    return {}, None, {"username": f"bench_{n}", "email": f"bench_{n}@example.com", "password": "bench-password"}
+
+@scenario("POST", "/api/auth/login")
+def _(ctx):
+    from app.cli.seed_dataset import BENCHMARK_PASSWORD, BENCHMARK_USERNAME
+    return {}, None, {"username": BENCHMARK_USERNAME, "password": BENCHMARK_PASSWORD}
+
+@scenario("GET", "/api/auth/me")
+def _(ctx):
+    return {}, None, None
+
+@scenario("POST", "/api/auth/logout")
+def _(ctx):
+    return {}, None, None
+
+# A wrong old password exercises the bcrypt verify without changing the benchmark login
+@scenario("POST", "/api/auth/change-password", expect=(401,))
+def _(ctx):
+    return {}, None, {"old_password": "not-the-password", "new_password": "x-new-password", "confirm_password": "x-new-password"}
+
+@scenario("PUT", "/api/auth/profile")
+def _(ctx):
+    return {}, None, {"full_name": f"Benchmark Admin {ctx.rng.randrange(100)}"}
+
+# --- products / customers / suppliers -----------------------------------------------------------
+@scenario("POST", "/api/products/", capture="products")
+def _(ctx):
+    n = ctx.unique()
+    return {}, None, {"name": f"Bench product {n}", "code": f"BP-{n}", "category": ctx.rng.choice(ctx.categories), "price": 1250000, "cost": 800000}
+
+@scenario("GET", "/api/products/")
+def _(ctx):
+    return {}, {"page": ctx.rng.randint(1, 5), "limit": 20}, None
+
+@scenario("GET", "/api/products/{product_id}")
+def _(ctx):
+    return {"product_id": ctx.pick("products")}, None, None
+
+@scenario("PUT", "/api/products/{product_id}")
+def _(ctx):
+    return {"product_id": ctx.pick("products")}, None, {"description": f"Updated {ctx.unique()}"}
+
+@scenario("DELETE", "/api/products/{product_id}", expect=(200, 204, 404))
+def _(ctx):
+    return {"product_id": ctx.take_created("products") or 0}, None, None
+
+@scenario("POST", "/api/customers/", capture="customers")
+def _(ctx):
+    n = ctx.unique()
+    return {}, None, {"name": f"Bench customer {n}", "phone": f"7{n % 10 ** 12:012d}", "city": "Hanoi"}
+
+@scenario("GET", "/api/customers/")
+def _(ctx):
+    return {}, {"page": ctx.rng.randint(1, 5), "limit": 20}, None
+
+@scenario("GET", "/api/customers/{customer_id}")
+def _(ctx):
+    return {"customer_id": ctx.pick("customers")}, None, None
+
+@scenario("PUT", "/api/customers/{customer_id}")
+def _(ctx):
+    customer_id = ctx.pick("customers")
+    return {"customer_id": customer_id}, None, {"name": f"Customer {customer_id}", "city": ctx.rng.choice(["Hanoi", "Hue"])}
+
+@scenario("DELETE", "/api/customers/{customer_id}", expect=(200, 204, 404))
+def _(ctx):
+    return {"customer_id": ctx.take_created("customers") or 0}, None, None
+
+@scenario("POST", "/api/suppliers/", capture="suppliers")
+def _(ctx):
+    return {}, None, {"name": f"Bench supplier {ctx.unique()}", "city": "Da Nang"}
+
+@scenario("GET", "/api/suppliers/")
+def _(ctx):
+    return {}, {"page": 1, "limit": 20}, None
+
+@scenario("GET", "/api/suppliers/{supplier_id}")
+def _(ctx):
+    return {"supplier_id": ctx.pick("suppliers")}, None, None
+
+@scenario("PUT", "/api/suppliers/{supplier_id}")
+def _(ctx):
+    supplier_id = ctx.pick("suppliers")
+    return {"supplier_id": supplier_id}, None, {"name": f"Supplier {supplier_id}", "country": "Vietnam"}
+
+@scenario("DELETE", "/api/suppliers/{supplier_id}", expect=(200, 204, 404))
+def _(ctx):
+    return {"supplier_id": ctx.take_created("suppliers") or 0}, None, None
+
+# --- sales / payments ---------------------------------------------------------------------------
+@scenario("POST", "/api/sales/", capture="sales")
+def _(ctx):
+    items = [{"product_id": ctx.pick("products"), "quantity": 1, "unit_price": 100000} for _ in range(ctx.rng.randint(1, 3))]
+    total = 100000 * len(items)
+    return {}, None, {"customer_id": ctx.pick("customers"), "total_amount": total, "final_amount": total, "items": items, "apply_promotions": True}
+
+@scenario("GET", "/api/sales/")
+def _(ctx):
+    return {}, {"page": ctx.rng.randint(1, 5), "limit": 20}, None
+
+@scenario("GET", "/api/sales/outstanding")
+def _(ctx):
+    return {}, {"page": 1, "limit": 20}, None
+
+@scenario("GET", "/api/sales/{sale_id}")
+def _(ctx):
+    return {"sale_id": ctx.pick("sales")}, None, None
+
+@scenario("PUT", "/api/sales/{sale_id}")
+def _(ctx):
+    return {"sale_id": ctx.pick("sales")}, None, {"status": "completed", "notes": f"Checked {ctx.unique()}"}
+
+@scenario("DELETE", "/api/sales/{sale_id}", expect=(200, 204, 400, 404))
+def _(ctx):
+    return {"sale_id": ctx.take_created("sales") or 0}, None, None
+
+@scenario("POST", "/api/payments/", expect=(200, 201, 400), capture="payments")
+def _(ctx):
+    return {}, None, {"sale_id": ctx.pick("unpaid_sales"), "payment_method": "cash", "amount": 1000, "reference_number": f"BP-{ctx.unique()}"}
+
+@scenario("POST", "/api/payments/import")
+def _(ctx):
+    rows = [f"BENCH-IMPORT-{ctx.unique()},{ctx.pick('invoices')},1000,card" for _ in range(20)]
+    return {}, {"format": "csv"}, ("reference_number,invoice_number,amount,payment_method\n" + "\n".join(rows) + "\n").encode()
+
+@scenario("GET", "/api/payments/")
+def _(ctx):
+    return {}, {"page": ctx.rng.randint(1, 5), "limit": 20}, None
+
+@scenario("GET", "/api/payments/{payment_id}")
+def _(ctx):
+    return {"payment_id": ctx.pick("payments")}, None, None
+
+@scenario("PUT", "/api/payments/{payment_id}")
+def _(ctx):
+    return {"payment_id": ctx.pick("payments")}, None, {"status": "completed", "notes": "Reconciled"}
+
+@scenario("DELETE", "/api/payments/{payment_id}", expect=(200, 204, 404))
+def _(ctx):
+    return {"payment_id": ctx.take_created("payments") or 0}, None, None
+
+# --- inventory ----------------------------------------------------------------------------------
+@scenario("GET", "/api/inventory/")
+def _(ctx):
+    return {}, {"skip": ctx.rng.randrange(0, 100), "limit": 50}, None
+
+@scenario("GET", "/api/inventory/product/{product_id}")
+def _(ctx):
+    return {"product_id": ctx.pick("products")}, None, None
+
+@scenario("GET", "/api/inventory/product/{product_id}/stock-at")
+def _(ctx):
+    return {"product_id": ctx.pick("products")}, {"at": datetime.now().isoformat(timespec="seconds")}, None
+
+@scenario("GET", "/api/inventory/product/{product_id}/movements")
+def _(ctx):
+    return {"product_id": ctx.pick("products")}, {"start": _today(-30) + "T00:00:00", "end": _today(1) + "T00:00:00"}, None
+
+@scenario("POST", "/api/inventory/snapshots/compact")
+def _(ctx):
+    return {}, None, None
+
+@scenario("POST", "/api/inventory/transaction")
+def _(ctx):
+    return {}, None, {"product_id": ctx.pick("products"), "quantity": 5, "transaction_type": "in", "reason": "Benchmark receipt"}
+
+@scenario("POST", "/api/inventory/transaction/batch")
+def _(ctx):
+    transactions = [
+        {"product_id": ctx.pick("products"), "quantity": 1, "transaction_type": "in", "reason": "Benchmark batch"}
+        for _ in range(20)
+    ]
+    return {}, None, {"transactions": transactions, "atomic": False}
+
+@scenario("GET", "/api/inventory/transactions")
+def _(ctx):
+    return {}, {"skip": 0, "limit": 50}, None
+
+@scenario("GET", "/api/inventory/low-stock/list")
+def _(ctx):
+    return {}, None, None
+
+# Alternate new reservations between the commit and release pools so both have work
+@scenario("POST", "/api/inventory/reservations", expect=(200, 201, 400, 409), capture=("reservations_commit", "reservations_release"))
+def _(ctx):
+    return {}, None, {"product_id": ctx.pick("products"), "quantity": 1, "ttl_seconds": 60}
+
+@scenario("POST", "/api/inventory/reservations/{reservation_id}/commit", expect=(200, 404, 409))
+def _(ctx):
+    return {"reservation_id": ctx.take_created("reservations_commit") or 0}, None, None
+
+@scenario("POST", "/api/inventory/reservations/{reservation_id}/release", expect=(200, 404, 409))
+def _(ctx):
+    return {"reservation_id": ctx.take_created("reservations_release") or 0}, None, None
+
+# --- promotions ---------------------------------------------------------------------------------
+@scenario("POST", "/api/promotions/", capture="promotions")
+def _(ctx):
+    return {}, None, {
+        "name": f"Bench promotion {ctx.unique()}", "discountType": "PERCENTAGE", "discountValue": 10,
+        "startDate": _today(), "endDate": _today(30), "product_ids": ctx.rng.sample(ctx.ids["products"], 20)
+    }
+
+@scenario("GET", "/api/promotions/")
+def _(ctx):
+    return {}, {"page": 1, "limit": 20}, None
+
+@scenario("GET", "/api/promotions/active/list")
+def _(ctx):
+    return {}, None, None
+
+@scenario("GET", "/api/promotions/pricing/best")
+def _(ctx):
+    return {}, {"product_ids": ctx.rng.sample(ctx.ids["products"], 10)}, None
+
+@scenario("GET", "/api/promotions/{promotion_id}")
+def _(ctx):
+    return {"promotion_id": ctx.pick("promotions")}, None, None
+
+@scenario("PUT", "/api/promotions/{promotion_id}")
+def _(ctx):
+    return {"promotion_id": ctx.pick("promotions")}, None, {
+        "name": f"Promotion {ctx.unique()}", "discountType": "PERCENTAGE", "discountValue": 15,
+        "startDate": _today(-1), "endDate": _today(45)
+    }
+
+@scenario("PATCH", "/api/promotions/{promotion_id}/products")
+def _(ctx):
+    return {"promotion_id": ctx.pick("promotions")}, None, {"add_product_ids": ctx.rng.sample(ctx.ids["products"], 5)}
+
+@scenario("DELETE", "/api/promotions/{promotion_id}", expect=(200, 204, 404))
+def _(ctx):
+    return {"promotion_id": ctx.take_created("promotions") or 0}, None, None
+
+# --- reports / archive / admin / misc -----------------------------------------------------------
+@scenario("GET", "/api/reports/dashboard/summary")
+def _(ctx):
+    return {}, None, None
+
+@scenario("GET", "/api/reports/revenue")
+def _(ctx):
+    return {}, {"days": 30}, None
+
+@scenario("GET", "/api/reports/top-products")
+def _(ctx):
+    return {}, {"limit": 10}, None
+
+@scenario("GET", "/api/reports/customers")
+def _(ctx):
+    return {}, {"page": 1, "limit": 20}, None
+
+@scenario("GET", "/api/reports/inventory")
+def _(ctx):
+    return {}, {"page": 1, "limit": 20}, None
+
+# A horizon past every seeded sale measures the candidate scan without moving the dataset
+@scenario("POST", "/api/archive/run")
+def _(ctx):
+    return {}, {"horizon_days": 36500}, None
+
+@scenario("GET", "/api/admin/slow-queries")
+def _(ctx):
+    return {}, {"limit": 50}, None
+
+@scenario("DELETE", "/api/admin/slow-queries")
+def _(ctx):
+    return {}, None, None
+
+@scenario("GET", "/api/admin/profiles")
+def _(ctx):
+    return {}, None, None
+
+@scenario("GET", "/api/admin/profiles/{name}", expect=(200, 404))
+def _(ctx):
+    return {"name": "missing.speedscope.json"}, None, None
+
+@scenario("GET", "/")
+def _(ctx):
+    return {}, None, None
+
+@scenario("GET", "/health")
+def _(ctx):
+    return {}, None, None
+
+@scenario("GET", "/metrics")
+def _(ctx):
+    return {}, None, None
+
+def load_context(rng: random.Random, sample_size: int = 10000) -> Context:
+    """Sample seeded ids for request builders (bounded, so huge tables stay cheap)"""
+    from app.database.db import engine
+    from app.database.models import Customer, Payment, Product, Promotion, Sale, Supplier
+    from sqlalchemy import distinct, select
+    
+    ctx = Context(rng)
+    with engine.connect() as connection:
+        for kind, column in (
+            ("products", Product.id), ("customers", Customer.id), ("suppliers", Supplier.id),
+            ("sales", Sale.id), ("payments", Payment.id), ("promotions", Promotion.id)
+        ):
+            ctx.ids[kind] = list(connection.execute(select(column).order_by(column.desc()).limit(sample_size)).scalars())
+        ctx.ids["unpaid_sales"] = list(connection.execute(
+            select(Sale.id).where(Sale.final_amount > Sale.amount_paid + 1000000).limit(sample_size)
+        ).scalars())
+        ctx.ids["invoices"] = list(connection.execute(
+            select(Sale.invoice_number).where(Sale.final_amount > Sale.amount_paid + 1000000).limit(sample_size)
+        ).scalars())
+        ctx.categories = [c for c in connection.execute(select(distinct(Product.category))).scalars() if c]
+    missing = [kind for kind, ids in ctx.ids.items() if not ids]
+    if missing:
+        raise SystemExit(f"No seeded rows for {', '.join(missing)}; run python -m app.cli.seed_dataset first")
+    return ctx
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+async def run_scenario(client: ASGIClient, ctx: Context, item: Scenario, requests: int, concurrency: int) -> dict:
+    latencies, queries, statuses = [], [], {}
+    errors = 0
+    remaining = iter(range(requests))
+    
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            path_values, params, body = item.build(ctx)
+            path = item.path.format(**path_values)
+            started = time.perf_counter()
+            if isinstance(body, bytes):
+                status, headers, content = await client.request(item.method, path, params, content=body)
+            else:
+                status, headers, content = await client.request(item.method, path, params, json_body=body)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            if "x-query-count" in headers:
+                queries.append(int(headers["x-query-count"]))
+            if status not in item.expect:
+                errors += 1
+            elif item.capture and status in (200, 201):
+                created_id = (json.loads(content).get("data") or {}).get("id")
+                if created_id:
+                    kind = min(item.capture, key=lambda k: len(ctx.created.get(k, ())))
+                    ctx.created.setdefault(kind, []).append(created_id)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None
+    }
+
+def coverage(app) -> Tuple[List[str], List[str]]:
+    """(routes with no scenario, scenarios with no route)"""
+    from fastapi.routing import APIRoute
+    served = {f"{method} {route.path}" for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    driven = {item.key for item in SCENARIOS}
+    return sorted(served - driven), sorted(driven - served)
+
+def compare(result: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Endpoints whose p95 grew by more than `tolerance` (and `min_delta_ms`) or whose queries per request grew"""
+    regressions = []
+    for key, now in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(key)
+        if not before:
+            continue
+        delta = now["p95_ms"] - before["p95_ms"]
+        if delta > min_delta_ms and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {before['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms")
+        if (now["queries_per_request"] or 0) > (before["queries_per_request"] or 0) + 0.5:
+            regressions.append(f"{key}: queries/request {before['queries_per_request']} -> {now['queries_per_request']}")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{key}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+async def run(args) -> dict:
+    from app.main import app
+    from app.cli.seed_dataset import ensure_benchmark_user
+    from app.core.security import create_access_token
+    
+    rng = random.Random(args.seed)
+    client = ASGIClient(app, {"Authorization": f"Bearer {create_access_token({'sub': ensure_benchmark_user()})}"})
+    selected = [item for item in SCENARIOS if not args.only or any(part in item.key for part in args.only)]
+    endpoints = {}
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        ctx = load_context(rng)
+        for item in selected:
+            endpoints[item.key] = await run_scenario(client, ctx, item, args.requests, args.concurrency)
+            stats = endpoints[item.key]
+            print(
+                f"{item.key:58} p50 {stats['p50_ms']:8.2f}  p95 {stats['p95_ms']:8.2f}  p99 {stats['p99_ms']:8.2f} ms"
+                f"  {stats['rps']:8.1f} rps  q/req {stats['queries_per_request']}  errors {stats['errors']}"
+            )
+    elapsed = time.perf_counter() - started
+    not_covered, stale = coverage(app)
+    
+    from app.core.config import settings
+    total_requests = sum(e["requests"] for e in endpoints.values())
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "database": settings.DATABASE_URL.split("://")[0],
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed
+        },
+        "totals": {
+            "requests": total_requests,
+            "errors": sum(e["errors"] for e in endpoints.values()),
+            "elapsed_s": round(elapsed, 2),
+            "rps": round(total_requests / elapsed, 1) if elapsed else 0.0
+        },
+        "endpoints": endpoints,
+        "not_covered": not_covered,
+        "stale_scenarios": stale
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every API route in-process")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per endpoint")
+    parser.add_argument("--only", nargs="*", help="Only scenarios whose 'METHOD /path' contains one of these")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Previous --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore p95 changes smaller than this")
+    args = parser.parse_args(argv)
+    
+    # Keep request and N+1 warning logs out of the measurement unless asked for
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    result = asyncio.run(run(args))
+    totals = result["totals"]
+    print(f"\n{totals['requests']} requests in {totals['elapsed_s']}s ({totals['rps']} rps), {totals['errors']} errors")
+    if result["not_covered"]:
+        print(f"Routes without a scenario: {', '.join(result['not_covered'])}")
+    if result["stale_scenarios"]:
+        print(f"Scenarios for routes that no longer exist: {', '.join(result['stale_scenarios'])}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    failed = [key for key, stats in result["endpoints"].items() if stats["errors"]]
+    for key in failed:
+        print(f"ERRORS {key}: {result['endpoints'][key]['errors']} unexpected statuses {result['endpoints'][key]['statuses']}", file=sys.stderr)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if failed or regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
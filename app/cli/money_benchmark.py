@@ -0,0 +1,183 @@
+"""Money aggregation benchmark: SUM over FLOAT vs BIGINT minor units (Money) vs DECIMAL.
+
+    python -m app.cli.money_benchmark --rows 1000000 --output money.json
+    python -m app.cli.money_benchmark --database-url mysql+pymysql://user:pw@host/scratch
+
+The same random line amounts are loaded into one scratch table per column
+type. The report-shaped aggregates (grand total, per day, per product) are
+then timed through SQLAlchemy, including turning every result into an exact
+Decimal the way ReportService hands it out. Every result is checked against
+the exact total, both as returned by the database and after rounding to
+the minor unit, so drift shows up next to the timing. On SQLite a DECIMAL
+column is stored as REAL. The scratch tables are dropped afterwards.
+"""
+from app.core.money import MINOR_UNIT_SCALE, to_money
+from app.database.types import Money
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import Column, Date, Float, Integer, MetaData, Numeric, Table, create_engine, func, select
+from typing import Dict
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+COLUMN_TYPES = {
+    "float": Float,
+    "bigint_minor_units": Money,
+    "decimal": Numeric(14, 2),
+}
+
+def _tables(metadata: MetaData) -> Dict[str, Table]:
+    return {
+        name: Table(
+            f"money_benchmark_{name}", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("product_id", Integer, nullable=False),
+            Column("sale_date", Date, nullable=False),
+            Column("amount", column_type, nullable=False)
+        )
+        for name, column_type in COLUMN_TYPES.items()
+    }
+
+def _load(engine, tables: Dict[str, Table], rows: int, products: int, days: int, seed: int, batch_size: int = 20000):
+    """Insert identical rows into every table; returns exact totals (minor units) per query shape"""
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=days)
+    exact = {"total": {None: 0}, "by_day": {}, "by_product": {}}
+    for start in range(0, rows, batch_size):
+        batch = []
+        for row_id in range(start, min(rows, start + batch_size)):
+            units = rng.randrange(1, 10 ** 7)
+            product_id = rng.randrange(products)
+            sale_date = first_day + timedelta(days=rng.randrange(days))
+            batch.append((row_id, product_id, sale_date, units))
+            exact["total"][None] += units
+            exact["by_day"][sale_date] = exact["by_day"].get(sale_date, 0) + units
+            exact["by_product"][product_id] = exact["by_product"].get(product_id, 0) + units
+        
+        # Float gets the float the old code stored; Money and DECIMAL get the exact amount
+        with engine.begin() as connection:
+            for name, table in tables.items():
+                connection.execute(table.insert(), [
+                    {
+                        "id": row_id, "product_id": product_id, "sale_date": sale_date,
+                        "amount": units / MINOR_UNIT_SCALE if name == "float" else Decimal(units) / MINOR_UNIT_SCALE
+                    }
+                    for row_id, product_id, sale_date, units in batch
+                ])
+    return {
+        shape: {key: Decimal(units) / MINOR_UNIT_SCALE for key, units in totals.items()}
+        for shape, totals in exact.items()
+    }
+
+def _queries(table: Table):
+    return {
+        "total": select(func.sum(table.c.amount)),
+        "by_day": select(table.c.sale_date, func.sum(table.c.amount)).group_by(table.c.sale_date),
+        "by_product": select(table.c.product_id, func.sum(table.c.amount)).group_by(table.c.product_id),
+    }
+
+def _run_query(connection, shape: str, query) -> dict:
+    """Execute and convert every SUM to an exact money Decimal; returns {group: (raw SUM, money)}"""
+    if shape == "total":
+        total = connection.execute(query).scalar()
+        return {None: (total, to_money(total))}
+    return {key: (total, to_money(total)) for key, total in connection.execute(query)}
+
+def run(database_url: str, rows: int, products: int, days: int, repeat: int, seed: int) -> dict:
+    engine = create_engine(database_url)
+    metadata = MetaData()
+    tables = _tables(metadata)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    try:
+        started = time.perf_counter()
+        exact = _load(engine, tables, rows, products, days, seed)
+        load_s = time.perf_counter() - started
+        
+        results: Dict[str, Dict[str, dict]] = {}
+        with engine.connect() as connection:
+            for name, table in tables.items():
+                for shape, query in _queries(table).items():
+                    _run_query(connection, shape, query)  # warm the page cache
+                    timings = []
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        totals = _run_query(connection, shape, query)
+                        timings.append(time.perf_counter() - started)
+                    errors = [abs(totals[key][1] - expected) for key, expected in exact[shape].items()]
+                    # What the old float comparisons (e.g. total_paid + amount > final_amount) saw
+                    raw_inexact = sum(
+                        1 for key, expected in exact[shape].items() if Decimal(totals[key][0]) != expected
+                    )
+                    results.setdefault(shape, {})[name] = {
+                        "median_ms": round(statistics.median(timings) * 1000, 3),
+                        "min_ms": round(min(timings) * 1000, 3),
+                        "groups": len(errors),
+                        "raw_inexact_groups": raw_inexact,
+                        "inexact_groups": sum(1 for e in errors if e),
+                        "max_error": str(max(errors))
+                    }
+        return {
+            "meta": {
+                "database": engine.dialect.name,
+                "rows": rows,
+                "products": products,
+                "days": days,
+                "repeat": repeat,
+                "load_s": round(load_s, 2)
+            },
+            "results": results
+        }
+    finally:
+        metadata.drop_all(engine)
+        engine.dispose()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SUM aggregates over float, integer minor-unit and decimal money columns")
+    parser.add_argument("--database-url", help="Scratch database (default: a temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args(argv)
+    
+    # SQLite has no DECIMAL storage; SQLAlchemy warns that it converts through float, which is the point
+    warnings.filterwarnings("ignore", message=".*does \\*not\\* support Decimal objects natively.*")
+    scratch_dir = None
+    database_url = args.database_url
+    if not database_url:
+        scratch_dir = tempfile.mkdtemp(prefix="money_benchmark_")
+        database_url = f"sqlite:///{os.path.join(scratch_dir, 'money.db')}"
+    try:
+        result = run(database_url, args.rows, args.products, args.days, args.repeat, args.seed)
+    finally:
+        if scratch_dir:
+            for name in os.listdir(scratch_dir):
+                os.remove(os.path.join(scratch_dir, name))
+            os.rmdir(scratch_dir)
+    
+    meta = result["meta"]
+    print(f"{meta['rows']:,} rows on {meta['database']} (loaded in {meta['load_s']}s), median of {meta['repeat']}")
+    for shape, by_type in result["results"].items():
+        for name, stats in by_type.items():
+            print(
+                f"{shape:11} {name:19} {stats['median_ms']:9.2f} ms"
+                f"  raw SUM inexact in {stats['raw_inexact_groups']}/{stats['groups']} groups,"
+                f" after rounding {stats['inexact_groups']} (max error {stats['max_error']})"
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
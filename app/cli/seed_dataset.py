@@ -0,0 +1,286 @@
+"""Seed a synthetic furniture-shop dataset for benchmarks.
+
+    alembic upgrade head
+    python -m app.cli.seed_dataset --products 5000 --customers 50000 --sales 2000000
+
+Rows are generated deterministically from --seed and inserted with Core
+executemany in --batch-size chunks, with explicit ids so sale items and
+payments can reference their sales without reading them back. Sales are
+spread over the last --days days; roughly --paid-ratio of them are paid in
+full, the rest partially or not at all.
+"""
+from app.core.security import hash_password
+from app.database.db import engine
+from app.database.models import (
+    Customer, Inventory, InventoryTransaction, Payment, Product, Promotion, Sale, SaleItem, Supplier, User,
+    promotion_product
+)
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import func, insert, select
+from typing import Dict, List
+import argparse
+import random
+import sys
+import time
+
+BENCHMARK_USERNAME = "bench_admin"
+BENCHMARK_PASSWORD = "bench-password"
+
+CATEGORIES = ["sofa", "chair", "table", "bed", "wardrobe", "shelf", "desk", "cabinet", "lamp", "rug"]
+MATERIALS = ["oak", "walnut", "pine", "steel", "rattan", "velvet", "leather", "linen", "marble", "glass"]
+CITIES = ["Hanoi", "Ho Chi Minh City", "Da Nang", "Hai Phong", "Can Tho", "Hue", "Nha Trang"]
+PAYMENT_METHODS = ["CASH", "CARD", "BANK_TRANSFER"]
+
+def _next_id(connection, model) -> int:
+    return (connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+def _insert_batches(table, rows, batch_size: int) -> int:
+    """Insert an iterable of row dicts in executemany batches, one transaction per batch"""
+    count = 0
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            with engine.begin() as connection:
+                connection.execute(insert(table), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        with engine.begin() as connection:
+            connection.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+def ensure_benchmark_user() -> str:
+    """Admin account the load benchmark authenticates as"""
+    with engine.begin() as connection:
+        exists = connection.execute(select(User.id).where(User.username == BENCHMARK_USERNAME)).scalar()
+        if not exists:
+            connection.execute(insert(User), [{
+                "username": BENCHMARK_USERNAME,
+                "email": "bench_admin@example.com",
+                "hashed_password": hash_password(BENCHMARK_PASSWORD),
+                "full_name": "Benchmark Admin",
+                "role": "admin",
+                "is_active": True
+            }])
+    return BENCHMARK_USERNAME
+
+def seed(
+    products: int = 1000,
+    customers: int = 10000,
+    suppliers: int = 50,
+    sales: int = 100000,
+    items_per_sale: int = 3,
+    promotions: int = 20,
+    days: int = 1095,
+    paid_ratio: float = 0.8,
+    batch_size: int = 5000,
+    seed_value: int = 42
+) -> Dict[str, int]:
+    rng = random.Random(seed_value)
+    counts: Dict[str, int] = {}
+    ensure_benchmark_user()
+    with engine.connect() as connection:
+        user_id = connection.execute(select(User.id).where(User.username == BENCHMARK_USERNAME)).scalar()
+        first = {model: _next_id(connection, model) for model in (Supplier, Product, Customer, Sale, SaleItem, Payment, Promotion)}
+    
+    supplier_ids = range(first[Supplier], first[Supplier] + suppliers)
+    counts["suppliers"] = _insert_batches(Supplier, (
+        {
+            "id": supplier_id,
+            "name": f"{rng.choice(MATERIALS).title()} Works {supplier_id}",
+            "email": f"supplier{supplier_id}@example.com",
+            "phone": f"09{supplier_id:08d}",
+            "city": rng.choice(CITIES),
+            "country": "Vietnam"
+        }
+        for supplier_id in supplier_ids
+    ), batch_size)
+    
+    product_ids = range(first[Product], first[Product] + products)
+    prices = {}
+    def product_rows():
+        for product_id in product_ids:
+            category = rng.choice(CATEGORIES)
+            price = Decimal(rng.randrange(50, 5000)) * 1000
+            prices[product_id] = price
+            yield {
+                "id": product_id,
+                "name": f"{rng.choice(MATERIALS).title()} {category} {product_id}",
+                "code": f"BENCH-{product_id:07d}",
+                "category": category,
+                "price": price,
+                "cost": price * Decimal("0.6"),
+                "supplier_id": rng.choice(supplier_ids) if suppliers else None,
+                "is_active": True
+            }
+    counts["products"] = _insert_batches(Product, product_rows(), batch_size)
+    
+    with engine.connect() as connection:
+        first_inventory = _next_id(connection, Inventory)
+    stock = {product_id: rng.randrange(0, 200) for product_id in product_ids}
+    counts["inventory"] = _insert_batches(Inventory, (
+        {
+            "id": first_inventory + i,
+            "product_id": product_id,
+            "quantity_on_hand": stock[product_id],
+            "quantity_reserved": 0,
+            "reorder_level": 10,
+            "reorder_quantity": 50,
+            "is_low_stock": stock[product_id] <= 10
+        }
+        for i, product_id in enumerate(product_ids)
+    ), batch_size)
+    counts["inventory_transactions"] = _insert_batches(InventoryTransaction, (
+        {
+            "inventory_id": first_inventory + i,
+            "transaction_type": "IN",
+            "quantity": stock[product_id],
+            "reason": "Opening stock",
+            "reference_number": f"OPEN-{product_id}"
+        }
+        for i, product_id in enumerate(product_ids) if stock[product_id]
+    ), batch_size)
+    
+    customer_ids = range(first[Customer], first[Customer] + customers)
+    counts["customers"] = _insert_batches(Customer, (
+        {
+            "id": customer_id,
+            "name": f"Customer {customer_id}",
+            "email": f"customer{customer_id}@example.com",
+            "phone": f"08{customer_id:09d}",
+            "city": rng.choice(CITIES),
+            "country": "Vietnam"
+        }
+        for customer_id in customer_ids
+    ), batch_size)
+    
+    # Sales, their items and payments are generated together and flushed per batch
+    now = datetime.now().replace(microsecond=0)
+    sale_batch, item_batch, payment_batch = [], [], []
+    counts.update({"sales": 0, "sale_items": 0, "payments": 0})
+    item_id, payment_id = first[SaleItem], first[Payment]
+    
+    def flush():
+        with engine.begin() as connection:
+            connection.execute(insert(Sale), sale_batch)
+            connection.execute(insert(SaleItem), item_batch)
+            if payment_batch:
+                connection.execute(insert(Payment), payment_batch)
+        counts["sales"] += len(sale_batch)
+        counts["sale_items"] += len(item_batch)
+        counts["payments"] += len(payment_batch)
+        sale_batch.clear()
+        item_batch.clear()
+        payment_batch.clear()
+    
+    for sale_id in range(first[Sale], first[Sale] + sales):
+        sale_date = now - timedelta(seconds=rng.randrange(days * 86400))
+        total = Decimal(0)
+        for _ in range(rng.randint(1, max(1, 2 * items_per_sale - 1))):
+            product_id = rng.choice(product_ids)
+            quantity = rng.randint(1, 4)
+            line_total = prices[product_id] * quantity
+            total += line_total
+            item_batch.append({
+                "id": item_id,
+                "sale_id": sale_id,
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": prices[product_id],
+                "discount": 0,
+                "line_total": line_total
+            })
+            item_id += 1
+        roll = rng.random()
+        paid = total if roll < paid_ratio else (total / 2 if roll < (1 + paid_ratio) / 2 else Decimal(0))
+        sale_batch.append({
+            "id": sale_id,
+            "invoice_number": f"BENCH-INV-{sale_id:09d}",
+            "customer_id": rng.choice(customer_ids),
+            "user_id": user_id,
+            "sale_date": sale_date,
+            "total_amount": total,
+            "discount": 0,
+            "tax": 0,
+            "final_amount": total,
+            "amount_paid": paid,
+            "status": "completed" if rng.random() < 0.97 else "canceled",
+            "created_at": sale_date,
+            "updated_at": sale_date
+        })
+        if paid:
+            payment_batch.append({
+                "id": payment_id,
+                "sale_id": sale_id,
+                "payment_method": rng.choice(PAYMENT_METHODS),
+                "amount": paid,
+                "payment_date": sale_date,
+                "status": "completed",
+                "reference_number": f"BENCH-PAY-{payment_id:09d}"
+            })
+            payment_id += 1
+        if len(sale_batch) >= batch_size:
+            flush()
+    if sale_batch:
+        flush()
+    
+    today = date.today()
+    promotion_ids = range(first[Promotion], first[Promotion] + promotions)
+    counts["promotions"] = _insert_batches(Promotion, (
+        {
+            "id": promotion_id,
+            "name": f"Promotion {promotion_id}",
+            "discount_type": "PERCENTAGE" if promotion_id % 2 else "FIXED",
+            "discount_value": rng.choice([5, 10, 15, 20]) if promotion_id % 2 else rng.choice([50000, 100000]),
+            "min_purchase": 0,
+            "start_date": today - timedelta(days=rng.randrange(0, 30)),
+            "end_date": today + timedelta(days=rng.randrange(0, 60)),
+            "is_active": True
+        }
+        for promotion_id in promotion_ids
+    ), batch_size)
+    counts["promotion_products"] = _insert_batches(promotion_product, (
+        {"promotion_id": promotion_id, "product_id": product_id}
+        for promotion_id in promotion_ids
+        for product_id in rng.sample(product_ids, min(len(product_ids), 50))
+    ), batch_size)
+    return counts
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Seed a synthetic dataset for benchmarks")
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--customers", type=int, default=10000)
+    parser.add_argument("--suppliers", type=int, default=50)
+    parser.add_argument("--sales", type=int, default=100000)
+    parser.add_argument("--items-per-sale", type=int, default=3, help="Average items per sale")
+    parser.add_argument("--promotions", type=int, default=20)
+    parser.add_argument("--days", type=int, default=1095, help="Spread sale dates over this many past days")
+    parser.add_argument("--paid-ratio", type=float, default=0.8)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    
+    started = time.perf_counter()
+    counts = seed(
+        products=args.products,
+        customers=args.customers,
+        suppliers=args.suppliers,
+        sales=args.sales,
+        items_per_sale=args.items_per_sale,
+        promotions=args.promotions,
+        days=args.days,
+        paid_ratio=args.paid_ratio,
+        batch_size=args.batch_size,
+        seed_value=args.seed
+    )
+    elapsed = time.perf_counter() - started
+    for table, count in counts.items():
+        print(f"{table:24} {count:>12,}")
+    print(f"Seeded in {elapsed:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
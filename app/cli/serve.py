@@ -0,0 +1,120 @@
+"""Production launcher.
+
+    python -m app.cli.serve                # workers from CPUs, pool sized per worker
+    python -m app.cli.serve --print-plan   # show the computed plan and exit
+
+Runs uvicorn's multi-process supervisor with uvloop/httptools when installed.
+Each worker's pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) is sized so that all
+workers together stay within DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS.
+On SIGTERM/SIGINT uvicorn stops accepting connections and waits up to
+GRACEFUL_SHUTDOWN_SECONDS for in-flight requests; the lifespan shutdown then
+stops background tasks and disposes the pool.
+"""
+from app.core.config import settings
+from typing import Optional
+import argparse
+import importlib.util
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+def cpu_count() -> int:
+    """CPUs this process may use: affinity mask, capped by a cgroup CPU quota (containers)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+def plan(workers: Optional[int] = None) -> dict:
+    """Worker count and per-worker pool sizing.
+    
+    Handlers run blocking DB work in the threadpool, so workers default to
+    2 x CPUs + 1. The connection budget is split evenly; a third of each
+    worker's share is overflow for bursts. Workers are reduced if the budget
+    would leave a worker fewer than 2 connections.
+    """
+    cpus = cpu_count()
+    workers = workers or settings.WEB_CONCURRENCY or 2 * cpus + 1
+    budget = max(2, settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS)
+    if budget // workers < 2:
+        workers = max(1, budget // 2)
+    per_worker = budget // workers
+    max_overflow = per_worker // 3
+    return {
+        "cpus": cpus,
+        "workers": workers,
+        "db_connection_budget": budget,
+        "db_pool_size": per_worker - max_overflow,
+        "db_max_overflow": max_overflow,
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "host": settings.HOST,
+        "port": settings.PORT,
+        "keepalive_timeout": settings.KEEPALIVE_TIMEOUT_SECONDS,
+        "backlog": settings.BACKLOG,
+        "graceful_shutdown": settings.GRACEFUL_SHUTDOWN_SECONDS
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the API with production settings")
+    parser.add_argument("--workers", type=int, help="Override the CPU-derived worker count")
+    parser.add_argument("--print-plan", action="store_true", help="Print the computed plan and exit")
+    args = parser.parse_args(argv)
+    
+    server_plan = plan(args.workers)
+    if args.print_plan:
+        print(json.dumps(server_plan, indent=2))
+        return 0
+    
+    # Workers are spawned processes: they read these when importing app.core.config
+    os.environ["DB_POOL_SIZE"] = str(server_plan["db_pool_size"])
+    os.environ["DB_MAX_OVERFLOW"] = str(server_plan["db_max_overflow"])
+    if server_plan["workers"] > 1 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus_multiproc_")
+    
+    import uvicorn
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Starting server: %s", server_plan)
+    uvicorn.run(
+        "app.main:app",
+        host=server_plan["host"],
+        port=server_plan["port"],
+        workers=server_plan["workers"],
+        loop=server_plan["loop"],
+        http=server_plan["http"],
+        backlog=server_plan["backlog"],
+        timeout_keep_alive=server_plan["keepalive_timeout"],
+        timeout_graceful_shutdown=server_plan["graceful_shutdown"],
+        proxy_headers=True,
+        server_header=False,
+        access_log=False
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
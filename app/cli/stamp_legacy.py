@@ -0,0 +1,28 @@
+"""Adopt a database built by the old import-time create_all into Alembic (run once, before upgrading).
+
+    python -m app.cli.stamp_legacy && alembic upgrade head
+
+Such databases have every table but no alembic_version, so `alembic upgrade head`
+fails creating tables that exist. This stamps the revision the schema matches;
+on an empty or already-versioned database it does nothing, so it is safe to run
+on every deploy.
+"""
+from app.database.db import engine
+from app.database.schema_check import SchemaRevisionError, stamp_legacy_schema
+import argparse
+import sys
+
+def main(argv=None) -> int:
+    argparse.ArgumentParser(description="Stamp the Alembic revision an unversioned (create_all-built) schema matches").parse_args(argv)
+    try:
+        revision = stamp_legacy_schema(engine)
+    except SchemaRevisionError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        engine.dispose()
+    print(f"Stamped legacy schema at {revision}" if revision else "No unversioned schema to stamp", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
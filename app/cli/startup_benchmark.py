@@ -0,0 +1,111 @@
+"""Cold-start benchmark: import time, lifespan startup and first request, each in a fresh process.
+
+    python -m app.cli.startup_benchmark --runs 5 --output startup.json --baseline startup_baseline.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Runs in the child: import the app, run the lifespan startup, serve GET /health once over raw ASGI
+_CHILD = r"""
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app
+from app.core.startup import startup_timings
+imported = time.perf_counter()
+
+async def first_request():
+    messages = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        messages.append(message)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/health", "raw_path": b"/health", "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80)
+    }
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+async def main():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        status = await first_request()
+        served = time.perf_counter()
+    return ready, status, served
+
+ready, status, served = asyncio.run(main())
+print("STARTUP_RESULT " + json.dumps({
+    "import_s": imported - started,
+    "startup_s": ready - imported,
+    "first_request_s": served - ready,
+    "status": status,
+    "phases": startup_timings
+}))
+"""
+
+METRICS = ["process_s", "import_s", "startup_s", "first_request_s"]
+
+def run_once() -> dict:
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", _CHILD], capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup failed:\n{completed.stderr[-2000:]}")
+    line = next(l for l in completed.stdout.splitlines() if l.startswith("STARTUP_RESULT "))
+    result = json.loads(line.split(" ", 1)[1])
+    result["process_s"] = elapsed
+    return result
+
+def summarize(runs: list) -> dict:
+    return {
+        metric: {
+            "median": round(statistics.median(r[metric] for r in runs), 4),
+            "min": round(min(r[metric] for r in runs), 4),
+            "max": round(max(r[metric] for r in runs), 4)
+        }
+        for metric in METRICS
+    }
+
+def compare(summary: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics whose median regressed by more than `tolerance` (a fraction) against the baseline"""
+    regressions = []
+    for metric in METRICS:
+        before = baseline.get("summary", {}).get(metric, {}).get("median")
+        after = summary[metric]["median"]
+        if before and after > before * (1 + tolerance):
+            regressions.append(f"{metric}: {before:.4f}s -> {after:.4f}s (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Previous --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    
+    runs = [run_once() for _ in range(args.runs)]
+    result = {"runs": runs, "summary": summarize(runs)}
+    for metric, values in result["summary"].items():
+        print(f"{metric:16} median {values['median'] * 1000:8.1f} ms  min {values['min'] * 1000:8.1f} ms  max {values['max'] * 1000:8.1f} ms")
+    print(f"startup phases (last run): {runs[-1]['phases']}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result["summary"], json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,73 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     
+    # Money columns are stored as integer minor units (10 ** CURRENCY_DECIMALS per unit)
+    CURRENCY_DECIMALS: int = int(os.getenv("CURRENCY_DECIMALS", "2"))
+    
+    # Stock reservations
+    RESERVATION_TTL_SECONDS: int = int(os.getenv("RESERVATION_TTL_SECONDS", "900"))
+    RESERVATION_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("RESERVATION_SWEEP_INTERVAL_SECONDS", "60"))
+    RESERVATION_SWEEP_BATCH_SIZE: int = int(os.getenv("RESERVATION_SWEEP_BATCH_SIZE", "500"))
+    
+    # Archival of closed sales/payments/ledger rows
+    ARCHIVE_HORIZON_DAYS: int = int(os.getenv("ARCHIVE_HORIZON_DAYS", "730"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+    
+    # Promotion pricing index: full reload interval (picks up other workers' writes)
+    PROMOTION_INDEX_TTL_SECONDS: int = int(os.getenv("PROMOTION_INDEX_TTL_SECONDS", "300"))
+    
+    # Per-request query stats: warn when one statement shape repeats this often
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+    
+    # Slow-query log
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_BUFFER_SIZE: int = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "200"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "False").lower() == "true"
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUP_COUNT: int = int(os.getenv("SLOW_QUERY_LOG_BACKUP_COUNT", "5"))
+    
+    # Request sampling profiler: admins can send X-Profile: 1; PROFILER_SAMPLE_RATE profiles
+    # that fraction of all requests (0 disables)
+    PROFILER_SAMPLE_RATE: float = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))
+    PROFILER_INTERVAL_MS: float = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+    PROFILER_OUTPUT_DIR: str = os.getenv("PROFILER_OUTPUT_DIR", "logs/profiles")
+    # Newest profiles kept in PROFILER_OUTPUT_DIR; older ones are deleted after each write (0 keeps all)
+    PROFILER_MAX_PROFILES: int = int(os.getenv("PROFILER_MAX_PROFILES", "200"))
+    
+    # Event loop watchdog: heartbeat period and the stall length that gets a stack capture
+    LOOP_HEARTBEAT_INTERVAL_MS: float = float(os.getenv("LOOP_HEARTBEAT_INTERVAL_MS", "100"))
+    LOOP_BLOCK_THRESHOLD_MS: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+    
+    # Logging (see app/core/logging_config.py)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    
+    # Startup: SCHEMA_CHECK is strict (refuse to start on a wrong Alembic revision), warn or off
+    SCHEMA_CHECK: str = os.getenv("SCHEMA_CHECK", "strict")
+    STARTUP_DB_RETRIES: int = int(os.getenv("STARTUP_DB_RETRIES", "5"))
+    STARTUP_DB_RETRY_DELAY_SECONDS: float = float(os.getenv("STARTUP_DB_RETRY_DELAY_SECONDS", "1"))
+    STARTUP_WARM_CONNECTIONS: int = int(os.getenv("STARTUP_WARM_CONNECTIONS", "5"))
+    
+    # Connection pool per process; the launcher (app.cli.serve) sizes these per worker
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    # MySQL max_connections, and how many of them to leave for migrations, admin and cron
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "151"))
+    DB_RESERVED_CONNECTIONS: int = int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+    
+    # Production server (python -m app.cli.serve); WEB_CONCURRENCY=0 derives workers from CPUs
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    KEEPALIVE_TIMEOUT_SECONDS: int = int(os.getenv("KEEPALIVE_TIMEOUT_SECONDS", "65"))
+    BACKLOG: int = int(os.getenv("BACKLOG", "2048"))
+    GRACEFUL_SHUTDOWN_SECONDS: int = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30"))
+    
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,141 @@
+"""Queue-based logging.
+
+Request-path code only builds a LogRecord and puts it on a bounded queue
+(QueueHandler); a QueueListener thread formats it and writes to stdout. Log
+calls use %-style arguments, so disabled levels cost an isEnabledFor() check
+and messages are rendered on the listener thread. Pass plain values (ids,
+counts, strings) as arguments, not ORM objects, since they are read later.
+
+Settings:
+    LOG_LEVEL     root level (INFO)
+    LOG_FORMAT    json or text
+    LOG_LEVELS    per-logger levels, e.g. "app.routes=WARNING,sqlalchemy.engine=INFO"
+    LOG_SAMPLING  keep-ratio for records below WARNING, e.g. "app.routes=0.1"
+    LOG_QUEUE_SIZE  records buffered before new ones are dropped
+"""
+from app.core.config import settings
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came from `extra=` and is emitted as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+def _parse_mapping(value: str) -> Dict[str, str]:
+    """"a=1,b.c=2" -> {"a": "1", "b.c": "2"}"""
+    mapping = {}
+    for item in value.split(","):
+        name, _, setting = item.partition("=")
+        if name.strip() and setting.strip():
+            mapping[name.strip()] = setting.strip()
+    return mapping
+
+class RequestContextFilter(logging.Filter):
+    """Stamp the current request id on the record while still on the request's thread/task"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of sub-WARNING records from noisy loggers (longest prefix wins)"""
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return random.random() < rate
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "module": record.module,
+            "line": record.lineno
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueue the record as-is; formatting happens on the listener thread.
+    When the queue is full the record is dropped rather than blocking the caller."""
+    
+    dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            NonBlockingQueueHandler.dropped += 1
+
+def setup_logging(
+    level: str = settings.LOG_LEVEL,
+    format: str = settings.LOG_FORMAT,
+    levels: str = settings.LOG_LEVELS,
+    sampling: str = settings.LOG_SAMPLING,
+    queue_size: int = settings.LOG_QUEUE_SIZE
+) -> QueueListener:
+    """Route all logging through a queue to a background writer; safe to call more than once"""
+    global _listener
+    if _listener is not None:
+        return _listener
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        ))
+    
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(SamplingFilter({name: float(rate) for name, rate in _parse_mapping(sampling).items()}))
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    for name, logger_level in _parse_mapping(levels).items():
+        logging.getLogger(name).setLevel(logger_level.upper())
+    
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,136 @@
+"""Event loop watchdog.
+
+A heartbeat task on the loop wakes every LOOP_HEARTBEAT_INTERVAL_MS and
+records how late it woke (event_loop_lag_seconds). A watchdog thread checks
+the heartbeat; when it is more than LOOP_BLOCK_THRESHOLD_MS overdue, the loop
+is stuck inside some coroutine doing blocking work, and the thread captures
+the loop thread's stack right then. When the loop recovers, the stall is
+logged with its duration, the route handler and the service call found in
+that stack, and counted in event_loop_blocks_total{route, call}.
+"""
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_BLOCK_SECONDS, EVENT_LOOP_LAG, EVENT_LOOP_LAG_HISTOGRAM
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ROUTES_DIR = os.path.join(_APP_ROOT, "routes")
+_CALL_DIRS = (os.path.join(_APP_ROOT, "services"), os.path.join(_APP_ROOT, "core"), os.path.join(_APP_ROOT, "database"))
+
+def _describe(frame) -> str:
+    """app-relative path for our frames, last two path parts for libraries"""
+    code = frame.f_code
+    filename = os.path.abspath(code.co_filename)
+    if filename.startswith(_APP_ROOT):
+        filename = os.path.relpath(filename, os.path.dirname(_APP_ROOT))
+    else:
+        filename = os.path.join(*filename.split(os.sep)[-2:])
+    return f"{filename}:{code.co_qualname}:{frame.f_lineno}"
+
+class LoopWatchdog:
+    """Measures loop lag and attributes stalls to the route and service call that caused them"""
+    
+    def __init__(
+        self,
+        interval_ms: float = settings.LOOP_HEARTBEAT_INTERVAL_MS,
+        threshold_ms: float = settings.LOOP_BLOCK_THRESHOLD_MS
+    ):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self._routes: Dict[object, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        # Written by the watchdog thread, consumed by the heartbeat once the loop runs again
+        self._capture: Optional[dict] = None
+    
+    def start(self, app=None):
+        """Start on the running loop; `app` lets stalls be reported by route template"""
+        if self._task is not None:
+            return
+        if app is not None:
+            self._routes = {
+                route.endpoint.__code__: f"{','.join(sorted(route.methods or []))} {route.path}"
+                for route in app.routes if hasattr(route, "endpoint") and hasattr(route.endpoint, "__code__")
+            }
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread.join()
+        self._thread = None
+    
+    async def _heartbeat(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag = max(0.0, now - started - self.interval)
+            EVENT_LOOP_LAG.set(lag)
+            EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+            capture, self._capture = self._capture, None
+            if capture is not None:
+                self._report(capture, lag)
+    
+    def _watch(self):
+        reported_beat = None
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._last_beat
+            if beat == reported_beat or time.perf_counter() - beat < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._capture = self._attribute(frame)
+                reported_beat = beat
+    
+    def _attribute(self, frame) -> dict:
+        """Route handler, innermost app service call and the blocking leaf from a stack"""
+        stack: List[str] = []
+        route = call = None
+        leaf = _describe(frame)
+        while frame is not None:
+            filename = os.path.abspath(frame.f_code.co_filename)
+            if route is None and frame.f_code in self._routes:
+                route = self._routes[frame.f_code]
+            if route is None and filename.startswith(_ROUTES_DIR):
+                route = frame.f_code.co_qualname
+            if call is None and filename.startswith(_CALL_DIRS):
+                call = frame.f_code.co_qualname
+            stack.append(_describe(frame))
+            frame = frame.f_back
+        stack.reverse()
+        return {"route": route or "unknown", "call": call or "unknown", "leaf": leaf, "stack": stack}
+    
+    def _report(self, capture: dict, lag: float):
+        EVENT_LOOP_BLOCKS.labels(capture["route"], capture["call"]).inc()
+        EVENT_LOOP_BLOCK_SECONDS.labels(capture["route"]).observe(lag)
+        app_frames = [f for f in capture["stack"] if f.startswith("app" + os.sep)]
+        logger.warning(
+            "Event loop blocked %.0f ms in %s via %s (at %s); app stack: %s",
+            lag * 1000, capture["route"], capture["call"], capture["leaf"], " > ".join(app_frames)
+        )
+
+loop_watchdog = LoopWatchdog()
@@ -0,0 +1,83 @@
+"""Prometheus metrics.
+
+Single process: metrics live in the default registry. Under several uvicorn
+workers set PROMETHEUS_MULTIPROC_DIR (an empty, writable directory, wiped on
+deploy) before the app is imported; every worker then writes to mmap files
+there and /metrics aggregates all of them.
+"""
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from sqlalchemy import event
+from typing import Tuple
+import os
+
+MULTIPROCESS_MODE = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_COUNT = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", multiprocess_mode="livesum"
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured connection pool size", multiprocess_mode="livesum"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Pooled connections currently checked out", multiprocess_mode="livesum"
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Application cache lookups", ["cache", "result"]
+)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds", "Latest event loop scheduling delay", multiprocess_mode="max"
+)
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    "event_loop_lag_seconds_distribution", "Event loop scheduling delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds", "Time spent in each startup phase", ["phase"], multiprocess_mode="max"
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total", "Event loop stalls over LOOP_BLOCK_THRESHOLD_MS", ["route", "call"]
+)
+EVENT_LOOP_BLOCK_SECONDS = Histogram(
+    "event_loop_block_seconds", "Duration of event loop stalls by route", ["route"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+def instrument_engine_pool(engine):
+    """Track pool size and checked-out connections through pool events"""
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        DB_POOL_SIZE.set(size())
+    
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+    
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+def render_metrics() -> Tuple[bytes, str]:
+    if MULTIPROCESS_MODE:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def mark_worker_dead():
+    """Drop this worker's live gauges from the multiprocess aggregate"""
+    if MULTIPROCESS_MODE:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,22 @@
+from decimal import Decimal, ROUND_HALF_UP
+from app.core.config import settings
+
+MINOR_UNIT_SCALE = 10 ** settings.CURRENCY_DECIMALS
+QUANTUM = Decimal(1).scaleb(-settings.CURRENCY_DECIMALS)
+
+def to_money(value) -> Decimal:
+    """Exact amount rounded half-up to the currency's minor unit.
+    Floats go through str() so 0.1 becomes Decimal('0.10'), not its binary expansion."""
+    if value is None:
+        return Decimal(0).quantize(QUANTUM)
+    if isinstance(value, float):
+        value = str(value)
+    return Decimal(value).quantize(QUANTUM, rounding=ROUND_HALF_UP)
+
+def to_minor_units(value) -> int:
+    """Amount as an integer count of minor units (e.g. cents)"""
+    return int(to_money(value) * MINOR_UNIT_SCALE)
+
+def from_minor_units(units: int) -> Decimal:
+    """Integer minor units back to an exact Decimal amount"""
+    return (Decimal(int(units)) / MINOR_UNIT_SCALE).quantize(QUANTUM)
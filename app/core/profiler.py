@@ -0,0 +1,181 @@
+"""Sampling profiler for individual requests.
+
+A profiled request gets a background thread that snapshots the interpreter's
+thread stacks every PROFILER_INTERVAL_MS while the request runs, so the
+request itself pays nothing per function call. Stacks are written as
+collapsed stacks (flamegraph.pl / speedscope import) and as a speedscope
+JSON file, with each sample also attributed to one phase: routing,
+validation, sqlalchemy, json or app.
+
+All busy threads are sampled (the event loop thread and the threadpool that
+runs sync endpoints and dependencies), so overlapping requests in the same
+worker show up in each other's profiles; profile on a quiet worker when
+exact attribution matters.
+"""
+from app.core.config import settings
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import sys
+import threading
+import time
+
+# Innermost matching frame decides the phase of a sample
+_PHASES = (
+    ("sqlalchemy", ("/sqlalchemy/", "/pymysql/", "/sqlite3/")),
+    ("json", ("/json/", "/fastapi/encoders.py", "/starlette/responses.py", "/fastapi/responses.py")),
+    ("validation", ("/pydantic/", "/pydantic_core/", "/fastapi/_compat.py", "/fastapi/dependencies/")),
+    ("app", ("/app/",)),
+    ("routing", ("/starlette/", "/fastapi/", "/anyio/")),
+)
+
+# Leaf frames of threads that are waiting rather than working
+_IDLE_LEAVES = ("selectors.py", "threading.py", "queue.py", "concurrent/futures/thread.py")
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    parts = filename.replace(os.sep, "/").rsplit("/", 2)
+    return f"{code.co_qualname} ({'/'.join(parts[-2:])}:{code.co_firstlineno})"
+
+def _phase(filenames: List[str]) -> str:
+    for filename in reversed(filenames):
+        normalized = filename.replace(os.sep, "/")
+        for phase, markers in _PHASES:
+            if any(marker in normalized for marker in markers):
+                return phase
+    return "other"
+
+class SamplingProfiler:
+    """Samples thread stacks from a background thread between start() and stop()"""
+    
+    def __init__(self, interval_ms: float = settings.PROFILER_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self.phases: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self.duration = 0.0
+    
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration = time.perf_counter() - self._started
+    
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample(own)
+    
+    def _sample(self, own: int):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            labels, filenames = [], []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                filenames.append(frame.f_code.co_filename)
+                frame = frame.f_back
+            if not filenames or filenames[0].replace(os.sep, "/").endswith(_IDLE_LEAVES):
+                continue
+            labels.reverse()
+            filenames.reverse()
+            self.samples[tuple(labels)] += 1
+            self.phases[_phase(filenames)] += 1
+            self.sample_count += 1
+    
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format, one `frame;frame;frame count` line per stack"""
+        return "\n".join(f"{';'.join(stack)} {count}" for stack, count in self.samples.most_common()) + "\n"
+    
+    def speedscope(self, name: str) -> dict:
+        frames: Dict[str, int] = {}
+        samples, weights = [], []
+        for stack, count in self.samples.items():
+            samples.append([frames.setdefault(label, len(frames)) for label in stack])
+            weights.append(count * self.interval * 1000)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "app.core.profiler",
+            "shared": {"frames": [{"name": label} for label in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights
+            }]
+        }
+    
+    def phase_breakdown(self) -> Dict[str, float]:
+        """Share of samples per phase"""
+        total = self.sample_count or 1
+        return {phase: round(count / total, 3) for phase, count in self.phases.most_common()}
+    
+    def write(self, directory: str, method: str, route: str) -> Tuple[str, str]:
+        """Write <stamp>_<method>_<route>.collapsed.txt and .speedscope.json; returns both paths"""
+        os.makedirs(directory, exist_ok=True)
+        slug = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+        base = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{method}_{slug}"
+        name = f"{method} {route} ({self.duration * 1000:.1f} ms, {self.sample_count} samples, phases {self.phase_breakdown()})"
+        
+        collapsed_path = os.path.join(directory, f"{base}.collapsed.txt")
+        with open(collapsed_path, "w") as f:
+            f.write(self.collapsed())
+        speedscope_path = os.path.join(directory, f"{base}.speedscope.json")
+        with open(speedscope_path, "w") as f:
+            json.dump(self.speedscope(name), f)
+        return collapsed_path, speedscope_path
+
+_PROFILE_SUFFIXES = (".collapsed.txt", ".speedscope.json")
+
+def prune_profiles(directory: str = settings.PROFILER_OUTPUT_DIR, max_profiles: int = settings.PROFILER_MAX_PROFILES) -> int:
+    """Delete all but the newest max_profiles profiles (both files of each); returns files removed"""
+    if max_profiles <= 0 or not os.path.isdir(directory):
+        return 0
+    profiles: Dict[str, List[str]] = {}
+    for name in os.listdir(directory):
+        for suffix in _PROFILE_SUFFIXES:
+            if name.endswith(suffix):
+                profiles.setdefault(name[:-len(suffix)], []).append(name)
+    removed = 0
+    # Names start with a sortable timestamp, so name order is age order
+    for base in sorted(profiles, reverse=True)[max_profiles:]:
+        for name in profiles[base]:
+            try:
+                os.remove(os.path.join(directory, name))
+                removed += 1
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+    return removed
+
+def list_profiles(directory: str = settings.PROFILER_OUTPUT_DIR) -> List[dict]:
+    """Profile files on disk, newest first"""
+    if not os.path.isdir(directory):
+        return []
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            entries.append({
+                "name": name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+            })
+    entries.sort(key=lambda e: e["name"], reverse=True)
+    return entries
@@ -56,4 +56,24 @@ def get_current_user(
             detail="User not found"
         )
     
-    return user
\ No newline at end of file
+    return user
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
+def is_admin_token(token: str, db: Session) -> bool:
+    """Whether a bearer token belongs to an admin, for checks made outside route dependencies"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return False
+    username = payload.get("sub")
+    if username is None:
+        return False
+    user = db.query(User).filter(User.username == username).first()
+    return user is not None and user.role == "admin"
@@ -0,0 +1,83 @@
+"""Startup work run from the application lifespan, with per-phase timings."""
+from app.core.config import settings
+from app.core.metrics import STARTUP_SECONDS
+from app.database.db import SessionLocal
+from app.database.schema_check import SchemaRevisionError, verify_schema_revision
+from app.services.pricing_service import promotion_index
+from app.services.promotion_service import PromotionService
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from typing import Dict
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+startup_timings: Dict[str, float] = {}
+
+@contextmanager
+def timed(phase: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(phase, time.perf_counter() - started)
+
+def record_timing(phase: str, seconds: float):
+    startup_timings[phase] = round(seconds, 4)
+    STARTUP_SECONDS.labels(phase).set(seconds)
+
+def check_schema(engine):
+    """SCHEMA_CHECK=strict refuses to start on a wrong revision or unreachable DB; warn only logs"""
+    if settings.SCHEMA_CHECK == "off":
+        return
+    try:
+        revisions = verify_schema_revision(
+            engine,
+            retries=settings.STARTUP_DB_RETRIES,
+            retry_delay=settings.STARTUP_DB_RETRY_DELAY_SECONDS
+        )
+        logger.info("Database schema at revision %s", ",".join(sorted(revisions)))
+    except (SchemaRevisionError, OperationalError) as e:
+        if settings.SCHEMA_CHECK == "strict":
+            raise
+        logger.warning("Schema check failed, starting anyway: %s", e)
+
+def warm_pool(engine, connections: int = settings.STARTUP_WARM_CONNECTIONS):
+    """Open `connections` pooled connections up front (capped at the pool size) so the
+    first requests don't pay for connecting"""
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+    opened = []
+    try:
+        for _ in range(connections):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.execute(text("SELECT 1"))
+    except OperationalError as e:
+        logger.warning("Connection pool warm-up stopped after %s connections: %s", len(opened), e.orig)
+    finally:
+        for connection in opened:
+            connection.close()
+
+def warm_caches():
+    """Load the promotion index and the active promotions list"""
+    db = SessionLocal()
+    try:
+        promotion_index.load(db)
+        PromotionService(db).get_active_promotions()
+    except Exception as e:
+        logger.warning("Cache warm-up failed: %s", e)
+    finally:
+        db.close()
+
+def run_startup(engine):
+    """Blocking startup sequence; call from a thread"""
+    with timed("schema_check"):
+        check_schema(engine)
+    with timed("warm_pool"):
+        warm_pool(engine)
+    with timed("warm_caches"):
+        warm_caches()
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Enum, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum, Date, Index, Numeric
+from sqlalchemy import event
+from sqlalchemy.orm import relationship, object_session
 from sqlalchemy.sql import func
 from app.database.db import Base
+from app.database.types import Money
+from app.services.stock_alert_service import StockAlertService
 from datetime import datetime
 import enum
 
@@ -32,14 +35,21 @@ class Product(Base):
     code = Column(String(100), unique=True, index=True, nullable=False)  # SKU
     description = Column(Text)
     category = Column(String(100))
-    price = Column(Float, nullable=False)
-    cost = Column(Float)
+    price = Column(Money, nullable=False)
+    cost = Column(Money)
     image_url = Column(String(500))
     supplier_id = Column(Integer, ForeignKey("suppliers.id"))
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True)
     
+    __table_args__ = (
+        # Active product listings
+        Index("ix_products_is_active_id", "is_active", "id"),
+        # Category-targeted promotions, category-filtered reports
+        Index("ix_products_category_id", "category", "id"),
+    )
+    
     # Relationships
     supplier = relationship("Supplier", back_populates="products")
     inventory = relationship("Inventory", back_populates="product", cascade="all, delete-orphan")
@@ -90,11 +100,12 @@ class Inventory(Base):
     __tablename__ = "inventory"
     
     id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, unique=True, index=True)  # one row per product
     quantity_on_hand = Column(Integer, default=0)
     quantity_reserved = Column(Integer, default=0)
     reorder_level = Column(Integer, default=10)
     reorder_quantity = Column(Integer, default=50)
+    is_low_stock = Column(Boolean, default=True, nullable=False, index=True)  # quantity_on_hand <= reorder_level
     last_count_date = Column(DateTime)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
@@ -102,6 +113,29 @@ class Inventory(Base):
     product = relationship("Product", back_populates="inventory")
     transactions = relationship("InventoryTransaction", back_populates="inventory")
 
+@event.listens_for(Inventory, "before_insert")
+@event.listens_for(Inventory, "before_update")
+def _sync_low_stock_flag(mapper, connection, target):
+    """Keep is_low_stock in step with quantity_on_hand/reorder_level on every ORM flush"""
+    quantity = target.quantity_on_hand if target.quantity_on_hand is not None else 0
+    reorder_level = target.reorder_level if target.reorder_level is not None else 10
+    is_low_stock = quantity <= reorder_level
+    
+    was_low_stock = target.is_low_stock
+    target.is_low_stock = is_low_stock
+    
+    # Queue a threshold-crossing alert; dispatched after commit by StockAlertService
+    if target.id is not None and was_low_stock is not None and was_low_stock != is_low_stock:
+        session = object_session(target)
+        if session is not None:
+            StockAlertService.queue_alert(session, {
+                "inventory_id": target.id,
+                "product_id": target.product_id,
+                "quantity_on_hand": quantity,
+                "reorder_level": reorder_level,
+                "is_low_stock": is_low_stock
+            })
+
 # ============ Inventory Transactions ============
 class InventoryTransaction(Base):
     __tablename__ = "inventory_transactions"
@@ -115,9 +149,54 @@ class InventoryTransaction(Base):
     created_at = Column(DateTime, server_default=func.now())
     notes = Column(Text)
     
+    __table_args__ = (
+        # Per-product ledger replay by time
+        Index("ix_inventory_transactions_inventory_id_created_at", "inventory_id", "created_at"),
+        # Latest-first transaction list
+        Index("ix_inventory_transactions_created_at", "created_at"),
+    )
+    
     # Relationships
     inventory = relationship("Inventory", back_populates="transactions")
 
+# ============ Inventory Snapshots ============
+class InventorySnapshot(Base):
+    __tablename__ = "inventory_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    inventory_id = Column(Integer, ForeignKey("inventory.id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    quantity_on_hand = Column(Integer, nullable=False)  # Stock after replaying ledger up to last_transaction_id
+    last_transaction_id = Column(Integer, nullable=False, default=0)
+    snapshot_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_inventory_snapshots_inventory_id_snapshot_at", "inventory_id", "snapshot_at"),
+    )
+
+# ============ Stock Reservations ============
+class StockReservation(Base):
+    __tablename__ = "stock_reservations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    inventory_id = Column(Integer, ForeignKey("inventory.id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    sale_id = Column(Integer, ForeignKey("sales.id"), nullable=True, index=True)
+    quantity = Column(Integer, nullable=False)
+    status = Column(String(50), default="HELD", nullable=False)  # HELD, COMMITTED, RELEASED, EXPIRED
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Sweeper scans HELD rows by expiry
+        Index("ix_stock_reservations_status_expires_at", "status", "expires_at"),
+    )
+    
+    # Relationships
+    inventory = relationship("Inventory")
+
 # ============ Sales ============
 class Sale(Base):
     __tablename__ = "sales"
@@ -127,15 +206,25 @@ class Sale(Base):
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"))
     sale_date = Column(DateTime, server_default=func.now())
-    total_amount = Column(Float, nullable=False)
-    discount = Column(Float, default=0)
-    tax = Column(Float, default=0)
-    final_amount = Column(Float, nullable=False)
+    total_amount = Column(Money, nullable=False)
+    discount = Column(Money, default=0)
+    tax = Column(Money, default=0)
+    final_amount = Column(Money, nullable=False)
+    amount_paid = Column(Money, nullable=False, default=0, server_default="0")  # maintained by PaymentService
     status = Column(String(50), default="completed")  # completed, pending, cancelled
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Customer stats/report: filter by customer, sum final_amount without touching the row
+        Index("ix_sales_customer_id_status_final_amount", "customer_id", "status", "final_amount"),
+        # Status-filtered lists, archival
+        Index("ix_sales_status_sale_date", "status", "sale_date"),
+        # Revenue/dashboard date ranges; outstanding balances walked in sale_date order
+        Index("ix_sales_sale_date_final_amount_amount_paid", "sale_date", "final_amount", "amount_paid"),
+    )
+    
     # Relationships
     customer = relationship("Customer", back_populates="sales")
     user = relationship("User", back_populates="sales")
@@ -150,9 +239,15 @@ class SaleItem(Base):
     sale_id = Column(Integer, ForeignKey("sales.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
-    unit_price = Column(Float, nullable=False)
-    discount = Column(Float, default=0)
-    line_total = Column(Float, nullable=False)
+    unit_price = Column(Money, nullable=False)
+    discount = Column(Money, default=0)
+    line_total = Column(Money, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_sale_items_sale_id", "sale_id"),
+        # Top products: group by product, sum quantity/line_total from the index alone
+        Index("ix_sale_items_product_id_quantity_line_total", "product_id", "quantity", "line_total"),
+    )
     
     # Relationships
     sale = relationship("Sale", back_populates="items")
@@ -166,15 +261,20 @@ class Promotion(Base):
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text)
     discount_type = Column(String(50))  # PERCENTAGE, FIXED
-    discount_value = Column(Float, nullable=False)
-    min_purchase = Column(Float, default=0)
-    max_discount = Column(Float)
+    discount_value = Column(Numeric(12, 2), nullable=False)  # percent or amount by discount_type; not Money, which would scale percentages
+    min_purchase = Column(Money, default=0)
+    max_discount = Column(Money)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Live-on-a-date lookups and next-boundary queries
+        Index("ix_promotions_is_active_start_date_end_date", "is_active", "start_date", "end_date"),
+    )
+    
     # Relationships (Many-to-Many)
     products = relationship("Product", secondary="promotion_product", back_populates="promotions")
 
@@ -195,12 +295,92 @@ class Payment(Base):
     id = Column(Integer, primary_key=True, index=True)
     sale_id = Column(Integer, ForeignKey("sales.id"), nullable=False)
     payment_method = Column(String(50), nullable=False)  # CASH, CARD, BANK_TRANSFER
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     payment_date = Column(DateTime, server_default=func.now())
     status = Column(String(50), default="completed")  # completed, pending, failed
     reference_number = Column(String(100))
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
     
+    __table_args__ = (
+        # Balance checks: sum amount per sale
+        Index("ix_payments_sale_id_amount", "sale_id", "amount"),
+        # Status/method filtered lists
+        Index("ix_payments_status_payment_method", "status", "payment_method"),
+        Index("ix_payments_reference_number", "reference_number"),
+    )
+    
+    # Relationships
+    sale = relationship("Sale", back_populates="payments")
+
+# ============ Archive (closed records older than ARCHIVE_HORIZON_DAYS) ============
+class SaleArchive(Base):
+    __tablename__ = "sales_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    invoice_number = Column(String(100), nullable=False, index=True)
+    customer_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer)
+    sale_date = Column(DateTime, index=True)
+    total_amount = Column(Money, nullable=False)
+    discount = Column(Money, default=0)
+    tax = Column(Money, default=0)
+    final_amount = Column(Money, nullable=False)
+    amount_paid = Column(Money, nullable=False, default=0, server_default="0")
+    status = Column(String(50))
+    notes = Column(Text)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, server_default=func.now())
+    
     # Relationships
-    sale = relationship("Sale", back_populates="payments")
\ No newline at end of file
+    items = relationship("SaleItemArchive", back_populates="sale")
+    payments = relationship("PaymentArchive", back_populates="sale")
+
+class SaleItemArchive(Base):
+    __tablename__ = "sale_items_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    sale_id = Column(Integer, ForeignKey("sales_archive.id"), nullable=False, index=True)
+    product_id = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Money, nullable=False)
+    discount = Column(Money, default=0)
+    line_total = Column(Money, nullable=False)
+    
+    # Relationships
+    sale = relationship("SaleArchive", back_populates="items")
+
+class PaymentArchive(Base):
+    __tablename__ = "payments_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    sale_id = Column(Integer, ForeignKey("sales_archive.id"), nullable=False, index=True)
+    payment_method = Column(String(50), nullable=False)
+    amount = Column(Money, nullable=False)
+    payment_date = Column(DateTime)
+    status = Column(String(50))
+    reference_number = Column(String(100))
+    notes = Column(Text)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, server_default=func.now())
+    
+    # Relationships
+    sale = relationship("SaleArchive", back_populates="payments")
+
+class InventoryTransactionArchive(Base):
+    __tablename__ = "inventory_transactions_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    inventory_id = Column(Integer, nullable=False)
+    transaction_type = Column(String(50), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    reason = Column(String(255))
+    reference_number = Column(String(100))
+    created_at = Column(DateTime)
+    notes = Column(Text)
+    archived_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_inventory_transactions_archive_inventory_id_created_at", "inventory_id", "created_at"),
+    )
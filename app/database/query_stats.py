@@ -0,0 +1,77 @@
+from contextvars import ContextVar
+from contextlib import contextmanager
+from collections import Counter
+from typing import Iterator, List, Optional, Tuple
+import re
+import threading
+
+# Collapse whitespace and expanded IN/VALUES lists so "IN (?, ?, ?)" and "IN (?)" share a shape
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)")
+
+def statement_shape(statement: str) -> str:
+    """Normalized SQL used to group repeated statements"""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+class QueryStats:
+    """Query count, DB time and statement shapes for one unit of work (usually a request)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    def record(self, statement: str, duration: float):
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.shapes[shape] += 1
+    
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times (likely N+1 loops)"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+    
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_global_collectors: List[QueryStats] = []
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+def start_query_stats() -> Tuple[QueryStats, object]:
+    """Begin collecting for the current context; pass the token to reset_query_stats"""
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+def reset_query_stats(token):
+    _current_stats.reset(token)
+
+def record_query(statement: str, duration: float):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    for collector in _global_collectors:
+        collector.record(statement, duration)
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect every query issued on any thread while the block runs (tests, scripts)"""
+    stats = QueryStats()
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if the block issues more than `limit` queries; the message lists repeated shapes"""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        repeated = "\n".join(f"  {n}x {shape[:200]}" for shape, n in stats.repeated(2))
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count}\n{repeated}")
@@ -0,0 +1,118 @@
+"""Startup schema check: the schema is owned by Alembic (`alembic upgrade head`);
+the app only verifies that the database is at the revision the code expects."""
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Float, Integer, Numeric, inspect
+from sqlalchemy.exc import OperationalError
+from typing import Optional, Set
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+class SchemaRevisionError(RuntimeError):
+    pass
+
+def _alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    return config
+
+def expected_revisions() -> Set[str]:
+    """Head revision(s) of the migration scripts shipped with the code (no DB access)"""
+    return set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+
+def current_revisions(engine) -> Set[str]:
+    """Revision(s) stamped in the database's alembic_version table"""
+    with engine.connect() as connection:
+        return set(MigrationContext.configure(connection).get_current_heads())
+
+def verify_schema_revision(engine, retries: int = 5, retry_delay: float = 1.0) -> Set[str]:
+    """Compare the database revision with the code's head, retrying while the DB is unreachable.
+    Raises SchemaRevisionError on a mismatch; OperationalError once retries are exhausted."""
+    expected = expected_revisions()
+    for attempt in range(retries + 1):
+        try:
+            current = current_revisions(engine)
+            break
+        except OperationalError as e:
+            if attempt == retries:
+                raise
+            delay = retry_delay * 2 ** attempt
+            logger.warning("Database unreachable (%s), retrying in %.1fs", e.orig, delay)
+            time.sleep(delay)
+    
+    if current != expected:
+        hint = "run `alembic upgrade head`"
+        if not current and inspect(engine).has_table("users"):
+            hint = "tables exist without an Alembic revision: run `python -m app.cli.stamp_legacy`, then `alembic upgrade head`"
+        raise SchemaRevisionError(
+            f"Database schema is at {sorted(current) or 'no revision'}, code expects {sorted(expected)}; {hint}"
+        )
+    return current
+
+def _columns(inspector, table: str) -> dict:
+    return {column["name"]: column for column in inspector.get_columns(table)}
+
+def _index(inspector, table: str, name: str) -> Optional[dict]:
+    return next((index for index in inspector.get_indexes(table) if index["name"] == name), None)
+
+# What each revision leaves behind that reflection can see, in order. Before Alembic owned the
+# schema, the app ran create_all at import: those databases have tables but no alembic_version,
+# and create_all never ran a migration's data steps, so a data-only revision (None) ends the match.
+LEGACY_REVISION_MARKERS = [
+    ("0001", lambda i: all(i.has_table(t) for t in ("users", "products", "inventory", "sales", "payments", "promotions"))),
+    ("0002", lambda i: "is_low_stock" in _columns(i, "inventory")),
+    ("0003", lambda i: i.has_table("stock_reservations")),
+    ("0004", lambda i: i.has_table("inventory_snapshots")),
+    ("0005", lambda i: i.has_table("sales_archive")),
+    ("0006", lambda i: _index(i, "sales", "ix_sales_status_sale_date") is not None),
+    ("0007", lambda i: bool((_index(i, "inventory", "ix_inventory_product_id") or {}).get("unique"))),
+    ("0008", lambda i: isinstance(_columns(i, "products")["price"]["type"], Integer)),
+    ("0009", lambda i: "amount_paid" in _columns(i, "sales")),
+    ("0010", lambda i: _index(i, "products", "ix_products_category_id") is not None),
+    ("0011", lambda i: _index(i, "promotions", "ix_promotions_is_active_start_date_end_date") is not None),
+    ("0012", None),
+    ("0013", lambda i: (
+        isinstance(_columns(i, "promotions")["discount_value"]["type"], Numeric)
+        and not isinstance(_columns(i, "promotions")["discount_value"]["type"], Float)
+    )),
+]
+
+def legacy_revision(engine) -> Optional[str]:
+    """Revision an unversioned, create_all-built schema matches, or None if there is nothing to stamp
+    (the database is empty or already versioned). Raises SchemaRevisionError if the schema has
+    objects from a revision past the first one it is missing, which needs a manual fix."""
+    if current_revisions(engine):
+        return None
+    inspector = inspect(engine)
+    if not inspector.has_table("users"):
+        return None
+    
+    matched, stopped_at = None, None
+    for revision, marker in LEGACY_REVISION_MARKERS:
+        if stopped_at is None:
+            if marker is not None and marker(inspector):
+                matched = revision
+            else:
+                stopped_at = revision
+        elif marker is not None and marker(inspector):
+            raise SchemaRevisionError(
+                f"Unversioned schema matches revision {matched} but is missing {stopped_at} "
+                f"while already having {revision}; bring it to one revision by hand, then `alembic stamp`"
+            )
+    return matched
+
+def stamp_legacy_schema(engine) -> Optional[str]:
+    """One-time adoption of a create_all-built database: stamp the revision it matches so
+    `alembic upgrade head` applies only the later migrations. Returns the stamped revision."""
+    revision = legacy_revision(engine)
+    if revision is not None:
+        command.stamp(_alembic_config(), revision)
+        logger.warning("Stamped unversioned schema at Alembic revision %s", revision)
+    return revision
@@ -0,0 +1,138 @@
+from app.core.config import settings
+from app.database.query_stats import statement_shape
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+import json
+import logging
+import os
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Execution option set on connections the recorder opens itself, so EXPLAINs are not recorded
+SKIP_INSTRUMENTATION = "skip_instrumentation"
+
+_PASSTHROUGH_TYPES = (int, float, bool, Decimal, date, datetime, type(None))
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def redact_parameters(parameters, executemany: bool = False):
+    """Keep numbers/dates/None (ids, limits, ranges); replace strings and bytes with type and length"""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "first": redact_parameters(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {k: redact_parameters(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(v) for v in parameters]
+    if isinstance(parameters, _PASSTHROUGH_TYPES):
+        return parameters
+    if isinstance(parameters, (str, bytes)):
+        return f"<{type(parameters).__name__}:{len(parameters)}>"
+    return f"<{type(parameters).__name__}>"
+
+def find_caller() -> Optional[str]:
+    """Innermost app frame outside app/database, as path:qualname:line"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_APP_ROOT) and not filename.startswith(_DATABASE_DIR):
+            relative = os.path.relpath(filename, os.path.dirname(_APP_ROOT))
+            return f"{relative}:{frame.f_code.co_qualname}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+class SlowQueryLog:
+    """Statements slower than SLOW_QUERY_THRESHOLD_MS go to a bounded ring buffer
+    (served by /api/admin/slow-queries) and, when SLOW_QUERY_LOG_FILE is set, a rotating
+    JSON-lines file. With SLOW_QUERY_EXPLAIN, SELECT plans are captured afterwards on a
+    separate connection so the request's own cursor is never touched."""
+    
+    def __init__(
+        self,
+        threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS,
+        buffer_size: int = settings.SLOW_QUERY_BUFFER_SIZE,
+        log_file: Optional[str] = settings.SLOW_QUERY_LOG_FILE,
+        explain: bool = settings.SLOW_QUERY_EXPLAIN
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._engine = None
+        self._explainer: Optional[ThreadPoolExecutor] = None
+        self._file_logger: Optional[logging.Logger] = None
+        if log_file:
+            self._file_logger = logging.getLogger("slow_query_file")
+            self._file_logger.propagate = False
+            self._file_logger.setLevel(logging.INFO)
+            if not self._file_logger.handlers:
+                if os.path.dirname(log_file):
+                    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+                handler = RotatingFileHandler(
+                    log_file,
+                    maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=settings.SLOW_QUERY_LOG_BACKUP_COUNT
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self._file_logger.addHandler(handler)
+    
+    def bind(self, engine):
+        """Engine used for EXPLAIN"""
+        self._engine = engine
+    
+    def observe(self, statement: str, parameters, executemany: bool, duration: float):
+        duration_ms = duration * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        
+        entry = {
+            "recorded_at": datetime.now().isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration_ms, 2),
+            "shape": statement_shape(statement),
+            "parameters": redact_parameters(parameters, executemany),
+            "caller": find_caller(),
+            "plan": None
+        }
+        with self._lock:
+            self._entries.append(entry)
+        
+        if self.explain and self._engine is not None and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+            if self._explainer is None:
+                self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+            self._explainer.submit(self._explain_and_write, entry, statement, parameters)
+        else:
+            self._write(entry)
+    
+    def _explain_and_write(self, entry: dict, statement: str, parameters):
+        try:
+            prefix = "EXPLAIN QUERY PLAN" if self._engine.dialect.name == "sqlite" else "EXPLAIN"
+            with self._engine.connect().execution_options(**{SKIP_INSTRUMENTATION: True}) as conn:
+                rows = conn.exec_driver_sql(f"{prefix} {statement}", parameters).fetchall()
+            entry["plan"] = [list(map(str, row)) for row in rows]
+        except Exception as e:
+            entry["plan"] = [f"EXPLAIN failed: {e}"]
+        self._write(entry)
+    
+    def _write(self, entry: dict):
+        logger.warning("Slow query (%s ms) from %s: %s", entry['duration_ms'], entry['caller'], entry['shape'][:300])
+        if self._file_logger:
+            self._file_logger.info(json.dumps(entry, default=str))
+    
+    def entries(self, limit: Optional[int] = None) -> List[dict]:
+        """Most recent first"""
+        with self._lock:
+            items = list(self._entries)
+        items.reverse()
+        return items[:limit] if limit else items
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+slow_query_log = SlowQueryLog()
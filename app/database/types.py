@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+from app.core.money import to_minor_units, from_minor_units
+
+class Money(TypeDecorator):
+    """Money column stored as BIGINT minor units, exposed as an exact Decimal.
+    
+    Accepts float/int/str/Decimal on the way in; SUM() over a Money column is
+    an integer sum in the database and comes back as a Decimal.
+    """
+    impl = BigInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return to_minor_units(value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return from_minor_units(value)
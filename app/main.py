@@ -1,24 +1,51 @@
-from fastapi import FastAPI
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.db import engine, Base
-from app.database import models
-from app.routes import auth, products, customers, suppliers, sales, inventory, payments, promotions, reports
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from app.database.db import engine
+from app.routes import auth, products, customers, suppliers, sales, inventory, payments, promotions, reports, archive, admin
 from app.middleware.error_handler import register_error_handlers
+from app.middleware.query_stats_middleware import QueryStatsMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.profiler_middleware import ProfilerMiddleware
+from app.core.metrics import instrument_engine_pool, mark_worker_dead, render_metrics
+from app.core.loop_watchdog import loop_watchdog
+from app.services.reservation_service import reservation_sweeper
+from app.core.logging_config import setup_logging
+from app.middleware.request_id_middleware import RequestIdMiddleware
+from app.core.startup import record_timing, run_startup, startup_timings
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging: records go through a queue to a background writer thread
+setup_logging()
+
+logger = logging.getLogger(__name__)
 
-# Tạo tất cả bảng
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic (`alembic upgrade head`); startup only verifies the revision
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    await run_in_threadpool(run_startup, engine)
+    reservation_sweeper.start()
+    loop_watchdog.start(app)
+    record_timing("lifespan_startup", time.perf_counter() - started)
+    logger.info("Startup complete: %s", startup_timings)
+    try:
+        yield
+    finally:
+        await reservation_sweeper.stop()
+        await loop_watchdog.stop()
+        engine.dispose()
+        mark_worker_dead()
 
 app = FastAPI(
     title="Furniture Management API",
     description="API cho ứng dụng quản lý nội thất",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Register custom error handlers
@@ -29,7 +56,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Query-Count", "X-Profile-File", "X-Request-ID"],
 )
+app.add_middleware(QueryStatsMiddleware)
+# Added after (so wraps) QueryStatsMiddleware: the profiler's admin lookup stays out of X-Query-Count
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
+instrument_engine_pool(engine)
 
 # Include routers
 app.include_router(auth.router)
@@ -41,6 +75,10 @@ app.include_router(inventory.router)
 app.include_router(payments.router)
 app.include_router(promotions.router)
 app.include_router(reports.router)
+app.include_router(archive.router)
+app.include_router(admin.router)
+
+record_timing("import", time.perf_counter() - _import_started)
 
 @app.get("/")
 def root():
@@ -50,6 +88,11 @@ def root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
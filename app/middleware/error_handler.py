@@ -17,7 +17,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "type": error["type"]
         })
     
-    logger.error(f"Validation error on {request.url.path}: {formatted_errors}")
+    logger.error("Validation error on %s: %s", request.url.path, formatted_errors)
     
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -29,7 +29,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
-    logger.error(f"Unhandled exception on {request.url.path}: {str(exc)}", exc_info=True)
+    logger.error("Unhandled exception on %s: %s", request.url.path, str(exc), exc_info=True)
     
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
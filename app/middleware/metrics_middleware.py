@@ -0,0 +1,33 @@
+from app.core.metrics import REQUEST_COUNT, REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+import time
+
+class MetricsMiddleware:
+    """Request count, latency by route template and in-flight requests"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            # Label by the matched route template, never the raw path, to keep cardinality bounded
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], template).observe(time.perf_counter() - started)
+            REQUEST_COUNT.labels(scope["method"], template, str(status_code)).inc()
@@ -0,0 +1,92 @@
+from app.core.config import settings
+from app.core.profiler import SamplingProfiler, prune_profiles
+from app.core.security import is_admin_token
+from app.database.db import SessionLocal
+from starlette.concurrency import run_in_threadpool
+import logging
+import os
+import random
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+def _bearer_token(headers) -> str:
+    for name, value in headers:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" else ""
+    return ""
+
+def _check_admin(token: str) -> bool:
+    db = SessionLocal()
+    try:
+        return is_admin_token(token, db)
+    finally:
+        db.close()
+
+class ProfilerMiddleware:
+    """Profile a request when an admin sends `X-Profile: 1`, or at PROFILER_SAMPLE_RATE.
+    
+    When neither applies the request costs one header scan and one random() call.
+    Registered outside QueryStatsMiddleware, so the admin check's lookup is not
+    counted against the request. Only the newest PROFILER_MAX_PROFILES are kept.
+    Profiled responses carry `X-Profile-File` with the speedscope file name
+    (downloadable from /api/admin/profiles/{name}).
+    """
+    
+    def __init__(
+        self,
+        app,
+        sample_rate: float = settings.PROFILER_SAMPLE_RATE,
+        output_dir: str = settings.PROFILER_OUTPUT_DIR,
+        max_profiles: int = settings.PROFILER_MAX_PROFILES
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.max_profiles = max_profiles
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        requested = any(name == PROFILE_HEADER and value == b"1" for name, value in scope["headers"])
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not requested and not sampled:
+            await self.app(scope, receive, send)
+            return
+        if requested and not sampled:
+            token = _bearer_token(scope["headers"])
+            if not token or not await run_in_threadpool(_check_admin, token):
+                await self.app(scope, receive, send)
+                return
+        
+        profiler = SamplingProfiler()
+        
+        async def send_with_profile(message):
+            # FastAPI has validated, run and JSON-encoded the endpoint by the time headers go out
+            if message["type"] == "http.response.start":
+                profiler.stop()
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                try:
+                    _, speedscope_path = await run_in_threadpool(profiler.write, self.output_dir, scope["method"], route)
+                    await run_in_threadpool(prune_profiles, self.output_dir, self.max_profiles)
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-profile-file", os.path.basename(speedscope_path).encode()))
+                    message = {**message, "headers": headers}
+                    logger.info(
+                        "Profiled %s %s: %.1f ms, %s samples, phases %s -> %s",
+                        scope["method"], route, profiler.duration * 1000, profiler.sample_count,
+                        profiler.phase_breakdown(), speedscope_path
+                    )
+                except OSError as e:
+                    logger.error("Could not write profile for %s %s: %s", scope['method'], route, str(e))
+            await send(message)
+        
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profiler.stop()
@@ -0,0 +1,41 @@
+from app.core.config import settings
+from app.database.query_stats import start_query_stats, reset_query_stats
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class QueryStatsMiddleware:
+    """Count queries and DB time per request, report them in Server-Timing,
+    and log statement shapes repeated QUERY_REPEAT_THRESHOLD+ times (likely N+1)."""
+    
+    def __init__(self, app, repeat_threshold: int = settings.QUERY_REPEAT_THRESHOLD):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats, token = start_query_stats()
+        started = time.perf_counter()
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                elapsed = (time.perf_counter() - started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f"{stats.server_timing()}, app;dur={elapsed:.2f}".encode()))
+                headers.append((b"x-query-count", str(stats.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            reset_query_stats(token)
+            for shape, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    "Possible N+1 on %s %s: %sx %s",
+                    scope["method"], scope["path"], count, shape[:300]
+                )
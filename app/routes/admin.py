@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import FileResponse
+from app.core.config import settings
+from app.core.profiler import list_profiles
+from app.database.slow_query_log import slow_query_log
+from app.core.security import get_current_admin
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Most recent entries to return"),
+    current_user = Depends(get_current_admin)
+):
+    """Get recent slow queries (most recent first)"""
+    try:
+        return {
+            "data": slow_query_log.entries(limit),
+            "message": "Slow queries retrieved successfully",
+            "status_code": 200,
+            "threshold_ms": slow_query_log.threshold_ms
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error retrieving slow queries: %s", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(current_user = Depends(get_current_admin)):
+    """Clear the in-memory slow query buffer"""
+    slow_query_log.clear()
+    return {
+        "data": None,
+        "message": "Slow queries cleared successfully",
+        "status_code": 200
+    }
+
+@router.get("/profiles")
+async def get_profiles(current_user = Depends(get_current_admin)):
+    """List request profiles written by the sampling profiler (newest first)"""
+    try:
+        return {
+            "data": list_profiles(settings.PROFILER_OUTPUT_DIR),
+            "message": "Profiles retrieved successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error retrieving profiles: %s", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str, current_user = Depends(get_current_admin)):
+    """Download one profile (open .speedscope.json files in speedscope.app)"""
+    path = os.path.join(settings.PROFILER_OUTPUT_DIR, os.path.basename(name))
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if path.endswith(".json") else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.orm import Session
+from app.database.db import get_db
+from app.services.archive_service import ArchiveService
+from app.core.security import get_current_admin
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/archive", tags=["Archive"])
+
+@router.post("/run")
+async def run_archive(
+    horizon_days: int = Query(None, ge=1, description="Archive closed records older than this; defaults to ARCHIVE_HORIZON_DAYS"),
+    batch_size: int = Query(None, ge=1, le=50000, description="Rows moved per transaction; defaults to ARCHIVE_BATCH_SIZE"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin)
+):
+    """Move closed sales, payments and snapshotted ledger rows into archive tables"""
+    try:
+        service = ArchiveService(db)
+        result = service.run(horizon_days, batch_size)
+        return {
+            "data": result,
+            "message": "Archive completed successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error running archive: %s", str(e))
+        raise HTTPException(status_code=500, detail="Error running archive")
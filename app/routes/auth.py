@@ -28,7 +28,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error registering user: {str(e)}")
+        logger.error("Error registering user: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/login")
@@ -45,7 +45,7 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error logging in: {str(e)}")
+        logger.error("Error logging in: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/me")
@@ -60,7 +60,7 @@ async def get_current_user_profile(current_user = Depends(get_current_user)):
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving user profile: {str(e)}")
+        logger.error("Error retrieving user profile: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/logout")
@@ -75,7 +75,7 @@ async def logout(current_user = Depends(get_current_user)):
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error logging out: {str(e)}")
+        logger.error("Error logging out: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/change-password")
@@ -96,7 +96,7 @@ async def change_password(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error changing password: {str(e)}")
+        logger.error("Error changing password: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/profile")
@@ -117,5 +117,5 @@ async def update_profile(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error updating profile: {str(e)}")
+        logger.error("Error updating profile: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
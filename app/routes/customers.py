@@ -1,9 +1,7 @@
 import logging
 from fastapi import APIRouter, Depends, Query, status, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.database.db import get_db
-from app.database.models import Sale
 from app.schemas.customer_schema import (
     CustomerCreate, CustomerUpdate, CustomerResponse
 )
@@ -14,16 +12,12 @@ from typing import List
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/customers", tags=["customers"])
 
-def _enrich_customer_with_sales_data(db: Session, customer):
-    """Helper function to add sales statistics to customer response"""
-    # Calculate total spent and total orders
-    sales_stats = db.query(
-        func.count(Sale.id).label('total_orders'),
-        func.coalesce(func.sum(Sale.final_amount), 0).label('total_spent')
-    ).filter(
-        Sale.customer_id == customer.id,
-        Sale.status != 'cancelled'
-    ).first()
+def _enrich_customer_with_sales_data(db: Session, customer, sales_stats=None):
+    """Helper function to add sales statistics to customer response.
+    Lists pass sales_stats from one CustomerService.get_sales_stats call for the whole page."""
+    if sales_stats is None:
+        sales_stats = CustomerService(db).get_sales_stats([customer.id])
+    total_orders, total_spent = sales_stats.get(customer.id, (0, 0.0))
     
     customer_dict = {
         "id": customer.id,
@@ -35,8 +29,8 @@ def _enrich_customer_with_sales_data(db: Session, customer):
         "country": customer.country,
         "created_at": customer.created_at,
         "updated_at": customer.updated_at,
-        "total_spent": float(sales_stats.total_spent) if sales_stats else 0.0,
-        "total_orders": sales_stats.total_orders if sales_stats else 0,
+        "total_spent": total_spent,
+        "total_orders": total_orders,
     }
     return customer_dict
 
@@ -48,10 +42,10 @@ async def create_customer(
 ):
     """Create a new customer"""
     try:
-        logger.info(f"Creating new customer")
+        logger.info("Creating new customer")
         service = CustomerService(db)
         result = service.create_customer(customer_data)
-        logger.info(f"Customer created successfully with ID: {result.id}")
+        logger.info("Customer created successfully with ID: %s", result.id)
         
         # Enrich with sales data
         enriched = _enrich_customer_with_sales_data(db, result)
@@ -62,10 +56,10 @@ async def create_customer(
             "status_code": 201
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error creating customer: {e.detail}")
+        logger.warning("HTTP error creating customer: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error creating customer: {str(e)}")
+        logger.error("Error creating customer: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create customer"
@@ -82,14 +76,15 @@ async def get_customers(
     """Get all customers with pagination and search"""
     try:
         skip = (page - 1) * limit
-        logger.info(f"Fetching customers: page={page}, limit={limit}, search={search}")
+        logger.info("Fetching customers: page=%s, limit=%s, search=%s", page, limit, search)
         service = CustomerService(db)
         customers_list = service.get_all_customers(skip, limit)
         total_count = service.get_customers_count()
-        logger.info(f"Retrieved {len(customers_list)} customers")
+        logger.info("Retrieved %s customers", len(customers_list))
         
         # Enrich all customers with sales data
-        enriched_customers = [_enrich_customer_with_sales_data(db, c) for c in customers_list]
+        sales_stats = service.get_sales_stats(c.id for c in customers_list)
+        enriched_customers = [_enrich_customer_with_sales_data(db, c, sales_stats) for c in customers_list]
         
         return {
             "data": enriched_customers,
@@ -100,10 +95,10 @@ async def get_customers(
             "total": total_count
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error fetching customers: {e.detail}")
+        logger.warning("HTTP error fetching customers: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error fetching customers: {str(e)}")
+        logger.error("Error fetching customers: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch customers"
@@ -117,16 +112,16 @@ async def get_customer(
 ):
     """Get customer by ID"""
     try:
-        logger.info(f"Fetching customer {customer_id}")
+        logger.info("Fetching customer %s", customer_id)
         service = CustomerService(db)
         customer = service.get_customer_by_id(customer_id)
         if not customer:
-            logger.warning(f"Customer not found: {customer_id}")
+            logger.warning("Customer not found: %s", customer_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Customer {customer_id} not found"
             )
-        logger.info(f"Customer found: {customer_id}")
+        logger.info("Customer found: %s", customer_id)
         
         # Enrich with sales data
         enriched = _enrich_customer_with_sales_data(db, customer)
@@ -139,7 +134,7 @@ async def get_customer(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error fetching customer: {str(e)}")
+        logger.error("Error fetching customer: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch customer"
@@ -154,10 +149,10 @@ async def update_customer(
 ):
     """Update customer"""
     try:
-        logger.info(f"Updating customer {customer_id}")
+        logger.info("Updating customer %s", customer_id)
         service = CustomerService(db)
         result = service.update_customer(customer_id, customer_data)
-        logger.info(f"Customer updated successfully: {customer_id}")
+        logger.info("Customer updated successfully: %s", customer_id)
         
         # Enrich with sales data
         enriched = _enrich_customer_with_sales_data(db, result)
@@ -168,10 +163,10 @@ async def update_customer(
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error updating customer: {e.detail}")
+        logger.warning("HTTP error updating customer: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error updating customer: {str(e)}")
+        logger.error("Error updating customer: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update customer"
@@ -185,20 +180,20 @@ async def delete_customer(
 ):
     """Delete customer"""
     try:
-        logger.info(f"Deleting customer {customer_id}")
+        logger.info("Deleting customer %s", customer_id)
         service = CustomerService(db)
         service.delete_customer(customer_id)
-        logger.info(f"Customer deleted successfully: {customer_id}")
+        logger.info("Customer deleted successfully: %s", customer_id)
         return {
             "data": None,
             "message": "Customer deleted successfully",
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error deleting customer: {e.detail}")
+        logger.warning("HTTP error deleting customer: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error deleting customer: {str(e)}")
+        logger.error("Error deleting customer: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete customer"
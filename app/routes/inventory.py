@@ -3,10 +3,14 @@ from fastapi import APIRouter, Depends, Query, status, HTTPException
 from sqlalchemy.orm import Session
 from app.database.db import get_db
 from app.schemas.inventory_schema import (
-    InventoryResponse, InventoryTransactionCreate, InventoryTransactionResponse
+    InventoryResponse, InventoryTransactionCreate, InventoryTransactionResponse,
+    InventoryTransactionBatchCreate, StockReservationCreate, StockReservationResponse
 )
 from app.services.inventory_service import InventoryService
+from app.services.reservation_service import ReservationService
+from app.services.inventory_snapshot_service import InventorySnapshotService
 from app.core.security import get_current_user
+from datetime import datetime
 from typing import List
 
 logger = logging.getLogger(__name__)
@@ -21,19 +25,19 @@ async def get_inventory_list(
 ):
     """Get all inventory"""
     try:
-        logger.info(f"Fetching inventory with skip={skip}, limit={limit}")
+        logger.info("Fetching inventory with skip=%s, limit=%s", skip, limit)
         inventory_list = InventoryService.get_inventory_list(db, skip, limit)
-        logger.info(f"Retrieved {len(inventory_list)} inventory items")
+        logger.info("Retrieved %s inventory items", len(inventory_list))
         return {
             "data": inventory_list,
             "message": "Inventory retrieved successfully",
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error fetching inventory: {e.detail}")
+        logger.warning("HTTP error fetching inventory: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error fetching inventory: {str(e)}")
+        logger.error("Error fetching inventory: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch inventory"
@@ -47,15 +51,15 @@ async def get_product_inventory(
 ):
     """Get inventory for a specific product"""
     try:
-        logger.info(f"Fetching inventory for product {product_id}")
+        logger.info("Fetching inventory for product %s", product_id)
         inventory = InventoryService.get_inventory_by_product(db, product_id)
         if not inventory:
-            logger.warning(f"Inventory not found for product {product_id}")
+            logger.warning("Inventory not found for product %s", product_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Inventory not found for product {product_id}"
             )
-        logger.info(f"Inventory found for product {product_id}")
+        logger.info("Inventory found for product %s", product_id)
         return {
             "data": inventory,
             "message": "Inventory retrieved successfully",
@@ -64,12 +68,95 @@ async def get_product_inventory(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error fetching inventory: {str(e)}")
+        logger.error("Error fetching inventory: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch inventory"
         )
 
+@router.get("/product/{product_id}/stock-at")
+async def get_product_stock_at(
+    product_id: int,
+    at: datetime = Query(..., description="Point in time (ISO 8601)"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get stock on hand for a product at a point in time"""
+    try:
+        service = InventorySnapshotService(db)
+        stock = service.get_stock_at(product_id, at)
+        return {
+            "data": stock,
+            "message": "Stock level retrieved successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error fetching stock at %s for product %s: %s", at, product_id, str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch stock level"
+        )
+
+@router.get("/product/{product_id}/movements")
+async def get_product_movements(
+    product_id: int,
+    start: datetime = Query(..., description="Period start (ISO 8601)"),
+    end: datetime = Query(..., description="Period end (ISO 8601)"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get stock movement summary for a product between two points in time"""
+    try:
+        if end < start:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="End must be after start"
+            )
+        service = InventorySnapshotService(db)
+        report = service.get_movement_report(product_id, start, end)
+        return {
+            "data": report,
+            "message": "Stock movements retrieved successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error fetching movements for product %s: %s", product_id, str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch stock movements"
+        )
+
+@router.post("/snapshots/compact")
+async def compact_inventory_snapshots(
+    as_of: datetime = Query(None, description="Snapshot time; defaults to the database clock's now"),
+    batch_size: int = Query(500, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Create stock snapshots for products whose ledger moved since their last snapshot"""
+    try:
+        logger.info("Compacting inventory ledger as of %s", as_of or 'now')
+        service = InventorySnapshotService(db)
+        created = service.compact(as_of, batch_size)
+        logger.info("Created %s inventory snapshots", created)
+        return {
+            "data": {"snapshots_created": created},
+            "message": "Inventory snapshots created successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error compacting inventory snapshots: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compact inventory snapshots"
+        )
+
 @router.post("/transaction", status_code=status.HTTP_201_CREATED)
 async def add_inventory_transaction(
     transaction: InventoryTransactionCreate,
@@ -78,24 +165,50 @@ async def add_inventory_transaction(
 ):
     """Add inventory transaction (IN, OUT, ADJUSTMENT)"""
     try:
-        logger.info(f"Adding inventory transaction: {transaction.transaction_type}")
+        logger.info("Adding inventory transaction: %s", transaction.transaction_type)
         result = InventoryService.add_transaction(db, transaction)
-        logger.info(f"Transaction added successfully")
+        logger.info("Transaction added successfully")
         return {
             "data": result,
             "message": "Transaction added successfully",
             "status_code": 201
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error adding transaction: {e.detail}")
+        logger.warning("HTTP error adding transaction: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error adding transaction: {str(e)}")
+        logger.error("Error adding transaction: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to add transaction"
         )
 
+@router.post("/transaction/batch")
+async def add_inventory_transactions_batch(
+    batch: InventoryTransactionBatchCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Add many inventory transactions in a single DB transaction"""
+    try:
+        logger.info("Adding %s inventory transactions (atomic=%s)", len(batch.transactions), batch.atomic)
+        result = InventoryService.add_transactions_batch(db, batch.transactions, batch.atomic)
+        logger.info("Batch applied: %s ok, %s failed", result.applied, result.failed)
+        return {
+            "data": result,
+            "message": "Transactions processed successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        logger.warning("HTTP error adding transaction batch: %s", e.detail)
+        raise
+    except Exception as e:
+        logger.error("Error adding transaction batch: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to add transactions"
+        )
+
 @router.get("/transactions")
 async def get_transactions_list(
     skip: int = Query(0, ge=0),
@@ -107,21 +220,21 @@ async def get_transactions_list(
 ):
     """Get all inventory transactions with product names"""
     try:
-        logger.info(f"Fetching transactions with skip={skip}, limit={limit}")
+        logger.info("Fetching transactions with skip=%s, limit=%s", skip, limit)
         transactions = InventoryService.get_transactions_list(
             db, skip, limit, product_id, transaction_type
         )
-        logger.info(f"Retrieved {len(transactions)} transactions")
+        logger.info("Retrieved %s transactions", len(transactions))
         return {
             "data": transactions,
             "message": "Transactions retrieved successfully",
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error fetching transactions: {e.detail}")
+        logger.warning("HTTP error fetching transactions: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error fetching transactions: {str(e)}")
+        logger.error("Error fetching transactions: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch transactions"
@@ -136,18 +249,97 @@ async def get_low_stock(
     try:
         logger.info("Fetching low stock products")
         low_stock = InventoryService.get_low_stock_products(db)
-        logger.info(f"Found {len(low_stock)} low stock products")
+        logger.info("Found %s low stock products", len(low_stock))
         return {
             "data": low_stock,
             "message": "Low stock products retrieved successfully",
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error fetching low stock: {e.detail}")
+        logger.warning("HTTP error fetching low stock: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error fetching low stock products: {str(e)}")
+        logger.error("Error fetching low stock products: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch low stock products"
-        )
\ No newline at end of file
+        )
+
+@router.post("/reservations", status_code=status.HTTP_201_CREATED)
+async def create_reservation(
+    reservation: StockReservationCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Hold stock for a limited time (reserve step of checkout)"""
+    try:
+        logger.info("Reserving %s of product %s", reservation.quantity, reservation.product_id)
+        service = ReservationService(db)
+        result = service.reserve(
+            reservation.product_id, reservation.quantity,
+            ttl_seconds=reservation.ttl_seconds, sale_id=reservation.sale_id
+        )
+        return {
+            "data": StockReservationResponse.model_validate(result),
+            "message": "Stock reserved successfully",
+            "status_code": 201
+        }
+    except HTTPException as e:
+        logger.warning("HTTP error reserving stock: %s", e.detail)
+        raise
+    except Exception as e:
+        logger.error("Error reserving stock: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to reserve stock"
+        )
+
+@router.post("/reservations/{reservation_id}/commit")
+async def commit_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Deduct held stock (confirm step of checkout)"""
+    try:
+        service = ReservationService(db)
+        result = service.commit(reservation_id)
+        return {
+            "data": StockReservationResponse.model_validate(result),
+            "message": "Reservation committed successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        logger.warning("HTTP error committing reservation %s: %s", reservation_id, e.detail)
+        raise
+    except Exception as e:
+        logger.error("Error committing reservation %s: %s", reservation_id, str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to commit reservation"
+        )
+
+@router.post("/reservations/{reservation_id}/release")
+async def release_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Return held stock to the available pool"""
+    try:
+        service = ReservationService(db)
+        result = service.release(reservation_id)
+        return {
+            "data": StockReservationResponse.model_validate(result),
+            "message": "Reservation released successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        logger.warning("HTTP error releasing reservation %s: %s", reservation_id, e.detail)
+        raise
+    except Exception as e:
+        logger.error("Error releasing reservation %s: %s", reservation_id, str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to release reservation"
+        )
@@ -1,25 +1,29 @@
-from fastapi import APIRouter, Depends, Query, status, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.database.db import get_db
-from app.database.models import Sale, Customer
 from app.schemas.payment_schema import (
     PaymentCreate, PaymentUpdate, PaymentResponse
 )
 from app.services.payment_service import PaymentService
+from app.services.payment_import_service import PaymentImportService, iter_settlements, DEFAULT_CHUNK_SIZE
 from app.core.security import get_current_user
 from typing import List
+import io
 import logging
+import tempfile
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/payments", tags=["Payments"])
 
+# Uploads above this size spill from memory to a temporary file
+IMPORT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
 def _enrich_payment_with_customer_info(db: Session, payment):
     """Helper function to add customer info to payment response"""
-    sale = db.query(Sale).filter(Sale.id == payment.sale_id).first()
-    customer = None
-    if sale:
-        customer = db.query(Customer).filter(Customer.id == sale.customer_id).first()
+    sale = payment.sale
+    customer = sale.customer if sale else None
     
     payment_dict = {
         "id": payment.id,
@@ -61,7 +65,41 @@ async def create_payment(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error creating payment: {str(e)}")
+        logger.error("Error creating payment: %s", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/import")
+async def import_payments(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="Request body format: csv (with header) or ndjson"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=5000, description="Rows matched and inserted per transaction"),
+    max_report: int = Query(1000, ge=0, le=10000, description="Maximum mismatches returned"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Import a settlement file (raw request body) and reconcile it against sales.
+    Columns: invoice_number, reference_number, amount, payment_method, payment_date, notes."""
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_BYTES) as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+            spool.seek(0)
+            
+            text = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+            service = PaymentImportService(db)
+            summary = await run_in_threadpool(
+                service.import_rows, iter_settlements(text, format), chunk_size, max_report
+            )
+        
+        return {
+            "data": summary,
+            "message": "Payments imported successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error importing payments: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/")
@@ -95,7 +133,7 @@ async def get_payments(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving payments: {str(e)}")
+        logger.error("Error retrieving payments: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{payment_id}")
@@ -120,7 +158,7 @@ async def get_payment(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving payment {payment_id}: {str(e)}")
+        logger.error("Error retrieving payment %s: %s", payment_id, str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{payment_id}")
@@ -146,7 +184,7 @@ async def update_payment(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error updating payment {payment_id}: {str(e)}")
+        logger.error("Error updating payment %s: %s", payment_id, str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{payment_id}")
@@ -167,5 +205,5 @@ async def delete_payment(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error deleting payment {payment_id}: {str(e)}")
+        logger.error("Error deleting payment %s: %s", payment_id, str(e))
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
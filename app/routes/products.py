@@ -3,10 +3,10 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
 from sqlalchemy.orm import Session
 from app.database.db import get_db
-from app.database.models import Inventory
 from app.schemas.product_schema import ProductCreate, ProductUpdate, ProductResponse
 from app.schemas.response_schema import DataResponse, ListDataResponse
 from app.services.product_service import ProductService
+from app.services.inventory_service import InventoryService
 from app.core.security import get_current_user
 from app.utils.validators import validate_id
 
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/api/products", tags=["products"])
 
 def _enrich_product_with_inventory(db: Session, product):
     """Helper function to add inventory data to product response"""
-    inventory = db.query(Inventory).filter(Inventory.product_id == product.id).first()
+    inventory = InventoryService.find_inventory_by_product(db, product.id)
     
     # Create dict from product
     product_dict = {
@@ -47,10 +47,10 @@ async def create_product(
 ):
     """Create a new product. Requires authentication."""
     try:
-        logger.info(f"Creating product: {product.name}")
+        logger.info("Creating product: %s", product.name)
         service = ProductService(db)
         result = service.create_product(product)
-        logger.info(f"Product created successfully with ID: {result.id}")
+        logger.info("Product created successfully with ID: %s", result.id)
         
         # Enrich with inventory data
         enriched = _enrich_product_with_inventory(db, result)
@@ -61,10 +61,10 @@ async def create_product(
             "status_code": 201
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error creating product: {e.detail}")
+        logger.warning("HTTP error creating product: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error creating product: {str(e)}")
+        logger.error("Error creating product: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create product"
@@ -82,13 +82,14 @@ async def get_all_products(
     """Get all active products with pagination and search."""
     try:
         skip = (page - 1) * limit
-        logger.info(f"Fetching products: page={page}, limit={limit}, search={search}")
+        logger.info("Fetching products: page=%s, limit=%s, search=%s", page, limit, search)
         service = ProductService(db)
         products = service.get_all_products(skip=skip, limit=limit, search=search)
         total_count = service.get_products_count(search=search)
-        logger.info(f"Retrieved {len(products)} products")
+        logger.info("Retrieved %s products", len(products))
         
         # Enrich all products with inventory data
+        InventoryService.prefetch_inventories(db, [p.id for p in products])
         enriched_products = [_enrich_product_with_inventory(db, p) for p in products]
         
         return {
@@ -100,10 +101,10 @@ async def get_all_products(
             "total": total_count
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error fetching products: {e.detail}")
+        logger.warning("HTTP error fetching products: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error fetching products: {str(e)}")
+        logger.error("Error fetching products: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch products"
@@ -120,16 +121,16 @@ async def get_product(
     """Get a specific product by ID. Product ID must be a positive integer."""
     try:
         validated_id = validate_id(product_id)
-        logger.info(f"Fetching product with ID: {validated_id}")
+        logger.info("Fetching product with ID: %s", validated_id)
         service = ProductService(db)
         product = service.get_product_by_id(validated_id)
         if not product:
-            logger.warning(f"Product not found with ID: {validated_id}")
+            logger.warning("Product not found with ID: %s", validated_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product with ID {validated_id} not found"
             )
-        logger.info(f"Product found: {product.name}")
+        logger.info("Product found: %s", product.name)
         
         # Enrich with inventory data
         enriched = _enrich_product_with_inventory(db, product)
@@ -142,7 +143,7 @@ async def get_product(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error fetching product {product_id}: {str(e)}")
+        logger.error("Error fetching product %s: %s", product_id, str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch product"
@@ -159,20 +160,20 @@ async def update_product(
     """Update an existing product. Requires authentication."""
     try:
         validated_id = validate_id(product_id)
-        logger.info(f"Updating product with ID: {validated_id}")
+        logger.info("Updating product with ID: %s", validated_id)
         service = ProductService(db)
         
         # Check if product exists first
         existing = service.get_product_by_id(validated_id)
         if not existing:
-            logger.warning(f"Product not found for update with ID: {validated_id}")
+            logger.warning("Product not found for update with ID: %s", validated_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product with ID {validated_id} not found"
             )
         
         updated = service.update_product(validated_id, product_update)
-        logger.info(f"Product updated successfully: {updated.name}")
+        logger.info("Product updated successfully: %s", updated.name)
         
         # Enrich with inventory data
         enriched = _enrich_product_with_inventory(db, updated)
@@ -185,7 +186,7 @@ async def update_product(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error updating product {product_id}: {str(e)}")
+        logger.error("Error updating product %s: %s", product_id, str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update product"
@@ -201,20 +202,20 @@ async def delete_product(
     """Delete (soft delete) a product. Requires authentication."""
     try:
         validated_id = validate_id(product_id)
-        logger.info(f"Deleting product with ID: {validated_id}")
+        logger.info("Deleting product with ID: %s", validated_id)
         service = ProductService(db)
         
         # Check if product exists
         existing = service.get_product_by_id(validated_id)
         if not existing:
-            logger.warning(f"Product not found for deletion with ID: {validated_id}")
+            logger.warning("Product not found for deletion with ID: %s", validated_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product with ID {validated_id} not found"
             )
         
         service.delete_product(validated_id)
-        logger.info(f"Product deleted successfully with ID: {validated_id}")
+        logger.info("Product deleted successfully with ID: %s", validated_id)
         return {
             "data": None,
             "message": "Product deleted successfully",
@@ -223,16 +224,16 @@ async def delete_product(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error deleting product {product_id}: {str(e)}")
+        logger.error("Error deleting product %s: %s", product_id, str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete product"
         )
-        logger.info(f"Product deleted successfully with ID: {validated_id}")
+        logger.info("Product deleted successfully with ID: %s", validated_id)
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error deleting product {product_id}: {str(e)}")
+        logger.error("Error deleting product %s: %s", product_id, str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete product"
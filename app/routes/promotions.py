@@ -2,11 +2,13 @@ from fastapi import APIRouter, Depends, Query, status, HTTPException
 from sqlalchemy.orm import Session
 from app.database.db import get_db
 from app.schemas.promotion_schema import (
-    PromotionCreate, PromotionUpdate, PromotionResponse
+    PromotionCreate, PromotionUpdate, PromotionResponse, PromotionProductsUpdate
 )
 from app.services.promotion_service import PromotionService
+from app.services.pricing_service import PricingService
 from app.core.security import get_current_user
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,7 +33,7 @@ async def create_promotion(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error creating promotion: {str(e)}")
+        logger.error("Error creating promotion: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/")
@@ -60,7 +62,7 @@ async def get_promotions(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving promotions: {str(e)}")
+        logger.error("Error retrieving promotions: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/active/list")
@@ -80,7 +82,30 @@ async def get_active_promotions(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving active promotions: {str(e)}")
+        logger.error("Error retrieving active promotions: %s", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/pricing/best")
+async def get_best_prices(
+    product_ids: List[int] = Query(..., description="Product IDs to price"),
+    quantity: int = Query(1, ge=1, description="Quantity per product"),
+    at: Optional[datetime] = Query(None, description="Price as of this time (default now)"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get the best promotional price for each product"""
+    try:
+        service = PricingService(db)
+        quotes = service.get_best_prices(product_ids, quantity, at)
+        return {
+            "data": quotes,
+            "message": "Prices retrieved successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error retrieving prices: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{promotion_id}")
@@ -101,7 +126,7 @@ async def get_promotion(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving promotion {promotion_id}: {str(e)}")
+        logger.error("Error retrieving promotion %s: %s", promotion_id, str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{promotion_id}")
@@ -123,7 +148,35 @@ async def update_promotion(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error updating promotion {promotion_id}: {str(e)}")
+        logger.error("Error updating promotion %s: %s", promotion_id, str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.patch("/{promotion_id}/products")
+async def update_promotion_products(
+    promotion_id: int,
+    products_data: PromotionProductsUpdate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Add/remove promotion products by id or category"""
+    try:
+        service = PromotionService(db)
+        product_ids = service.update_promotion_products(
+            promotion_id,
+            add_ids=products_data.add_product_ids,
+            add_categories=products_data.add_categories,
+            remove_ids=products_data.remove_product_ids,
+            remove_categories=products_data.remove_categories
+        )
+        return {
+            "data": {"promotion_id": promotion_id, "product_count": len(product_ids)},
+            "message": "Promotion products updated successfully",
+            "status_code": 200
+        }
+    except HTTPException as e:
+        raise
+    except Exception as e:
+        logger.error("Error updating products of promotion %s: %s", promotion_id, str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{promotion_id}")
@@ -144,5 +197,5 @@ async def delete_promotion(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error deleting promotion {promotion_id}: {str(e)}")
+        logger.error("Error deleting promotion %s: %s", promotion_id, str(e))
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,19 +1,42 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.database.db import get_db
 from app.schemas.report_schema import (
     RevenueReportItem, TopProductItem, CustomerReportItem,
-    InventoryReportItem, DashboardSummary
+    InventoryReportItem, InventoryStatusCounts, DashboardSummary
 )
 from app.services.report_service import ReportService
 from app.core.security import get_current_user
-from typing import List
+from typing import List, Iterator
+import csv
+import io
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/reports", tags=["Reports"])
 
+CUSTOMER_REPORT_FIELDS = ["customer_id", "customer_name", "total_purchases", "total_spent"]
+
+def _stream_ndjson(items: Iterator) -> Iterator[str]:
+    """Helper function to encode report items as newline-delimited JSON"""
+    for item in items:
+        yield item.model_dump_json() + "\n"
+
+def _stream_csv(items: Iterator, fieldnames: List[str]) -> Iterator[str]:
+    """Helper function to encode report items as CSV, one row at a time"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    for item in items:
+        writer.writerow(item.model_dump())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
 @router.get("/dashboard/summary")
 async def get_dashboard_summary(
     db: Session = Depends(get_db),
@@ -31,19 +54,20 @@ async def get_dashboard_summary(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving dashboard summary: {str(e)}")
+        logger.error("Error retrieving dashboard summary: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/revenue")
 async def revenue_report(
-    days: int = Query(30, ge=1, le=365),
+    days: int = Query(30, ge=1, le=3650),
+    include_archived: bool = Query(False, description="Include archived sales"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get revenue report for last N days"""
     try:
         service = ReportService(db)
-        report = service.get_revenue_report(days)
+        report = service.get_revenue_report(days, include_archived)
         return {
             "data": report,
             "message": "Revenue report retrieved successfully",
@@ -52,7 +76,7 @@ async def revenue_report(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving revenue report: {str(e)}")
+        logger.error("Error retrieving revenue report: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/top-products")
@@ -73,45 +97,82 @@ async def top_products_report(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving top products report: {str(e)}")
+        logger.error("Error retrieving top products report: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/customers")
 async def customer_report(
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(100, ge=1, le=1000, description="Items per page (top-N on page 1)"),
+    format: str = Query("json", pattern="^(json|ndjson|csv)$", description="json (paginated), ndjson or csv (streamed, all rows)"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get customer purchase report"""
     try:
         service = ReportService(db)
-        report = service.get_customer_report()
+        if format == "ndjson":
+            return StreamingResponse(
+                _stream_ndjson(service.iter_customer_report()),
+                media_type="application/x-ndjson"
+            )
+        if format == "csv":
+            return StreamingResponse(
+                _stream_csv(service.iter_customer_report(), CUSTOMER_REPORT_FIELDS),
+                media_type="text/csv",
+                headers={"Content-Disposition": "attachment; filename=customer_report.csv"}
+            )
+        
+        skip = (page - 1) * limit
+        report = service.get_customer_report(skip, limit)
+        total_count = service.get_customer_report_count()
         return {
             "data": report,
             "message": "Customer report retrieved successfully",
-            "status_code": 200
+            "status_code": 200,
+            "page": page,
+            "limit": limit,
+            "total": total_count
         }
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving customer report: {str(e)}")
+        logger.error("Error retrieving customer report: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/inventory")
 async def inventory_report(
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(100, ge=1, le=1000, description="Items per page"),
+    status: str = Query(None, pattern="^(?i:ok|low|critical)$", description="Filter by status: OK, LOW, CRITICAL"),
+    category: str = Query(None, description="Filter by product category"),
+    counts_only: bool = Query(False, description="Return only per-status counts"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get inventory status report"""
     try:
         service = ReportService(db)
-        report = service.get_inventory_report()
+        if counts_only:
+            return {
+                "data": service.get_inventory_status_counts(category),
+                "message": "Inventory status counts retrieved successfully",
+                "status_code": 200
+            }
+        
+        skip = (page - 1) * limit
+        report = service.get_inventory_report(skip, limit, status, category)
+        total_count = service.get_inventory_report_count(status, category)
         return {
             "data": report,
             "message": "Inventory report retrieved successfully",
-            "status_code": 200
+            "status_code": 200,
+            "page": page,
+            "limit": limit,
+            "total": total_count
         }
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving inventory report: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        logger.error("Error retrieving inventory report: %s", str(e))
+        raise HTTPException(status_code=500, detail=str(e))
@@ -15,7 +15,11 @@ router = APIRouter(prefix="/api/sales", tags=["sales"])
 
 def _enrich_sale_with_customer_info(db: Session, sale):
     """Helper function to add customer info to sale response"""
-    customer = db.query(Customer).filter(Customer.id == sale.customer_id).first()
+    # Live sales carry the customer relationship (eager-loaded by the list queries); archived ones do not
+    if hasattr(sale, "customer"):
+        customer = sale.customer
+    else:
+        customer = db.query(Customer).filter(Customer.id == sale.customer_id).first()
     
     sale_dict = {
         "id": sale.id,
@@ -30,6 +34,8 @@ def _enrich_sale_with_customer_info(db: Session, sale):
         "discount": sale.discount,
         "tax": sale.tax,
         "final_amount": sale.final_amount,
+        "amount_paid": sale.amount_paid,
+        "balance_due": sale.final_amount - sale.amount_paid,
         "status": sale.status,
         "notes": sale.notes,
         "items": sale.items,
@@ -46,10 +52,10 @@ async def create_sale(
 ):
     """Create a new sale"""
     try:
-        logger.info(f"Creating new sale")
+        logger.info("Creating new sale")
         service = SaleService(db)
         result = service.create_sale(sale_data, current_user.id)
-        logger.info(f"Sale created successfully with ID: {result.id}")
+        logger.info("Sale created successfully with ID: %s", result.id)
         
         # Enrich with customer info
         enriched = _enrich_sale_with_customer_info(db, result)
@@ -60,10 +66,10 @@ async def create_sale(
             "status_code": 201
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error creating sale: {e.detail}")
+        logger.warning("HTTP error creating sale: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error creating sale: {str(e)}")
+        logger.error("Error creating sale: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create sale"
@@ -75,17 +81,22 @@ async def get_sales(
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
     search: str = Query(None, description="Search by invoice number or customer name"),
     status_filter: str = Query(None, description="Filter by status: completed, pending, cancelled"),
+    include_archived: bool = Query(False, description="Also search archived sales"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get all sales with pagination, search and filters"""
     try:
         skip = (page - 1) * limit
-        logger.info(f"Fetching sales: page={page}, limit={limit}, search={search}, status={status_filter}")
+        logger.info("Fetching sales: page=%s, limit=%s, search=%s, status=%s", page, limit, search, status_filter)
         service = SaleService(db)
-        sales_list = service.get_all_sales(skip, limit, search=search, status_filter=status_filter)
-        total_count = service.get_sales_count(search=search, status_filter=status_filter)
-        logger.info(f"Retrieved {len(sales_list)} sales")
+        sales_list = service.get_all_sales(
+            skip, limit, search=search, status_filter=status_filter, include_archived=include_archived
+        )
+        total_count = service.get_sales_count(
+            search=search, status_filter=status_filter, include_archived=include_archived
+        )
+        logger.info("Retrieved %s sales", len(sales_list))
         
         # Enrich all sales with customer info
         enriched_sales = [_enrich_sale_with_customer_info(db, s) for s in sales_list]
@@ -99,33 +110,70 @@ async def get_sales(
             "total": total_count
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error fetching sales: {e.detail}")
+        logger.warning("HTTP error fetching sales: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error fetching sales: {str(e)}")
+        logger.error("Error fetching sales: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch sales"
         )
 
+@router.get("/outstanding")
+async def get_outstanding_sales(
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    customer_id: int = Query(None, description="Filter by customer"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Get sales with an unpaid balance, oldest first"""
+    try:
+        skip = (page - 1) * limit
+        service = SaleService(db)
+        sales_list = service.get_outstanding_sales(skip, limit, customer_id=customer_id)
+        total_count = service.get_outstanding_sales_count(customer_id=customer_id)
+        
+        # Enrich all sales with customer info
+        enriched_sales = [_enrich_sale_with_customer_info(db, s) for s in sales_list]
+        
+        return {
+            "data": enriched_sales,
+            "message": "Outstanding sales retrieved successfully",
+            "status_code": 200,
+            "page": page,
+            "limit": limit,
+            "total": total_count
+        }
+    except HTTPException as e:
+        logger.warning("HTTP error fetching outstanding sales: %s", e.detail)
+        raise
+    except Exception as e:
+        logger.error("Error fetching outstanding sales: %s", str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch outstanding sales"
+        )
+
 @router.get("/{sale_id}")
 async def get_sale(
     sale_id: int,
+    include_archived: bool = Query(False, description="Fall back to archived sales"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get sale by ID"""
     try:
-        logger.info(f"Fetching sale {sale_id}")
+        logger.info("Fetching sale %s", sale_id)
         service = SaleService(db)
-        sale = service.get_sale_by_id(sale_id)
+        sale = service.get_sale_by_id(sale_id, include_archived=include_archived)
         if not sale:
-            logger.warning(f"Sale not found: {sale_id}")
+            logger.warning("Sale not found: %s", sale_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Sale {sale_id} not found"
             )
-        logger.info(f"Sale found: {sale_id}")
+        logger.info("Sale found: %s", sale_id)
         
         # Enrich with customer info
         enriched = _enrich_sale_with_customer_info(db, sale)
@@ -138,7 +186,7 @@ async def get_sale(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error fetching sale: {str(e)}")
+        logger.error("Error fetching sale: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch sale"
@@ -153,10 +201,10 @@ async def update_sale(
 ):
     """Update sale status or notes"""
     try:
-        logger.info(f"Updating sale {sale_id}")
+        logger.info("Updating sale %s", sale_id)
         service = SaleService(db)
         result = service.update_sale(sale_id, sale_data)
-        logger.info(f"Sale updated successfully: {sale_id}")
+        logger.info("Sale updated successfully: %s", sale_id)
         
         # Enrich with customer info
         enriched = _enrich_sale_with_customer_info(db, result)
@@ -167,10 +215,10 @@ async def update_sale(
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error updating sale: {e.detail}")
+        logger.warning("HTTP error updating sale: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error updating sale: {str(e)}")
+        logger.error("Error updating sale: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update sale"
@@ -184,20 +232,20 @@ async def delete_sale(
 ):
     """Delete (cancel) sale and restore inventory"""
     try:
-        logger.info(f"Deleting sale {sale_id}")
+        logger.info("Deleting sale %s", sale_id)
         service = SaleService(db)
         service.delete_sale(sale_id)
-        logger.info(f"Sale deleted successfully: {sale_id}")
+        logger.info("Sale deleted successfully: %s", sale_id)
         return {
             "data": None,
             "message": "Sale deleted successfully",
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error deleting sale: {e.detail}")
+        logger.warning("HTTP error deleting sale: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error deleting sale: {str(e)}")
+        logger.error("Error deleting sale: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete sale"
@@ -20,20 +20,20 @@ async def create_supplier(
 ):
     """Create a new supplier"""
     try:
-        logger.info(f"Creating new supplier")
+        logger.info("Creating new supplier")
         service = SupplierService(db)
         result = service.create_supplier(supplier_data)
-        logger.info(f"Supplier created successfully with ID: {result.id}")
+        logger.info("Supplier created successfully with ID: %s", result.id)
         return {
             "data": result,
             "message": "Supplier created successfully",
             "status_code": 201
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error creating supplier: {e.detail}")
+        logger.warning("HTTP error creating supplier: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error creating supplier: {str(e)}")
+        logger.error("Error creating supplier: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create supplier"
@@ -50,11 +50,11 @@ async def get_suppliers(
     """Get all suppliers with pagination and search"""
     try:
         skip = (page - 1) * limit
-        logger.info(f"Fetching suppliers: page={page}, limit={limit}, search={search}")
+        logger.info("Fetching suppliers: page=%s, limit=%s, search=%s", page, limit, search)
         service = SupplierService(db)
         suppliers_list = service.get_all_suppliers(skip, limit, search or "")
         total_count = service.get_suppliers_count(search or "")
-        logger.info(f"Retrieved {len(suppliers_list)} suppliers")
+        logger.info("Retrieved %s suppliers", len(suppliers_list))
         return {
             "data": suppliers_list,
             "message": "Suppliers retrieved successfully",
@@ -64,10 +64,10 @@ async def get_suppliers(
             "total": total_count
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error fetching suppliers: {e.detail}")
+        logger.warning("HTTP error fetching suppliers: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error fetching suppliers: {str(e)}")
+        logger.error("Error fetching suppliers: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch suppliers"
@@ -81,16 +81,16 @@ async def get_supplier(
 ):
     """Get supplier by ID"""
     try:
-        logger.info(f"Fetching supplier {supplier_id}")
+        logger.info("Fetching supplier %s", supplier_id)
         service = SupplierService(db)
         supplier = service.get_supplier_by_id(supplier_id)
         if not supplier:
-            logger.warning(f"Supplier not found: {supplier_id}")
+            logger.warning("Supplier not found: %s", supplier_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Supplier {supplier_id} not found"
             )
-        logger.info(f"Supplier found: {supplier_id}")
+        logger.info("Supplier found: %s", supplier_id)
         return {
             "data": supplier,
             "message": "Supplier retrieved successfully",
@@ -99,7 +99,7 @@ async def get_supplier(
     except HTTPException as e:
         raise
     except Exception as e:
-        logger.error(f"Error fetching supplier: {str(e)}")
+        logger.error("Error fetching supplier: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch supplier"
@@ -114,20 +114,20 @@ async def update_supplier(
 ):
     """Update supplier"""
     try:
-        logger.info(f"Updating supplier {supplier_id}")
+        logger.info("Updating supplier %s", supplier_id)
         service = SupplierService(db)
         result = service.update_supplier(supplier_id, supplier_data)
-        logger.info(f"Supplier updated successfully: {supplier_id}")
+        logger.info("Supplier updated successfully: %s", supplier_id)
         return {
             "data": result,
             "message": "Supplier updated successfully",
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error updating supplier: {e.detail}")
+        logger.warning("HTTP error updating supplier: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error updating supplier: {str(e)}")
+        logger.error("Error updating supplier: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update supplier"
@@ -141,20 +141,20 @@ async def delete_supplier(
 ):
     """Delete supplier"""
     try:
-        logger.info(f"Deleting supplier {supplier_id}")
+        logger.info("Deleting supplier %s", supplier_id)
         service = SupplierService(db)
         service.delete_supplier(supplier_id)
-        logger.info(f"Supplier deleted successfully: {supplier_id}")
+        logger.info("Supplier deleted successfully: %s", supplier_id)
         return {
             "data": None,
             "message": "Supplier deleted successfully",
             "status_code": 200
         }
     except HTTPException as e:
-        logger.warning(f"HTTP error deleting supplier: {e.detail}")
+        logger.warning("HTTP error deleting supplier: %s", e.detail)
         raise
     except Exception as e:
-        logger.error(f"Error deleting supplier: {str(e)}")
+        logger.error("Error deleting supplier: %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete supplier"
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class InventoryBase(BaseModel):
@@ -11,6 +11,7 @@ class InventoryBase(BaseModel):
 
 class InventoryResponse(InventoryBase):
     id: int
+    is_low_stock: bool = False
     last_count_date: Optional[datetime] = None
     updated_at: datetime
     
@@ -40,10 +41,68 @@ class InventoryTransactionCreate(BaseModel):
             raise ValueError("Transaction type must be one of: in, out, adjustment")
         return normalized
 
+class InventoryTransactionBatchCreate(BaseModel):
+    transactions: List[InventoryTransactionCreate] = Field(..., min_length=1, max_length=5000)
+    atomic: bool = Field(default=True, description="All-or-nothing when true; apply valid rows and report failures when false")
+
+class InventoryTransactionBatchItemResult(BaseModel):
+    index: int
+    product_id: int
+    success: bool
+    quantity_on_hand: Optional[int] = None
+    error: Optional[str] = None
+
+class InventoryTransactionBatchResult(BaseModel):
+    applied: int
+    failed: int
+    results: List[InventoryTransactionBatchItemResult]
+
+class StockReservationCreate(BaseModel):
+    product_id: int = Field(..., gt=0)
+    quantity: int = Field(..., gt=0)
+    ttl_seconds: Optional[int] = Field(None, gt=0, le=86400, description="Hold duration; defaults to RESERVATION_TTL_SECONDS")
+    sale_id: Optional[int] = Field(None, gt=0)
+
+class StockReservationResponse(BaseModel):
+    id: int
+    inventory_id: int
+    product_id: int
+    sale_id: Optional[int] = None
+    quantity: int
+    status: str  # HELD, COMMITTED, RELEASED, EXPIRED
+    expires_at: datetime
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class StockLevelAt(BaseModel):
+    product_id: int
+    at: datetime
+    quantity_on_hand: int
+
+class StockMovementReport(BaseModel):
+    product_id: int
+    start: datetime
+    end: datetime
+    opening_quantity: int
+    closing_quantity: int
+    total_in: int
+    total_out: int
+    adjustments: int
+    transaction_count: int
+
 class InventoryTransactionResponse(InventoryTransactionCreate):
     id: int
     inventory_id: int
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class LowStockAlert(BaseModel):
+    inventory_id: int
+    product_id: int
+    quantity_on_hand: int
+    reorder_level: int
+    is_low_stock: bool  # True when entering low stock, False when restocked above reorder level
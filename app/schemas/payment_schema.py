@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class PaymentBase(BaseModel):
@@ -48,3 +48,33 @@ class PaymentResponse(PaymentBase):
     class Config:
         from_attributes = True
         populate_by_name = True
+
+class PaymentImportRow(BaseModel):
+    """One settlement line from a card-terminal/bank export"""
+    invoice_number: Optional[str] = None
+    reference_number: Optional[str] = None
+    amount: float = Field(..., gt=0)
+    payment_method: str = "BANK_TRANSFER"
+    payment_date: Optional[datetime] = None
+    notes: Optional[str] = None
+    
+    @field_validator('payment_method')
+    @classmethod
+    def validate_payment_method(cls, v: str) -> str:
+        return PaymentBase.validate_payment_method(v)
+
+class PaymentImportMismatch(BaseModel):
+    row: int
+    invoice_number: Optional[str] = None
+    reference_number: Optional[str] = None
+    amount: Optional[float] = None
+    reason: str  # invalid_row, duplicate, amount_mismatch, sale_not_found, sale_cancelled, exceeds_balance
+    detail: Optional[str] = None
+
+class PaymentImportSummary(BaseModel):
+    rows: int = 0
+    imported: int = 0
+    imported_amount: float = 0
+    mismatched: int = 0
+    mismatches: List[PaymentImportMismatch] = []
+    mismatches_truncated: bool = False
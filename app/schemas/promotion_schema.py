@@ -15,9 +15,17 @@ class PromotionBase(BaseModel):
 
 class PromotionCreate(PromotionBase):
     product_ids: Optional[List[int]] = None
+    categories: Optional[List[str]] = Field(None, description="Also target every product in these categories")
 
 class PromotionUpdate(PromotionBase):
     product_ids: Optional[List[int]] = None
+    categories: Optional[List[str]] = Field(None, description="Also target every product in these categories")
+
+class PromotionProductsUpdate(BaseModel):
+    add_product_ids: Optional[List[int]] = None
+    add_categories: Optional[List[str]] = None
+    remove_product_ids: Optional[List[int]] = None
+    remove_categories: Optional[List[str]] = None
 
 class PromotionResponse(PromotionBase):
     id: int
@@ -26,4 +34,13 @@ class PromotionResponse(PromotionBase):
     
     class Config:
         from_attributes = True
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+class PriceQuote(BaseModel):
+    product_id: int
+    unit_price: float
+    quantity: int
+    subtotal: float
+    discount: float
+    total: float
+    promotion_id: Optional[int] = None
@@ -26,6 +26,12 @@ class InventoryReportItem(BaseModel):
     reorder_level: int
     status: str  # OK, LOW, CRITICAL
 
+class InventoryStatusCounts(BaseModel):
+    critical: int
+    low: int
+    ok: int
+    total: int
+
 class DashboardSummary(BaseModel):
     total_sales: float
     total_revenue: float
@@ -26,7 +26,10 @@ class SaleBase(BaseModel):
     notes: Optional[str] = None
 
 class SaleCreate(SaleBase):
+    # A sale is created either paid out of stock or pending on held stock; cancel it via update
+    status: str = Field(default="completed", pattern="^(completed|pending)$")
     items: List[SaleItemCreate]
+    apply_promotions: bool = Field(default=False, description="Replace item discounts with the best active promotion")
 
 class SaleUpdate(BaseModel):
      status: str = Field(..., pattern="^(completed|pending|canceled)$")
@@ -44,6 +47,8 @@ class SaleResponse(BaseModel):
     discount: float
     tax: float
     final_amount: float
+    amount_paid: float = 0
+    balance_due: float = 0
     status: str
     notes: Optional[str] = None
     items: List[SaleItemResponse]
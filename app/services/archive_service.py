@@ -0,0 +1,112 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, update, func, or_
+from app.core.config import settings
+from app.database.models import (
+    Sale, SaleItem, Payment, InventoryTransaction, InventorySnapshot, StockReservation,
+    SaleArchive, SaleItemArchive, PaymentArchive, InventoryTransactionArchive
+)
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED_SALE_STATUSES = ["completed", "canceled", "cancelled"]
+CANCELED_SALE_STATUSES = ["canceled", "cancelled"]
+
+def _copy_rows(db: Session, source, target, where) -> None:
+    """INSERT INTO target SELECT <shared columns> FROM source WHERE ..."""
+    columns = [c.name for c in target.__table__.columns if c.name in source.__table__.columns]
+    db.execute(
+        insert(target.__table__).from_select(
+            columns,
+            select(*[source.__table__.c[name] for name in columns]).where(where)
+        )
+    )
+
+class ArchiveService:
+    """Move closed records older than the horizon out of the hot tables, batch by batch"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def archive_sales(self, cutoff: datetime, batch_size: int) -> int:
+        """Archive closed sales (with their items and payments) dated before cutoff.
+        Completed sales with a balance due stay live so /api/sales/outstanding still lists them."""
+        total = 0
+        while True:
+            sale_ids = [r[0] for r in self.db.query(Sale.id).filter(
+                Sale.sale_date < cutoff,
+                Sale.status.in_(CLOSED_SALE_STATUSES),
+                or_(Sale.status.in_(CANCELED_SALE_STATUSES), Sale.amount_paid >= Sale.final_amount)
+            ).order_by(Sale.id).limit(batch_size).all()]
+            if not sale_ids:
+                break
+            
+            _copy_rows(self.db, Sale, SaleArchive, Sale.id.in_(sale_ids))
+            _copy_rows(self.db, SaleItem, SaleItemArchive, SaleItem.sale_id.in_(sale_ids))
+            _copy_rows(self.db, Payment, PaymentArchive, Payment.sale_id.in_(sale_ids))
+            
+            self.db.execute(
+                update(StockReservation).where(
+                    StockReservation.sale_id.in_(sale_ids)
+                ).values(sale_id=None).execution_options(synchronize_session=False)
+            )
+            self.db.execute(delete(Payment).where(Payment.sale_id.in_(sale_ids)).execution_options(synchronize_session=False))
+            self.db.execute(delete(SaleItem).where(SaleItem.sale_id.in_(sale_ids)).execution_options(synchronize_session=False))
+            self.db.execute(delete(Sale).where(Sale.id.in_(sale_ids)).execution_options(synchronize_session=False))
+            self.db.commit()
+            
+            total += len(sale_ids)
+            if len(sale_ids) < batch_size:
+                break
+        return total
+    
+    def archive_inventory_transactions(self, cutoff: datetime, batch_size: int) -> int:
+        """Archive ledger rows before cutoff that are already covered by a snapshot,
+        so point-in-time queries from that snapshot onwards never need them"""
+        covered_up_to = select(
+            func.max(InventorySnapshot.last_transaction_id)
+        ).where(
+            InventorySnapshot.inventory_id == InventoryTransaction.inventory_id
+        ).correlate(InventoryTransaction).scalar_subquery()
+        
+        total = 0
+        while True:
+            transaction_ids = [r[0] for r in self.db.query(InventoryTransaction.id).filter(
+                InventoryTransaction.created_at < cutoff,
+                InventoryTransaction.id <= covered_up_to
+            ).order_by(InventoryTransaction.id).limit(batch_size).all()]
+            if not transaction_ids:
+                break
+            
+            _copy_rows(
+                self.db, InventoryTransaction, InventoryTransactionArchive,
+                InventoryTransaction.id.in_(transaction_ids)
+            )
+            self.db.execute(
+                delete(InventoryTransaction).where(
+                    InventoryTransaction.id.in_(transaction_ids)
+                ).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            
+            total += len(transaction_ids)
+            if len(transaction_ids) < batch_size:
+                break
+        return total
+    
+    def run(self, horizon_days: Optional[int] = None, batch_size: Optional[int] = None) -> dict:
+        """Run the full archival pipeline"""
+        horizon_days = horizon_days or settings.ARCHIVE_HORIZON_DAYS
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        cutoff = datetime.now() - timedelta(days=horizon_days)
+        
+        sales = self.archive_sales(cutoff, batch_size)
+        transactions = self.archive_inventory_transactions(cutoff, batch_size)
+        logger.info("Archived %s sales and %s inventory transactions older than %s", sales, transactions, cutoff)
+        return {
+            "cutoff": cutoff.isoformat(),
+            "sales_archived": sales,
+            "inventory_transactions_archived": transactions
+        }
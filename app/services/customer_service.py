@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
-from app.database.models import Customer
+from sqlalchemy import func
+from app.database.models import Customer, Sale
 from app.schemas.customer_schema import CustomerCreate, CustomerUpdate
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 class CustomerService:
     def __init__(self, db: Session):
@@ -39,6 +40,22 @@ class CustomerService:
         """Get all customers with pagination"""
         return self.db.query(Customer).offset(skip).limit(limit).all()
     
+    def get_sales_stats(self, customer_ids: Iterable[int]) -> Dict[int, Tuple[int, float]]:
+        """(total orders, total spent) of non-cancelled sales per customer, in one grouped query.
+        Customers without sales are absent."""
+        customer_ids = list(customer_ids)
+        if not customer_ids:
+            return {}
+        rows = self.db.query(
+            Sale.customer_id,
+            func.count(Sale.id),
+            func.coalesce(func.sum(Sale.final_amount), 0)
+        ).filter(
+            Sale.customer_id.in_(customer_ids),
+            Sale.status != 'cancelled'
+        ).group_by(Sale.customer_id)
+        return {customer_id: (total_orders, float(total_spent)) for customer_id, total_orders, total_spent in rows}
+    
     def get_customers_count(self) -> int:
         """Get total count of all customers"""
         return self.db.query(Customer).count()
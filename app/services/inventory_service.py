@@ -1,15 +1,53 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from sqlalchemy import insert, update, event, func
 from app.database.models import Inventory, InventoryTransaction, Product
-from app.schemas.inventory_schema import InventoryTransactionCreate
+from app.schemas.inventory_schema import (
+    InventoryTransactionCreate, InventoryTransactionBatchItemResult, InventoryTransactionBatchResult
+)
+from app.services.stock_alert_service import StockAlertService
+from app.core.metrics import record_cache
 from fastapi import HTTPException, status
-from typing import List
+from typing import Dict, Iterable, List, Optional
+
+INVENTORY_CACHE_KEY = "inventory_by_product"
+
+@event.listens_for(Session, "after_rollback")
+def _clear_inventory_cache(session):
+    session.info.pop(INVENTORY_CACHE_KEY, None)
 
 class InventoryService:
+    @staticmethod
+    def _inventory_cache(db: Session) -> Dict[int, Optional[Inventory]]:
+        """Per-session (i.e. per-request) product_id -> Inventory map"""
+        return db.info.setdefault(INVENTORY_CACHE_KEY, {})
+    
+    @staticmethod
+    def find_inventory_by_product(db: Session, product_id: int) -> Optional[Inventory]:
+        """Inventory for a product, queried at most once per request"""
+        cache = InventoryService._inventory_cache(db)
+        record_cache("inventory_by_product", product_id in cache)
+        if product_id not in cache:
+            cache[product_id] = db.query(Inventory).filter(
+                Inventory.product_id == product_id
+            ).first()
+        return cache[product_id]
+    
+    @staticmethod
+    def prefetch_inventories(db: Session, product_ids: Iterable[int]) -> Dict[int, Optional[Inventory]]:
+        """Load inventories for many products in one IN query and cache them for the request"""
+        cache = InventoryService._inventory_cache(db)
+        product_ids = list(product_ids)
+        missing = {pid for pid in product_ids if pid not in cache}
+        if missing:
+            for inventory in db.query(Inventory).filter(Inventory.product_id.in_(missing)):
+                cache[inventory.product_id] = inventory
+            for pid in missing:
+                cache.setdefault(pid, None)
+        return {pid: cache[pid] for pid in product_ids}
+    
     @staticmethod
     def get_inventory_by_product(db: Session, product_id: int) -> Inventory:
-        inventory = db.query(Inventory).filter(
-            Inventory.product_id == product_id
-        ).first()
+        inventory = InventoryService.find_inventory_by_product(db, product_id)
         if not inventory:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -22,22 +60,16 @@ class InventoryService:
         db: Session,
         transaction_data: InventoryTransactionCreate
     ) -> Inventory:
-        inventory = InventoryService.get_inventory_by_product(
-            db, transaction_data.product_id
-        )
-        
-        # Update quantity
-        if transaction_data.transaction_type == "IN":
-            inventory.quantity_on_hand += transaction_data.quantity
-        elif transaction_data.transaction_type == "OUT":
-            if inventory.quantity_on_hand < transaction_data.quantity:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Insufficient stock"
-                )
-            inventory.quantity_on_hand -= transaction_data.quantity
-        elif transaction_data.transaction_type == "ADJUSTMENT":
+        if transaction_data.transaction_type == "ADJUSTMENT":
+            inventory = InventoryService.get_inventory_by_product(
+                db, transaction_data.product_id
+            )
             inventory.quantity_on_hand = transaction_data.quantity
+        else:
+            inventory = InventoryService.apply_stock_delta(
+                db, transaction_data.product_id, transaction_data.quantity,
+                transaction_data.transaction_type == "OUT", respect_reserved=True
+            )
         
         # Record transaction
         transaction = InventoryTransaction(
@@ -54,27 +86,201 @@ class InventoryService:
         db.refresh(inventory)
         return inventory
     
+    @staticmethod
+    def record_transaction(
+        db: Session,
+        inventory_id: int,
+        transaction_type: str,
+        quantity: int,
+        reason: str,
+        reference_number: Optional[str] = None
+    ) -> InventoryTransaction:
+        """Append a ledger row for stock moved outside add_transaction (sales, reservations)"""
+        transaction = InventoryTransaction(
+            inventory_id=inventory_id,
+            transaction_type=transaction_type,
+            quantity=quantity,
+            reason=reason,
+            reference_number=reference_number
+        )
+        db.add(transaction)
+        return transaction
+    
+    @staticmethod
+    def apply_stock_delta(
+        db: Session,
+        product_id: int,
+        quantity: int,
+        outgoing: bool,
+        respect_reserved: bool = False
+    ) -> Inventory:
+        """Add or remove stock with a single conditional UPDATE (no read-modify-write).
+        With respect_reserved, outgoing stock may only come from on_hand - reserved."""
+        if outgoing:
+            new_quantity = Inventory.quantity_on_hand - quantity
+            available = Inventory.quantity_on_hand
+            if respect_reserved:
+                available = Inventory.quantity_on_hand - Inventory.quantity_reserved
+            stmt = update(Inventory).where(
+                Inventory.product_id == product_id,
+                available >= quantity
+            )
+        else:
+            new_quantity = Inventory.quantity_on_hand + quantity
+            stmt = update(Inventory).where(Inventory.product_id == product_id)
+        
+        # is_low_stock is assigned first: MySQL evaluates SET left to right. A NULL
+        # reorder_level means the default of 10, as in _sync_low_stock_flag
+        result = db.execute(
+            stmt.ordered_values(
+                (Inventory.is_low_stock, new_quantity <= func.coalesce(Inventory.reorder_level, 10)),
+                (Inventory.quantity_on_hand, new_quantity)
+            ).execution_options(synchronize_session=False)
+        )
+        
+        if result.rowcount == 0:
+            db.rollback()
+            InventoryService.get_inventory_by_product(db, product_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Insufficient stock"
+            )
+        
+        # Row is locked by our UPDATE until commit, so this read sees our own write
+        inventory = db.query(Inventory).filter(
+            Inventory.product_id == product_id
+        ).populate_existing().first()
+        InventoryService._inventory_cache(db)[product_id] = inventory
+        
+        previous_quantity = inventory.quantity_on_hand + (quantity if outgoing else -quantity)
+        reorder_level = inventory.reorder_level if inventory.reorder_level is not None else 10
+        was_low_stock = previous_quantity <= reorder_level
+        if was_low_stock != inventory.is_low_stock:
+            StockAlertService.queue_alert(db, {
+                "inventory_id": inventory.id,
+                "product_id": product_id,
+                "quantity_on_hand": inventory.quantity_on_hand,
+                "reorder_level": reorder_level,
+                "is_low_stock": inventory.is_low_stock
+            })
+        return inventory
+    
+    @staticmethod
+    def add_transactions_batch(
+        db: Session,
+        transactions: List[InventoryTransactionCreate],
+        atomic: bool = True
+    ) -> InventoryTransactionBatchResult:
+        """Apply many IN/OUT/ADJUSTMENT transactions in one DB transaction"""
+        # Validate and lock every touched inventory row in one query
+        product_ids = {t.product_id for t in transactions}
+        inventories = {
+            inv.product_id: inv
+            for inv in db.query(Inventory).filter(
+                Inventory.product_id.in_(product_ids)
+            ).with_for_update().all()
+        }
+        
+        # Replay the batch in order against running quantities
+        quantities = {pid: inv.quantity_on_hand or 0 for pid, inv in inventories.items()}
+        results = []
+        rows = []
+        for index, t in enumerate(transactions):
+            inventory = inventories.get(t.product_id)
+            error = None
+            if not inventory:
+                error = "Inventory not found"
+            elif t.transaction_type == "IN":
+                quantities[t.product_id] += t.quantity
+            elif t.transaction_type == "OUT":
+                if quantities[t.product_id] - (inventory.quantity_reserved or 0) < t.quantity:
+                    error = "Insufficient stock"
+                else:
+                    quantities[t.product_id] -= t.quantity
+            elif t.transaction_type == "ADJUSTMENT":
+                quantities[t.product_id] = t.quantity
+            
+            results.append(InventoryTransactionBatchItemResult(
+                index=index,
+                product_id=t.product_id,
+                success=error is None,
+                quantity_on_hand=quantities.get(t.product_id),
+                error=error
+            ))
+            if error is None:
+                rows.append({
+                    "inventory_id": inventory.id,
+                    "transaction_type": t.transaction_type,
+                    "quantity": t.quantity,
+                    "reason": t.reason,
+                    "reference_number": t.reference_number,
+                    "notes": t.notes
+                })
+        
+        failed = [r for r in results if not r.success]
+        if atomic and failed:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "message": f"{len(failed)} of {len(transactions)} transactions are invalid; nothing was applied",
+                    "errors": [r.model_dump() for r in failed]
+                }
+            )
+        
+        # Write only the rows whose quantity actually changed, as executemany
+        changes = []
+        for product_id, inventory in inventories.items():
+            quantity = quantities[product_id]
+            if quantity == inventory.quantity_on_hand:
+                continue
+            reorder_level = inventory.reorder_level if inventory.reorder_level is not None else 10
+            is_low_stock = quantity <= reorder_level
+            changes.append({"id": inventory.id, "quantity_on_hand": quantity, "is_low_stock": is_low_stock})
+            if is_low_stock != inventory.is_low_stock:
+                StockAlertService.queue_alert(db, {
+                    "inventory_id": inventory.id,
+                    "product_id": product_id,
+                    "quantity_on_hand": quantity,
+                    "reorder_level": reorder_level,
+                    "is_low_stock": is_low_stock
+                })
+        
+        if changes:
+            db.execute(update(Inventory), changes)
+        if rows:
+            db.execute(insert(InventoryTransaction), rows)
+        db.commit()
+        
+        return InventoryTransactionBatchResult(
+            applied=len(rows),
+            failed=len(failed),
+            results=results
+        )
+    
     @staticmethod
     def get_low_stock_products(db: Session) -> List[Inventory]:
         return db.query(Inventory).filter(
-            Inventory.quantity_on_hand <= Inventory.reorder_level
+            Inventory.is_low_stock == True
         ).all()
     
     @staticmethod
     def get_inventory_list(db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
         """Get inventory list with product information"""
-        inventories = db.query(Inventory).join(Product).offset(skip).limit(limit).all()
+        inventories = db.query(Inventory).join(Product).options(
+            contains_eager(Inventory.product)
+        ).offset(skip).limit(limit).all()
         
         result = []
         for inv in inventories:
-            product = db.query(Product).filter(Product.id == inv.product_id).first()
+            product = inv.product
             result.append({
                 'id': str(inv.id),
                 'product_id': str(inv.product_id),
                 'product_name': product.name if product else f'Sản phẩm {inv.product_id}',
                 'quantity': inv.quantity_on_hand,
                 'reorder_level': inv.reorder_level,
-                'last_updated': inv.last_updated.isoformat() if inv.last_updated else None
+                'last_updated': inv.updated_at.isoformat() if inv.updated_at else None
             })
         
         return result
@@ -85,6 +291,8 @@ class InventoryService:
         """Get inventory transactions with product information"""
         query = db.query(InventoryTransaction).join(
             Inventory, InventoryTransaction.inventory_id == Inventory.id
+        ).options(
+            contains_eager(InventoryTransaction.inventory).selectinload(Inventory.product)
         )
         
         if product_id:
@@ -97,8 +305,8 @@ class InventoryService:
         
         result = []
         for trans in transactions:
-            inventory = db.query(Inventory).filter(Inventory.id == trans.inventory_id).first()
-            product = db.query(Product).filter(Product.id == inventory.product_id).first() if inventory else None
+            inventory = trans.inventory
+            product = inventory.product if inventory else None
             
             result.append({
                 'id': str(trans.id),
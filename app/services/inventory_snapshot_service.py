@@ -0,0 +1,178 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from app.database.models import Inventory, InventoryTransaction, InventorySnapshot
+from app.schemas.inventory_schema import StockLevelAt, StockMovementReport
+from app.services.inventory_service import InventoryService
+from datetime import datetime
+from typing import Optional, Tuple
+
+def apply_ledger_entry(quantity: int, transaction_type: str, amount: int) -> int:
+    """Stock after one ledger row: IN adds, OUT removes, ADJUSTMENT sets"""
+    if transaction_type == "IN":
+        return quantity + amount
+    if transaction_type == "OUT":
+        return quantity - amount
+    if transaction_type == "ADJUSTMENT":
+        return amount
+    return quantity
+
+class InventorySnapshotService:
+    """Point-in-time stock from periodic snapshots plus the ledger delta since"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _nearest_snapshot(self, inventory_id: int, at: datetime) -> Optional[InventorySnapshot]:
+        return self.db.query(InventorySnapshot).filter(
+            InventorySnapshot.inventory_id == inventory_id,
+            InventorySnapshot.snapshot_at <= at
+        ).order_by(InventorySnapshot.snapshot_at.desc()).first()
+    
+    def _replay_to(self, inventory_id: int, at: datetime) -> Tuple[int, int]:
+        """Stock at `at`, replaying only rows after the nearest snapshot, and that snapshot's
+        last_transaction_id (every ledger row created after `at` has a higher id)"""
+        snapshot = self._nearest_snapshot(inventory_id, at)
+        quantity = snapshot.quantity_on_hand if snapshot else 0
+        last_transaction_id = snapshot.last_transaction_id if snapshot else 0
+        
+        rows = self.db.query(
+            InventoryTransaction.transaction_type, InventoryTransaction.quantity
+        ).filter(
+            InventoryTransaction.inventory_id == inventory_id,
+            InventoryTransaction.id > last_transaction_id,
+            InventoryTransaction.created_at <= at
+        ).order_by(InventoryTransaction.id)
+        
+        for transaction_type, amount in rows:
+            quantity = apply_ledger_entry(quantity, transaction_type, amount)
+        return quantity, last_transaction_id
+    
+    def get_stock_at(self, product_id: int, at: datetime) -> StockLevelAt:
+        """Get stock on hand for a product as of a point in time"""
+        inventory = InventoryService.get_inventory_by_product(self.db, product_id)
+        quantity, _ = self._replay_to(inventory.id, at)
+        return StockLevelAt(product_id=product_id, at=at, quantity_on_hand=quantity)
+    
+    def get_movement_report(self, product_id: int, start: datetime, end: datetime) -> StockMovementReport:
+        """Get opening/closing stock and IN/OUT/ADJUSTMENT totals between two points in time"""
+        inventory = InventoryService.get_inventory_by_product(self.db, product_id)
+        opening, last_transaction_id = self._replay_to(inventory.id, start)
+        
+        rows = self.db.query(
+            InventoryTransaction.transaction_type, InventoryTransaction.quantity
+        ).filter(
+            InventoryTransaction.inventory_id == inventory.id,
+            InventoryTransaction.id > last_transaction_id,
+            InventoryTransaction.created_at > start,
+            InventoryTransaction.created_at <= end
+        ).order_by(InventoryTransaction.id)
+        
+        totals = {"IN": 0, "OUT": 0, "ADJUSTMENT": 0}
+        count = 0
+        closing = opening
+        for transaction_type, amount in rows:
+            closing = apply_ledger_entry(closing, transaction_type, amount)
+            totals[transaction_type] = totals.get(transaction_type, 0) + amount
+            count += 1
+        
+        return StockMovementReport(
+            product_id=product_id,
+            start=start,
+            end=end,
+            opening_quantity=opening,
+            closing_quantity=closing,
+            total_in=totals["IN"],
+            total_out=totals["OUT"],
+            adjustments=totals["ADJUSTMENT"],
+            transaction_count=count
+        )
+    
+    def _ledger_cutoff(self, as_of: datetime) -> int:
+        """Last ledger id a snapshot at `as_of` covers. Snapshots cover an id prefix (everything up to
+        last_transaction_id), so the prefix stops before the first row created after `as_of`: a row
+        committed late with a lower id is never hidden behind a snapshot's last_transaction_id."""
+        first_after = self.db.query(func.min(InventoryTransaction.id)).filter(
+            InventoryTransaction.created_at > as_of
+        ).scalar()
+        if first_after is not None:
+            return first_after - 1
+        return self.db.query(func.max(InventoryTransaction.id)).scalar() or 0
+    
+    def compact(self, as_of: Optional[datetime] = None, batch_size: int = 500) -> int:
+        """Write a snapshot as of `as_of` (default: the database's now) for every inventory whose ledger
+        moved since its last snapshot. Works through inventories in id-ordered batches, one commit per
+        batch; returns snapshots created."""
+        if as_of is None:
+            # Same clock as the ledger's created_at (a server default), not the app's
+            as_of = self.db.query(func.now()).scalar()
+        cutoff_id = self._ledger_cutoff(as_of)
+        created = 0
+        last_inventory_id = 0
+        
+        while True:
+            inventories = self.db.query(Inventory.id, Inventory.product_id).filter(
+                Inventory.id > last_inventory_id
+            ).order_by(Inventory.id).limit(batch_size).all()
+            if not inventories:
+                break
+            last_inventory_id = inventories[-1][0]
+            inventory_ids = [i[0] for i in inventories]
+            
+            # Latest snapshot at or before as_of for each inventory in the batch
+            latest_at = self.db.query(
+                InventorySnapshot.inventory_id,
+                func.max(InventorySnapshot.snapshot_at).label("snapshot_at")
+            ).filter(
+                InventorySnapshot.inventory_id.in_(inventory_ids),
+                InventorySnapshot.snapshot_at <= as_of
+            ).group_by(InventorySnapshot.inventory_id).subquery()
+            latest = self.db.query(
+                InventorySnapshot.inventory_id,
+                InventorySnapshot.quantity_on_hand,
+                InventorySnapshot.last_transaction_id
+            ).join(
+                latest_at,
+                (InventorySnapshot.inventory_id == latest_at.c.inventory_id) &
+                (InventorySnapshot.snapshot_at == latest_at.c.snapshot_at)
+            ).subquery()
+            
+            # Ledger rows after each inventory's own snapshot, streamed in one query
+            rows = self.db.query(
+                InventoryTransaction.inventory_id,
+                InventoryTransaction.id,
+                InventoryTransaction.transaction_type,
+                InventoryTransaction.quantity,
+                func.coalesce(latest.c.quantity_on_hand, 0)
+            ).outerjoin(
+                latest, latest.c.inventory_id == InventoryTransaction.inventory_id
+            ).filter(
+                InventoryTransaction.inventory_id.in_(inventory_ids),
+                InventoryTransaction.id > func.coalesce(latest.c.last_transaction_id, 0),
+                InventoryTransaction.id <= cutoff_id
+            ).order_by(
+                InventoryTransaction.inventory_id, InventoryTransaction.id
+            ).execution_options(yield_per=1000)
+            
+            state = {}
+            for inventory_id, transaction_id, transaction_type, amount, base_quantity in rows:
+                if inventory_id not in state:
+                    state[inventory_id] = [base_quantity, 0]
+                state[inventory_id][0] = apply_ledger_entry(state[inventory_id][0], transaction_type, amount)
+                state[inventory_id][1] = transaction_id
+            
+            if state:
+                product_ids = dict(inventories)
+                self.db.execute(insert(InventorySnapshot), [
+                    {
+                        "inventory_id": inventory_id,
+                        "product_id": product_ids[inventory_id],
+                        "quantity_on_hand": quantity,
+                        "last_transaction_id": transaction_id,
+                        "snapshot_at": as_of
+                    }
+                    for inventory_id, (quantity, transaction_id) in state.items()
+                ])
+                created += len(state)
+            self.db.commit()
+        
+        return created
@@ -0,0 +1,178 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, update
+from pydantic import ValidationError
+from app.core.money import to_money
+from app.database.models import Payment, Sale
+from app.schemas.payment_schema import PaymentImportRow, PaymentImportMismatch, PaymentImportSummary
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+import csv
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+CANCELLED_SALE_STATUSES = ["canceled", "cancelled"]
+
+def iter_settlements(stream: IO[str], format: str = "csv") -> Iterator[Tuple[int, dict]]:
+    """Yield (row number, raw fields) from a CSV (with header) or NDJSON text stream, one line at a time"""
+    if format == "ndjson":
+        row = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                fields = json.loads(line)
+            except ValueError as e:
+                fields = {"_error": f"Invalid JSON: {e}"}
+            yield row, fields if isinstance(fields, dict) else {"_error": "Expected a JSON object"}
+    else:
+        for row, fields in enumerate(csv.DictReader(stream), start=1):
+            yield row, {k.strip(): (v.strip() or None) if isinstance(v, str) else v for k, v in fields.items() if k}
+
+def _as_text(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+class PaymentImportService:
+    """Bulk settlement import: match rows to sales in chunks, insert payments with executemany.
+    
+    Each chunk is one transaction: one IN lookup for existing references, one
+    locked IN lookup for the referenced sales, one executemany INSERT and one
+    bulk UPDATE of Sale.amount_paid. Only a chunk of rows is held at a time.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def import_chunk(self, rows: List[Tuple[int, dict]]) -> Tuple[int, Decimal, List[PaymentImportMismatch]]:
+        """Import one chunk; returns (payments imported, amount imported, mismatches)"""
+        mismatches = []
+        parsed = []
+        for row, fields in rows:
+            try:
+                if "_error" in fields:
+                    raise ValueError(fields["_error"])
+                parsed.append((row, PaymentImportRow(**fields)))
+            except ValidationError as e:
+                error = e.errors()[0]
+                mismatches.append(PaymentImportMismatch(
+                    row=row,
+                    invoice_number=_as_text(fields.get("invoice_number")),
+                    reference_number=_as_text(fields.get("reference_number")),
+                    reason="invalid_row",
+                    detail=f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                ))
+            except ValueError as e:
+                mismatches.append(PaymentImportMismatch(row=row, reason="invalid_row", detail=str(e)))
+        
+        references = {r.reference_number for _, r in parsed if r.reference_number}
+        recorded = dict(self.db.query(Payment.reference_number, Payment.amount).filter(
+            Payment.reference_number.in_(references)
+        ).all()) if references else {}
+        
+        invoices = {r.invoice_number for _, r in parsed if r.invoice_number}
+        sales = {s.invoice_number: s for s in self.db.query(
+            Sale.id, Sale.invoice_number, Sale.status, Sale.final_amount, Sale.amount_paid
+        ).filter(Sale.invoice_number.in_(invoices)).with_for_update().all()} if invoices else {}
+        
+        remaining = {s.id: s.final_amount - s.amount_paid for s in sales.values()}
+        paid = defaultdict(lambda: to_money(0))
+        payments = []
+        
+        def mismatch(row: int, item: PaymentImportRow, reason: str, detail: Optional[str] = None):
+            mismatches.append(PaymentImportMismatch(
+                row=row,
+                invoice_number=item.invoice_number,
+                reference_number=item.reference_number,
+                amount=item.amount,
+                reason=reason,
+                detail=detail
+            ))
+        
+        for row, item in parsed:
+            amount = to_money(item.amount)
+            if item.reference_number in recorded:
+                if recorded[item.reference_number] == amount:
+                    mismatch(row, item, "duplicate", "Reference already recorded")
+                else:
+                    mismatch(row, item, "amount_mismatch", f"Recorded amount is {recorded[item.reference_number]}")
+                continue
+            sale = sales.get(item.invoice_number)
+            if not sale:
+                mismatch(row, item, "sale_not_found", "No sale with this invoice number" if item.invoice_number else "Missing invoice_number")
+                continue
+            if sale.status in CANCELLED_SALE_STATUSES:
+                mismatch(row, item, "sale_cancelled")
+                continue
+            if amount > remaining[sale.id]:
+                mismatch(row, item, "exceeds_balance", f"Remaining: {remaining[sale.id]}")
+                continue
+            
+            remaining[sale.id] -= amount
+            paid[sale.id] += amount
+            if item.reference_number:
+                recorded[item.reference_number] = amount
+            payments.append({
+                "sale_id": sale.id,
+                "payment_method": item.payment_method,
+                "amount": amount,
+                "payment_date": item.payment_date or datetime.now(),
+                "status": "completed",
+                "reference_number": item.reference_number,
+                "notes": item.notes
+            })
+        
+        if payments:
+            self.db.execute(insert(Payment), payments)
+            self.db.execute(update(Sale), [
+                {"id": sale.id, "amount_paid": sale.amount_paid + paid[sale.id]}
+                for sale in sales.values() if sale.id in paid
+            ])
+        self.db.commit()
+        
+        mismatches.sort(key=lambda m: m.row)
+        return len(payments), sum(paid.values(), to_money(0)), mismatches
+    
+    def import_rows(
+        self,
+        rows: Iterable[Tuple[int, dict]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_report: Optional[int] = None,
+        on_mismatch=None
+    ) -> PaymentImportSummary:
+        """Import settlements chunk by chunk. Mismatches go to on_mismatch when given,
+        otherwise the first max_report of them are kept on the summary."""
+        summary = PaymentImportSummary()
+        imported_amount = to_money(0)
+        chunk = []
+        
+        def flush():
+            nonlocal imported_amount
+            imported, amount, mismatches = self.import_chunk(chunk)
+            summary.imported += imported
+            imported_amount += amount
+            summary.mismatched += len(mismatches)
+            for item in mismatches:
+                if on_mismatch:
+                    on_mismatch(item)
+                elif max_report is None or len(summary.mismatches) < max_report:
+                    summary.mismatches.append(item)
+                else:
+                    summary.mismatches_truncated = True
+            chunk.clear()
+        
+        for row in rows:
+            chunk.append(row)
+            summary.rows += 1
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+        
+        summary.imported_amount = float(imported_amount)
+        logger.info("Payment import: %s rows, %s imported, %s mismatched", summary.rows, summary.imported, summary.mismatched)
+        return summary
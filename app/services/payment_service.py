@@ -1,30 +1,50 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import update
 from app.database.models import Payment, Sale
 from app.schemas.payment_schema import PaymentCreate, PaymentUpdate
+from app.core.money import to_money
 from fastapi import HTTPException, status
+from decimal import Decimal
 from typing import List, Optional
 
+# Payments in these statuses do not count towards Sale.amount_paid
+UNCOUNTED_PAYMENT_STATUSES = ["failed"]
+
+def _counts_towards_balance(payment_status: Optional[str]) -> bool:
+    return (payment_status or "completed") not in UNCOUNTED_PAYMENT_STATUSES
+
 class PaymentService:
     def __init__(self, db: Session):
         self.db = db
     
-    def create_payment(self, payment_data: PaymentCreate) -> Payment:
-        """Create a new payment"""
-        # Validate sale exists
-        sale = self.db.query(Sale).filter(Sale.id == payment_data.sale_id).first()
-        if not sale:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Sale not found"
-            )
-        
-        # Validate amount doesn't exceed sale amount
-        total_paid = sum(p.amount for p in sale.payments)
-        if total_paid + payment_data.amount > sale.final_amount:
+    def _apply_to_sale(self, sale_id: int, delta: Decimal):
+        """Move Sale.amount_paid by delta in one conditional UPDATE.
+        Increases only succeed while amount_paid stays within final_amount, so two
+        concurrent payments can never both pass the balance check."""
+        new_amount_paid = Sale.amount_paid + delta
+        query = update(Sale).where(Sale.id == sale_id)
+        if delta > 0:
+            query = query.where(new_amount_paid <= Sale.final_amount)
+        result = self.db.execute(
+            query.values(amount_paid=new_amount_paid).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self.db.rollback()
+            sale = self.db.query(Sale.final_amount, Sale.amount_paid).filter(Sale.id == sale_id).first()
+            if not sale:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Sale not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Payment amount exceeds sale amount. Remaining: {sale.final_amount - total_paid}"
+                detail=f"Payment amount exceeds sale amount. Remaining: {sale.final_amount - sale.amount_paid}"
             )
+    
+    def create_payment(self, payment_data: PaymentCreate) -> Payment:
+        """Create a new payment"""
+        # Validate sale exists and amount doesn't exceed the outstanding balance
+        self._apply_to_sale(payment_data.sale_id, to_money(payment_data.amount))
         
         payment_dict = payment_data.dict() if hasattr(payment_data, 'dict') else payment_data.__dict__
         payment = Payment(**payment_dict)
@@ -53,7 +73,10 @@ class PaymentService:
         if payment_method:
             query = query.filter(Payment.payment_method == payment_method)
         
-        return query.offset(skip).limit(limit).all()
+        # The list renders each payment's sale and customer: load them per page, not per row
+        return query.options(
+            selectinload(Payment.sale).selectinload(Sale.customer)
+        ).offset(skip).limit(limit).all()
     
     def get_payments_count(self, search: Optional[str] = None, status: Optional[str] = None, payment_method: Optional[str] = None) -> int:
         """Get total count of payments with optional search and filters"""
@@ -91,6 +114,13 @@ class PaymentService:
             )
         
         update_dict = payment_data.dict(exclude_unset=True) if hasattr(payment_data, 'dict') else payment_data.__dict__
+        
+        # Moving into or out of a failed status changes what the sale has been paid
+        was_counted = _counts_towards_balance(payment.status)
+        is_counted = _counts_towards_balance(update_dict.get("status") or payment.status)
+        if was_counted != is_counted:
+            self._apply_to_sale(payment.sale_id, payment.amount if is_counted else -payment.amount)
+        
         for key, value in update_dict.items():
             if value is not None:
                 setattr(payment, key, value)
@@ -107,6 +137,8 @@ class PaymentService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Payment not found"
             )
+        if _counts_towards_balance(payment.status):
+            self._apply_to_sale(payment.sale_id, -payment.amount)
         self.db.delete(payment)
         self.db.commit()
         return {"message": "Payment deleted successfully"}
\ No newline at end of file
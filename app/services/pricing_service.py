@@ -0,0 +1,257 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.money import to_money
+from app.core.metrics import record_cache
+from app.database.models import Promotion, Product, promotion_product
+from app.schemas.promotion_schema import PriceQuote
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+import threading
+import time
+
+class PromotionRule(NamedTuple):
+    id: int
+    discount_type: str
+    discount_value: Decimal
+    min_purchase: Decimal
+    max_discount: Optional[Decimal]
+    start_date: date
+    end_date: date
+
+def _rule_from_promotion(promotion: Promotion) -> PromotionRule:
+    return PromotionRule(
+        id=promotion.id,
+        discount_type=promotion.discount_type,
+        # Percentages keep their own precision; only fixed amounts are currency
+        discount_value=Decimal(promotion.discount_value) if promotion.discount_type == "PERCENTAGE" else to_money(promotion.discount_value),
+        min_purchase=to_money(promotion.min_purchase),
+        max_discount=to_money(promotion.max_discount) if promotion.max_discount else None,
+        start_date=promotion.start_date,
+        end_date=promotion.end_date
+    )
+
+def promotion_discount(rule: PromotionRule, subtotal: Decimal) -> Decimal:
+    """Discount a promotion gives on a line subtotal (unit price x quantity)"""
+    if subtotal < rule.min_purchase:
+        return to_money(0)
+    if rule.discount_type == "PERCENTAGE":
+        discount = to_money(subtotal * rule.discount_value / 100)
+    else:
+        discount = rule.discount_value
+    if rule.max_discount is not None:
+        discount = min(discount, rule.max_discount)
+    return min(discount, subtotal)
+
+class PromotionIndex:
+    """In-memory index of active promotions for price lookups.
+    
+    `_segments` is an interval index over dates: `_boundaries[i]` is the first
+    day of segment i and `_segments[i]` the promotion ids live for that whole
+    segment, so "what is live on day T" is one bisect. `_by_product` maps a
+    product to its promotion ids. Writes through PromotionService update both
+    maps in place; segments are re-derived lazily from the rules on the next
+    lookup. A full reload every PROMOTION_INDEX_TTL_SECONDS picks up writes
+    made by other worker processes.
+    """
+    
+    def __init__(self, ttl_seconds: int = settings.PROMOTION_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._rules: Dict[int, PromotionRule] = {}
+        self._products: Dict[int, FrozenSet[int]] = {}
+        self._by_product: Dict[int, Set[int]] = defaultdict(set)
+        self._boundaries: List[date] = []
+        self._segments: List[FrozenSet[int]] = []
+        self._segments_dirty = True
+        self._loaded_at: Optional[float] = None
+    
+    def load(self, db: Session):
+        """(Re)build the index: active, unexpired promotions plus their product ids, in two queries"""
+        promotions = db.query(Promotion).filter(
+            Promotion.is_active == True,
+            Promotion.end_date >= date.today()
+        ).all()
+        self._fill(db, promotions)
+    
+    @classmethod
+    def for_past_day(cls, db: Session, day: date, product_ids: Iterable[int]) -> "PromotionIndex":
+        """Throwaway index of the promotions live on a past day for some products, read from the DB.
+        The shared index drops promotions once they end, so it cannot answer for past dates."""
+        product_ids = list(product_ids)
+        promotions = db.query(Promotion).join(
+            promotion_product, promotion_product.c.promotion_id == Promotion.id
+        ).filter(
+            Promotion.is_active == True,
+            Promotion.start_date <= day,
+            Promotion.end_date >= day,
+            promotion_product.c.product_id.in_(product_ids)
+        ).distinct().all()
+        index = cls()
+        index._fill(db, promotions, product_ids)
+        return index
+    
+    def _fill(self, db: Session, promotions: List[Promotion], product_ids: Optional[List[int]] = None):
+        """Replace the index contents with these promotions and their products (optionally only product_ids)"""
+        products = defaultdict(set)
+        if promotions:
+            rows = db.query(promotion_product.c.promotion_id, promotion_product.c.product_id).filter(
+                promotion_product.c.promotion_id.in_([p.id for p in promotions])
+            )
+            if product_ids is not None:
+                rows = rows.filter(promotion_product.c.product_id.in_(product_ids))
+            for promotion_id, product_id in rows:
+                products[promotion_id].add(product_id)
+        
+        with self._lock:
+            self._rules = {}
+            self._products = {}
+            self._by_product = defaultdict(set)
+            for promotion in promotions:
+                self._put(_rule_from_promotion(promotion), products[promotion.id])
+            self._segments_dirty = True
+            self._loaded_at = time.monotonic()
+    
+    def ensure_loaded(self, db: Session):
+        stale = self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+        record_cache("promotion_index", not stale)
+        if stale:
+            self.load(db)
+    
+    def invalidate(self):
+        """Force a full reload on the next lookup"""
+        self._loaded_at = None
+    
+    def _put(self, rule: PromotionRule, product_ids: Iterable[int]):
+        self._rules[rule.id] = rule
+        self._products[rule.id] = frozenset(product_ids)
+        for product_id in self._products[rule.id]:
+            self._by_product[product_id].add(rule.id)
+    
+    def _drop(self, promotion_id: int):
+        self._rules.pop(promotion_id, None)
+        for product_id in self._products.pop(promotion_id, ()):
+            ids = self._by_product.get(product_id)
+            if ids is not None:
+                ids.discard(promotion_id)
+                if not ids:
+                    del self._by_product[product_id]
+    
+    def upsert(self, promotion: Promotion, product_ids: Iterable[int]):
+        """Apply one promotion write to the index"""
+        with self._lock:
+            self._drop(promotion.id)
+            if promotion.is_active and promotion.end_date >= date.today():
+                self._put(_rule_from_promotion(promotion), product_ids)
+            self._segments_dirty = True
+    
+    def remove(self, promotion_id: int):
+        with self._lock:
+            self._drop(promotion_id)
+            self._segments_dirty = True
+    
+    def _rebuild_segments(self):
+        """Sweep start/end events into contiguous segments of constant active sets"""
+        events = defaultdict(lambda: ([], []))
+        for rule in self._rules.values():
+            events[rule.start_date][0].append(rule.id)
+            events[rule.end_date + timedelta(days=1)][1].append(rule.id)
+        
+        boundaries, segments, active = [], [], set()
+        for day in sorted(events):
+            starts, ends = events[day]
+            active.update(starts)
+            active.difference_update(ends)
+            boundaries.append(day)
+            segments.append(frozenset(active))
+        self._boundaries, self._segments = boundaries, segments
+        self._segments_dirty = False
+    
+    def active_on(self, day: date) -> FrozenSet[int]:
+        """Promotion ids live on a given day"""
+        with self._lock:
+            if self._segments_dirty:
+                self._rebuild_segments()
+            i = bisect_right(self._boundaries, day) - 1
+            return self._segments[i] if i >= 0 else frozenset()
+    
+    def next_boundary(self, day: date) -> Optional[date]:
+        """First day after `day` on which the set of live promotions changes"""
+        with self._lock:
+            if self._segments_dirty:
+                self._rebuild_segments()
+            i = bisect_right(self._boundaries, day)
+            return self._boundaries[i] if i < len(self._boundaries) else None
+    
+    def best_discount(
+        self,
+        product_id: int,
+        unit_price,
+        quantity: int = 1,
+        at: Optional[date] = None
+    ) -> Tuple[Decimal, Optional[int]]:
+        """Largest discount any live promotion gives this line, and which promotion gives it"""
+        day = at.date() if isinstance(at, datetime) else (at or date.today())
+        subtotal = to_money(unit_price) * quantity
+        best, best_id = to_money(0), None
+        with self._lock:
+            candidates = self._by_product.get(product_id)
+            if not candidates:
+                return best, best_id
+            
+            active = self.active_on(day)
+            for promotion_id in candidates:
+                if promotion_id not in active:
+                    continue
+                discount = promotion_discount(self._rules[promotion_id], subtotal)
+                if discount > best:
+                    best, best_id = discount, promotion_id
+        return best, best_id
+
+promotion_index = PromotionIndex()
+
+class PricingService:
+    """Effective prices from the promotion index"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+        promotion_index.ensure_loaded(db)
+    
+    def _index_for(self, at: Optional[datetime], product_ids: Iterable[int]) -> PromotionIndex:
+        """Shared index for today and later; promotions read from the DB for past dates"""
+        day = at.date() if isinstance(at, datetime) else at
+        if day is not None and day < date.today():
+            return PromotionIndex.for_past_day(self.db, day, product_ids)
+        return promotion_index
+    
+    def quote(
+        self,
+        product_id: int,
+        unit_price,
+        quantity: int = 1,
+        at: Optional[datetime] = None,
+        index: Optional[PromotionIndex] = None
+    ) -> PriceQuote:
+        subtotal = to_money(unit_price) * quantity
+        index = index or self._index_for(at, [product_id])
+        discount, promotion_id = index.best_discount(product_id, unit_price, quantity, at)
+        return PriceQuote(
+            product_id=product_id,
+            unit_price=to_money(unit_price),
+            quantity=quantity,
+            subtotal=subtotal,
+            discount=discount,
+            total=subtotal - discount,
+            promotion_id=promotion_id
+        )
+    
+    def get_best_prices(self, product_ids: List[int], quantity: int = 1, at: Optional[datetime] = None) -> List[PriceQuote]:
+        """Best price for each product at its list price, in one product query"""
+        prices = dict(self.db.query(Product.id, Product.price).filter(Product.id.in_(product_ids)).all())
+        index = self._index_for(at, prices)
+        return [
+            self.quote(product_id, prices[product_id], quantity, at, index)
+            for product_id in product_ids if product_id in prices
+        ]
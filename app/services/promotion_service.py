@@ -1,14 +1,130 @@
-from sqlalchemy.orm import Session
-from app.database.models import Promotion, Product
+from sqlalchemy.orm import Session, selectinload, load_only
+from sqlalchemy import delete, insert, func
+from app.database.models import Promotion, Product, promotion_product
 from app.schemas.promotion_schema import PromotionCreate, PromotionUpdate
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.services.pricing_service import promotion_index
 from fastapi import HTTPException, status
-from datetime import date
-from typing import List, Optional
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Set
+import threading
+import time
+
+# Keeps IN lists and executemany batches a manageable size on storewide promotions
+ASSOCIATION_BATCH_SIZE = 1000
+
+def _batches(items: List[int], size: int = ASSOCIATION_BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+class ActivePromotionsCache:
+    """The serialized active-promotions list, valid until the next promotion boundary
+    (earliest upcoming start_date or end_date + 1 day). Cleared on every promotion
+    write in this process; the TTL bounds staleness from writes in other workers."""
+    
+    def __init__(self, ttl_seconds: int = settings.PROMOTION_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._data: Optional[List[dict]] = None
+        self._day: Optional[date] = None
+        self._valid_until: Optional[date] = None
+        self._stored_at = 0.0
+    
+    def get(self, day: date) -> Optional[List[dict]]:
+        with self._lock:
+            if (
+                self._data is not None
+                and self._day <= day < self._valid_until
+                and time.monotonic() - self._stored_at <= self.ttl_seconds
+            ):
+                record_cache("active_promotions", True)
+                return self._data
+        record_cache("active_promotions", False)
+        return None
+    
+    def set(self, day: date, valid_until: date, data: List[dict]):
+        with self._lock:
+            self._data, self._day, self._valid_until = data, day, valid_until
+            self._stored_at = time.monotonic()
+    
+    def clear(self):
+        with self._lock:
+            self._data = None
+
+active_promotions_cache = ActivePromotionsCache()
+
+def _serialize_active_promotion(promotion: Promotion) -> dict:
+    return {
+        "id": promotion.id,
+        "name": promotion.name,
+        "description": promotion.description,
+        "discount_type": promotion.discount_type,
+        "discount_value": promotion.discount_value,
+        "min_purchase": promotion.min_purchase,
+        "max_discount": promotion.max_discount,
+        "start_date": promotion.start_date,
+        "end_date": promotion.end_date,
+        "is_active": promotion.is_active,
+        "created_at": promotion.created_at,
+        "updated_at": promotion.updated_at,
+        "product_ids": sorted(p.id for p in promotion.products),
+    }
 
 class PromotionService:
     def __init__(self, db: Session):
         self.db = db
     
+    def resolve_product_ids(
+        self,
+        product_ids: Optional[Iterable[int]] = None,
+        categories: Optional[Iterable[str]] = None
+    ) -> Set[int]:
+        """Validate product ids in one IN query and expand categories to their product ids"""
+        requested = set(product_ids or [])
+        resolved = set()
+        if requested:
+            resolved.update(r[0] for r in self.db.query(Product.id).filter(Product.id.in_(requested)))
+            missing = requested - resolved
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Products not found: {sorted(missing)[:20]}"
+                )
+        if categories:
+            resolved.update(r[0] for r in self.db.query(Product.id).filter(Product.category.in_(set(categories))))
+        return resolved
+    
+    def get_promotion_product_ids(self, promotion_id: int) -> Set[int]:
+        return {r[0] for r in self.db.query(promotion_product.c.product_id).filter(
+            promotion_product.c.promotion_id == promotion_id
+        )}
+    
+    def _add_products(self, promotion_id: int, product_ids: Iterable[int]):
+        for batch in _batches(sorted(product_ids)):
+            self.db.execute(insert(promotion_product), [
+                {"promotion_id": promotion_id, "product_id": product_id} for product_id in batch
+            ])
+    
+    def _remove_products(self, promotion_id: int, product_ids: Iterable[int]):
+        for batch in _batches(sorted(product_ids)):
+            self.db.execute(delete(promotion_product).where(
+                promotion_product.c.promotion_id == promotion_id,
+                promotion_product.c.product_id.in_(batch)
+            ))
+    
+    def set_products(self, promotion_id: int, target_ids: Set[int]) -> Set[int]:
+        """Make the promotion's products exactly target_ids, writing only the difference"""
+        existing = self.get_promotion_product_ids(promotion_id)
+        self._add_products(promotion_id, target_ids - existing)
+        self._remove_products(promotion_id, existing - target_ids)
+        return target_ids
+    
+    def _promotion_changed(self, promotion: Promotion, product_ids: Set[int]):
+        """Propagate a committed write to the pricing index and the active list cache"""
+        promotion_index.upsert(promotion, product_ids)
+        active_promotions_cache.clear()
+    
     def create_promotion(self, promotion_data: PromotionCreate) -> Promotion:
         """Create a new promotion"""
         # Validate dates
@@ -23,6 +139,8 @@ class PromotionService:
             description=promotion_data.description,
             discount_type=promotion_data.discount_type,
             discount_value=promotion_data.discount_value,
+            min_purchase=promotion_data.min_purchase or 0,
+            max_discount=promotion_data.max_discount,
             start_date=promotion_data.start_date,
             end_date=promotion_data.end_date,
             is_active=promotion_data.is_active
@@ -31,15 +149,13 @@ class PromotionService:
         self.db.add(promotion)
         self.db.flush()
         
-        # Add products if provided
-        if promotion_data.product_ids:
-            for product_id in promotion_data.product_ids:
-                product = self.db.query(Product).filter(Product.id == product_id).first()
-                if product:
-                    promotion.products.append(product)
+        # Add products (explicit ids and/or whole categories) if provided
+        product_ids = self.resolve_product_ids(promotion_data.product_ids, promotion_data.categories)
+        self._add_products(promotion.id, product_ids)
         
         self.db.commit()
         self.db.refresh(promotion)
+        self._promotion_changed(promotion, product_ids)
         return promotion
     
     def get_all_promotions(
@@ -97,21 +213,52 @@ class PromotionService:
         
         update_dict = promotion_data.dict(exclude_unset=True) if hasattr(promotion_data, 'dict') else promotion_data.__dict__
         for key, value in update_dict.items():
-            if key != "product_ids" and value is not None:
+            if key not in ("product_ids", "categories") and value is not None:
                 setattr(promotion, key, value)
         
-        # Update products if provided
-        if hasattr(promotion_data, 'product_ids') and promotion_data.product_ids is not None:
-            promotion.products.clear()
-            for product_id in promotion_data.product_ids:
-                product = self.db.query(Product).filter(Product.id == product_id).first()
-                if product:
-                    promotion.products.append(product)
+        # Replace products if provided, touching only rows that change
+        if promotion_data.product_ids is not None or promotion_data.categories is not None:
+            product_ids = self.set_products(
+                promotion.id,
+                self.resolve_product_ids(promotion_data.product_ids, promotion_data.categories)
+            )
+        else:
+            product_ids = self.get_promotion_product_ids(promotion.id)
         
         self.db.commit()
         self.db.refresh(promotion)
+        self._promotion_changed(promotion, product_ids)
         return promotion
     
+    def update_promotion_products(
+        self,
+        promotion_id: int,
+        add_ids: Optional[Iterable[int]] = None,
+        add_categories: Optional[Iterable[str]] = None,
+        remove_ids: Optional[Iterable[int]] = None,
+        remove_categories: Optional[Iterable[str]] = None
+    ) -> Set[int]:
+        """Add and/or remove products (by id or category) without resending the full list"""
+        promotion = self.get_promotion_by_id(promotion_id)
+        if not promotion:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Promotion not found"
+            )
+        
+        existing = self.get_promotion_product_ids(promotion_id)
+        to_add = self.resolve_product_ids(add_ids, add_categories) if (add_ids or add_categories) else set()
+        to_remove = self.resolve_product_ids(remove_ids, remove_categories) if (remove_ids or remove_categories) else set()
+        to_add -= to_remove
+        
+        self._add_products(promotion_id, to_add - existing)
+        self._remove_products(promotion_id, to_remove & existing)
+        product_ids = (existing | to_add) - to_remove
+        
+        self.db.commit()
+        self._promotion_changed(promotion, product_ids)
+        return product_ids
+    
     def delete_promotion(self, promotion_id: int):
         """Delete promotion"""
         promotion = self.get_promotion_by_id(promotion_id)
@@ -120,10 +267,38 @@ class PromotionService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Promotion not found"
             )
+        self.db.execute(delete(promotion_product).where(promotion_product.c.promotion_id == promotion_id))
         self.db.delete(promotion)
         self.db.commit()
+        promotion_index.remove(promotion_id)
+        active_promotions_cache.clear()
         return {"message": "Promotion deleted successfully"}
     
-    def get_active_promotions(self) -> List[Promotion]:
-        """Get active promotions"""
-        return self.db.query(Promotion).filter(Promotion.is_active).all()
\ No newline at end of file
+    def get_active_promotions(self, day: Optional[date] = None) -> List[dict]:
+        """Get promotions live on a day (default today) with their product ids"""
+        day = day or date.today()
+        cached = active_promotions_cache.get(day)
+        if cached is not None:
+            return cached
+        
+        promotions = self.db.query(Promotion).filter(
+            Promotion.is_active == True,
+            Promotion.start_date <= day,
+            Promotion.end_date >= day
+        ).options(
+            selectinload(Promotion.products).load_only(Product.id)
+        ).order_by(Promotion.end_date, Promotion.id).all()
+        
+        # The list next changes when a live promotion ends or an upcoming one starts
+        next_start = self.db.query(func.min(Promotion.start_date)).filter(
+            Promotion.is_active == True,
+            Promotion.start_date > day
+        ).scalar()
+        boundaries = [p.end_date + timedelta(days=1) for p in promotions]
+        if next_start:
+            boundaries.append(next_start)
+        valid_until = min(boundaries) if boundaries else date.max
+        
+        data = [_serialize_active_promotion(p) for p in promotions]
+        active_promotions_cache.set(day, valid_until, data)
+        return data
\ No newline at end of file
@@ -1,32 +1,38 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, case, select, union_all
 from app.database.models import (
-    Sale, Product, SaleItem, Customer, Inventory, InventoryTransaction
+    Sale, Product, SaleItem, Customer, Inventory, InventoryTransaction, SaleArchive
 )
 from app.schemas.report_schema import (
     RevenueReportItem, TopProductItem, CustomerReportItem, 
-    InventoryReportItem, DashboardSummary
+    InventoryReportItem, InventoryStatusCounts, DashboardSummary
 )
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Iterator, Optional
 
 class ReportService:
     def __init__(self, db: Session):
         self.db = db
     
-    def get_revenue_report(self, days: int = 30) -> List[RevenueReportItem]:
+    def get_revenue_report(self, days: int = 30, include_archived: bool = False) -> List[RevenueReportItem]:
         """Get revenue report for last N days"""
         start_date = datetime.now() - timedelta(days=days)
         
+        sales = select(Sale.sale_date, Sale.final_amount).where(Sale.sale_date >= start_date)
+        if include_archived:
+            sales = union_all(
+                sales,
+                select(SaleArchive.sale_date, SaleArchive.final_amount).where(SaleArchive.sale_date >= start_date)
+            )
+        sales = sales.subquery()
+        
         revenue = self.db.query(
-            func.date(Sale.sale_date).label('date'),
-            func.sum(Sale.final_amount).label('total')
-        ).filter(
-            Sale.sale_date >= start_date
+            func.date(sales.c.sale_date).label('date'),
+            func.sum(sales.c.final_amount).label('total')
         ).group_by(
-            func.date(Sale.sale_date)
+            func.date(sales.c.sale_date)
         ).order_by(
-            func.date(Sale.sale_date)
+            func.date(sales.c.sale_date)
         ).all()
         
         return [
@@ -59,9 +65,9 @@ class ReportService:
             for p in top_products
         ]
     
-    def get_customer_report(self) -> List[CustomerReportItem]:
-        """Get customer purchase report"""
-        customers = self.db.query(
+    def _customer_report_query(self):
+        """Customers who have purchased, ordered by total spent"""
+        return self.db.query(
             Customer.id,
             Customer.name,
             func.count(Sale.id).label('total_purchases'),
@@ -71,42 +77,111 @@ class ReportService:
         ).group_by(
             Customer.id, Customer.name
         ).order_by(
-            func.sum(Sale.final_amount).desc()
-        ).all()
+            func.sum(Sale.final_amount).desc(),
+            Customer.id
+        )
+    
+    @staticmethod
+    def _to_customer_report_item(row) -> CustomerReportItem:
+        return CustomerReportItem(
+            customer_id=row[0],
+            customer_name=row[1],
+            total_purchases=row[2] or 0,
+            total_spent=row[3] or 0
+        )
+    
+    def get_customer_report(self, skip: int = 0, limit: int = 100) -> List[CustomerReportItem]:
+        """Get one page of the customer purchase report (top-N when skip=0)"""
+        customers = self._customer_report_query().offset(skip).limit(limit).all()
+        return [self._to_customer_report_item(c) for c in customers]
+    
+    def get_customer_report_count(self) -> int:
+        """Get number of rows get_customer_report pages over (same joins, so sales of deleted
+        customers are not counted)"""
+        return self._customer_report_query().with_entities(
+            func.count(func.distinct(Customer.id))
+        ).group_by(None).order_by(None).scalar() or 0
+    
+    def iter_customer_report(self, batch_size: int = 1000) -> Iterator[CustomerReportItem]:
+        """Stream the full customer report from a server-side cursor"""
+        rows = self._customer_report_query().execution_options(
+            stream_results=True, yield_per=batch_size
+        )
+        for row in rows:
+            yield self._to_customer_report_item(row)
+    
+    @staticmethod
+    def _inventory_status_expr():
+        """SQL CASE classifying stock as CRITICAL, LOW or OK"""
+        return case(
+            (Inventory.quantity_on_hand <= 0, "CRITICAL"),
+            (Inventory.quantity_on_hand <= Inventory.reorder_level, "LOW"),
+            else_="OK"
+        )
+    
+    def _inventory_report_query(self, columns, status: Optional[str] = None, category: Optional[str] = None):
+        """Inventory joined to products with optional status/category filters"""
+        status_expr = self._inventory_status_expr()
+        query = self.db.query(*columns).select_from(Inventory).join(
+            Product, Product.id == Inventory.product_id
+        )
+        if status:
+            query = query.filter(status_expr == status.upper())
+        if category:
+            query = query.filter(Product.category == category)
+        return query
+    
+    def get_inventory_report(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> List[InventoryReportItem]:
+        """Get inventory status report"""
+        rows = self._inventory_report_query(
+            (
+                Inventory.product_id,
+                Product.name,
+                Inventory.quantity_on_hand,
+                Inventory.quantity_reserved,
+                Inventory.reorder_level,
+                self._inventory_status_expr().label('status')
+            ),
+            status, category
+        ).order_by(Inventory.product_id).offset(skip).limit(limit).all()
         
         return [
-            CustomerReportItem(
-                customer_id=c[0],
-                customer_name=c[1],
-                total_purchases=c[2] or 0,
-                total_spent=c[3] or 0
+            InventoryReportItem(
+                product_id=r[0],
+                product_name=r[1],
+                quantity_on_hand=r[2] or 0,
+                quantity_reserved=r[3] or 0,
+                reorder_level=r[4] or 0,
+                status=r[5]
             )
-            for c in customers
+            for r in rows
         ]
     
-    def get_inventory_report(self) -> List[InventoryReportItem]:
-        """Get inventory status report"""
-        inventory_items = self.db.query(Inventory).all()
-        
-        result = []
-        for inv in inventory_items:
-            if inv.quantity_on_hand <= 0:
-                status = "CRITICAL"
-            elif inv.quantity_on_hand <= inv.reorder_level:
-                status = "LOW"
-            else:
-                status = "OK"
-            
-            result.append(InventoryReportItem(
-                product_id=inv.product_id,
-                product_name=inv.product.name,
-                quantity_on_hand=inv.quantity_on_hand,
-                quantity_reserved=inv.quantity_reserved,
-                reorder_level=inv.reorder_level,
-                status=status
-            ))
+    def get_inventory_report_count(self, status: Optional[str] = None, category: Optional[str] = None) -> int:
+        """Get number of inventory rows matching the report filters"""
+        return self._inventory_report_query((func.count(Inventory.id),), status, category).scalar() or 0
+    
+    def get_inventory_status_counts(self, category: Optional[str] = None) -> InventoryStatusCounts:
+        """Get number of inventory rows per status in a single aggregate query"""
+        status_expr = self._inventory_status_expr()
+        rows = self._inventory_report_query(
+            (status_expr.label('status'), func.count(Inventory.id)),
+            category=category
+        ).group_by(status_expr).all()
         
-        return result
+        counts = {r[0]: r[1] for r in rows}
+        return InventoryStatusCounts(
+            critical=counts.get("CRITICAL", 0),
+            low=counts.get("LOW", 0),
+            ok=counts.get("OK", 0),
+            total=sum(counts.values())
+        )
     
     def get_dashboard_summary(self) -> DashboardSummary:
         """Get dashboard summary"""
@@ -116,13 +191,17 @@ class ReportService:
         total_sales = self.db.query(func.sum(Sale.final_amount)).scalar() or 0
         total_sales_count = self.db.query(func.count(Sale.id)).scalar() or 0
         
-        # Today's sales
-        today_sales = self.db.query(func.sum(Sale.final_amount)).filter(
-            func.date(Sale.sale_date) == today
-        ).scalar() or 0
-        today_sales_count = self.db.query(func.count(Sale.id)).filter(
-            func.date(Sale.sale_date) == today
-        ).scalar() or 0
+        # Today's sales (range on sale_date so the index is usable)
+        today_start = datetime.combine(today, datetime.min.time())
+        tomorrow_start = today_start + timedelta(days=1)
+        today_sales, today_sales_count = self.db.query(
+            func.sum(Sale.final_amount), func.count(Sale.id)
+        ).filter(
+            Sale.sale_date >= today_start,
+            Sale.sale_date < tomorrow_start
+        ).one()
+        today_sales = today_sales or 0
+        today_sales_count = today_sales_count or 0
         
         # Total customers
         total_customers = self.db.query(func.count(Customer.id)).scalar() or 0
@@ -134,7 +213,7 @@ class ReportService:
         
         # Low stock count
         low_stock_count = self.db.query(func.count(Inventory.id)).filter(
-            Inventory.quantity_on_hand <= Inventory.reorder_level
+            Inventory.is_low_stock == True
         ).scalar() or 0
         
         return DashboardSummary(
@@ -0,0 +1,327 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import update, bindparam, func
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.database.db import SessionLocal
+from app.database.models import Inventory, StockReservation
+from app.services.inventory_service import InventoryService
+from app.services.stock_alert_service import StockAlertService
+from fastapi import HTTPException, status
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESERVATION_HELD = "HELD"
+RESERVATION_COMMITTED = "COMMITTED"
+RESERVATION_RELEASED = "RELEASED"
+RESERVATION_EXPIRED = "EXPIRED"
+
+inventory_table = Inventory.__table__
+
+class ReservationService:
+    """TTL stock holds backed by Inventory.quantity_reserved.
+    
+    Every state change is a conditional UPDATE checked by rowcount, so two
+    callers can never both reserve the last unit or both release one hold.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def reserve(
+        self,
+        product_id: int,
+        quantity: int,
+        ttl_seconds: Optional[int] = None,
+        sale_id: Optional[int] = None,
+        commit: bool = True
+    ) -> StockReservation:
+        """Hold stock if on_hand - reserved covers the quantity"""
+        result = self.db.execute(
+            update(Inventory).where(
+                Inventory.product_id == product_id,
+                Inventory.quantity_on_hand - Inventory.quantity_reserved >= quantity
+            ).values(
+                quantity_reserved=Inventory.quantity_reserved + quantity
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self.db.rollback()
+            InventoryService.get_inventory_by_product(self.db, product_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient available stock for product {product_id}"
+            )
+        
+        inventory = self.db.query(Inventory).filter(
+            Inventory.product_id == product_id
+        ).populate_existing().first()
+        
+        ttl = ttl_seconds if ttl_seconds is not None else settings.RESERVATION_TTL_SECONDS
+        reservation = StockReservation(
+            inventory_id=inventory.id,
+            product_id=product_id,
+            sale_id=sale_id,
+            quantity=quantity,
+            status=RESERVATION_HELD,
+            expires_at=datetime.now() + timedelta(seconds=ttl)
+        )
+        self.db.add(reservation)
+        
+        if commit:
+            self.db.commit()
+            self.db.refresh(reservation)
+        else:
+            self.db.flush()
+        return reservation
+    
+    def get_reservation_by_id(self, reservation_id: int) -> Optional[StockReservation]:
+        return self.db.query(StockReservation).filter(StockReservation.id == reservation_id).first()
+    
+    def get_sale_reservations(self, sale_id: int) -> List[StockReservation]:
+        return self.db.query(StockReservation).filter(StockReservation.sale_id == sale_id).all()
+    
+    def _transition(self, reservation_id: int, new_status: str) -> StockReservation:
+        """Move a HELD reservation to new_status; only one caller can win"""
+        result = self.db.execute(
+            update(StockReservation).where(
+                StockReservation.id == reservation_id,
+                StockReservation.status == RESERVATION_HELD
+            ).values(status=new_status).execution_options(synchronize_session=False)
+        )
+        reservation = self.db.query(StockReservation).filter(
+            StockReservation.id == reservation_id
+        ).populate_existing().first()
+        
+        if result.rowcount == 0:
+            self.db.rollback()
+            if not reservation:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Reservation not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Reservation {reservation_id} is {reservation.status}, not {RESERVATION_HELD}"
+            )
+        return reservation
+    
+    def release(self, reservation_id: int, commit: bool = True) -> StockReservation:
+        """Give held stock back to the available pool"""
+        reservation = self._transition(reservation_id, RESERVATION_RELEASED)
+        self.db.execute(
+            update(Inventory).where(
+                Inventory.id == reservation.inventory_id
+            ).values(
+                quantity_reserved=Inventory.quantity_reserved - reservation.quantity
+            ).execution_options(synchronize_session=False)
+        )
+        if commit:
+            self.db.commit()
+            self.db.refresh(reservation)
+        return reservation
+    
+    def commit(self, reservation_id: int, commit: bool = True) -> StockReservation:
+        """Turn a hold into a stock deduction (confirm step of checkout)"""
+        reservation = self._transition(reservation_id, RESERVATION_COMMITTED)
+        new_quantity = Inventory.quantity_on_hand - reservation.quantity
+        
+        # is_low_stock is assigned first: MySQL evaluates SET left to right
+        result = self.db.execute(
+            update(Inventory).where(
+                Inventory.id == reservation.inventory_id,
+                Inventory.quantity_on_hand >= reservation.quantity
+            ).ordered_values(
+                (Inventory.is_low_stock, new_quantity <= func.coalesce(Inventory.reorder_level, 10)),
+                (Inventory.quantity_on_hand, new_quantity),
+                (Inventory.quantity_reserved, Inventory.quantity_reserved - reservation.quantity)
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Stock for product {reservation.product_id} was adjusted below the reserved quantity"
+            )
+        
+        InventoryService.record_transaction(
+            self.db, reservation.inventory_id, "OUT", reservation.quantity,
+            "Reservation committed", f"RES-{reservation.id}"
+        )
+        
+        inventory = self.db.query(Inventory).filter(
+            Inventory.id == reservation.inventory_id
+        ).populate_existing().first()
+        reorder_level = inventory.reorder_level if inventory.reorder_level is not None else 10
+        was_low_stock = inventory.quantity_on_hand + reservation.quantity <= reorder_level
+        if was_low_stock != inventory.is_low_stock:
+            StockAlertService.queue_alert(self.db, {
+                "inventory_id": inventory.id,
+                "product_id": inventory.product_id,
+                "quantity_on_hand": inventory.quantity_on_hand,
+                "reorder_level": reorder_level,
+                "is_low_stock": inventory.is_low_stock
+            })
+        
+        if commit:
+            self.db.commit()
+            self.db.refresh(reservation)
+        return reservation
+    
+    def commit_lapsed(self, reservation: StockReservation) -> StockReservation:
+        """Commit an EXPIRED or RELEASED hold by taking its stock again from the available pool"""
+        try:
+            inventory = InventoryService.apply_stock_delta(
+                self.db, reservation.product_id, reservation.quantity, outgoing=True, respect_reserved=True
+            )
+        except HTTPException as e:
+            if e.status_code != status.HTTP_400_BAD_REQUEST:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Reservation {reservation.id} is {reservation.status} and product {reservation.product_id} no longer has enough stock"
+            )
+        
+        result = self.db.execute(
+            update(StockReservation).where(
+                StockReservation.id == reservation.id,
+                StockReservation.status == reservation.status
+            ).values(status=RESERVATION_COMMITTED).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Reservation {reservation.id} changed while it was being committed"
+            )
+        
+        InventoryService.record_transaction(
+            self.db, inventory.id, "OUT", reservation.quantity,
+            "Reservation committed", f"RES-{reservation.id}"
+        )
+        return reservation
+    
+    def commit_sale(self, sale_id: int, commit: bool = True):
+        """Confirm every hold of a pending sale; holds that lapsed meanwhile take stock again"""
+        for reservation in self.get_sale_reservations(sale_id):
+            if reservation.status == RESERVATION_HELD:
+                self.commit(reservation.id, commit=False)
+            elif reservation.status in (RESERVATION_EXPIRED, RESERVATION_RELEASED):
+                self.commit_lapsed(reservation)
+        if commit:
+            self.db.commit()
+    
+    def release_sale(self, sale_id: int, commit: bool = True):
+        """Release every still-held reservation of a sale"""
+        for reservation in self.get_sale_reservations(sale_id):
+            if reservation.status == RESERVATION_HELD:
+                self.release(reservation.id, commit=False)
+        if commit:
+            self.db.commit()
+    
+    def detach_sale(self, sale_id: int):
+        """Keep reservation history when its sale is deleted"""
+        self.db.query(StockReservation).filter(
+            StockReservation.sale_id == sale_id
+        ).update({StockReservation.sale_id: None}, synchronize_session=False)
+    
+    def expire_stale(self, batch_size: int = 500) -> int:
+        """Expire one batch of HELD reservations past their TTL; returns rows expired"""
+        rows = self.db.query(
+            StockReservation.id, StockReservation.inventory_id, StockReservation.quantity
+        ).filter(
+            StockReservation.status == RESERVATION_HELD,
+            StockReservation.expires_at <= datetime.now()
+        ).order_by(
+            StockReservation.expires_at
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+        
+        if not rows:
+            self.db.rollback()
+            return 0
+        
+        # Only rows this UPDATE moved off HELD give their stock back: SQLite ignores skip_locked,
+        # and a commit/release can land between the SELECT and here
+        expire = update(StockReservation).where(
+            StockReservation.status == RESERVATION_HELD
+        ).values(status=RESERVATION_EXPIRED).execution_options(synchronize_session=False)
+        if self.db.get_bind().dialect.update_returning:
+            expired_ids = set(self.db.execute(
+                expire.where(StockReservation.id.in_([r[0] for r in rows])).returning(StockReservation.id)
+            ).scalars())
+        else:
+            expired_ids = {
+                r[0] for r in rows
+                if self.db.execute(expire.where(StockReservation.id == r[0])).rowcount
+            }
+        
+        released = defaultdict(int)
+        for reservation_id, inventory_id, quantity in rows:
+            if reservation_id in expired_ids:
+                released[inventory_id] += quantity
+        if released:
+            self.db.execute(
+                update(inventory_table).where(
+                    inventory_table.c.id == bindparam("inventory_id")
+                ).values(
+                    quantity_reserved=inventory_table.c.quantity_reserved - bindparam("released")
+                ),
+                [{"inventory_id": k, "released": v} for k, v in released.items()]
+            )
+        self.db.commit()
+        return len(expired_ids)
+
+class ReservationSweeper:
+    """Background task that expires stale holds in batches"""
+    
+    def __init__(
+        self,
+        interval_seconds: int = settings.RESERVATION_SWEEP_INTERVAL_SECONDS,
+        batch_size: int = settings.RESERVATION_SWEEP_BATCH_SIZE
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+    
+    def sweep(self) -> int:
+        """Expire batches until none are left; returns total expired"""
+        total = 0
+        db = SessionLocal()
+        try:
+            while True:
+                expired = ReservationService(db).expire_stale(self.batch_size)
+                total += expired
+                if expired < self.batch_size:
+                    break
+        finally:
+            db.close()
+        if total:
+            logger.info("Expired %s stale stock reservations", total)
+        return total
+    
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await run_in_threadpool(self.sweep)
+            except Exception as e:
+                logger.error("Reservation sweep failed: %s", str(e))
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+reservation_sweeper = ReservationSweeper()
@@ -1,9 +1,15 @@
-from sqlalchemy.orm import Session
-from app.database.models import Sale, SaleItem, Product, Inventory, Customer
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import literal
+from app.database.models import Sale, SaleItem, Product, Customer, SaleArchive
 from app.schemas.sale_schema import SaleCreate, SaleUpdate
+from app.services.inventory_service import InventoryService
+from app.services.reservation_service import ReservationService
+from app.services.pricing_service import promotion_index
+from app.core.money import to_money
 from fastapi import HTTPException, status
 from datetime import datetime
 from typing import List, Optional
+import uuid
 
 class SaleService:
     def __init__(self, db: Session):
@@ -26,8 +32,12 @@ class SaleService:
                 detail="Sale must have at least one item"
             )
         
+        if sale_data.apply_promotions:
+            promotion_index.ensure_loaded(self.db)
+        
         # Calculate totals and validate inventory
-        total_amount = 0
+        total_amount = to_money(0)
+        line_discounts = []
         for item in sale_data.items:
             product = self.db.query(Product).filter(Product.id == item.product_id).first()
             if not product:
@@ -36,23 +46,28 @@ class SaleService:
                     detail=f"Product {item.product_id} not found"
                 )
             
-            inventory = self.db.query(Inventory).filter(
-                Inventory.product_id == item.product_id
-            ).first()
+            inventory = InventoryService.find_inventory_by_product(self.db, item.product_id)
             
-            if not inventory or inventory.quantity_on_hand < item.quantity:
+            available = inventory.quantity_on_hand - (inventory.quantity_reserved or 0) if inventory else 0
+            if available < item.quantity:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Insufficient stock for product {product.name}"
                 )
             
-            line_total = item.quantity * item.unit_price - item.discount
-            total_amount += line_total
+            if sale_data.apply_promotions:
+                line_discount, _ = promotion_index.best_discount(item.product_id, item.unit_price, item.quantity)
+            else:
+                line_discount = to_money(item.discount)
+            line_discounts.append(line_discount)
+            total_amount += item.quantity * to_money(item.unit_price) - line_discount
         
         # Create sale
-        invoice_number = f"INV-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        # The timestamp alone repeats for sales created in the same second
+        invoice_number = f"INV-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8].upper()}"
         
-        final_amount = total_amount - sale_data.discount + sale_data.tax
+        final_amount = total_amount - to_money(sale_data.discount) + to_money(sale_data.tax)
+        is_pending = sale_data.status == "pending"
         
         sale = Sale(
             invoice_number=invoice_number,
@@ -62,72 +77,130 @@ class SaleService:
             discount=sale_data.discount,
             tax=sale_data.tax,
             final_amount=final_amount,
+            status=sale_data.status,
             notes=sale_data.notes
         )
         self.db.add(sale)
         self.db.flush()
         
-        # Add items and update inventory
-        for item in sale_data.items:
+        # Add items and update inventory (pending sales only hold stock)
+        reservations = ReservationService(self.db)
+        for item, line_discount in zip(sale_data.items, line_discounts):
             sale_item = SaleItem(
                 sale_id=sale.id,
                 product_id=item.product_id,
                 quantity=item.quantity,
                 unit_price=item.unit_price,
-                discount=item.discount,
-                line_total=item.quantity * item.unit_price - item.discount
+                discount=line_discount,
+                line_total=item.quantity * to_money(item.unit_price) - line_discount
             )
             self.db.add(sale_item)
             
-            # Update inventory
-            inventory = self.db.query(Inventory).filter(
-                Inventory.product_id == item.product_id
-            ).first()
-            inventory.quantity_on_hand -= item.quantity
+            if is_pending:
+                reservations.reserve(item.product_id, item.quantity, sale_id=sale.id, commit=False)
+            else:
+                inventory = InventoryService.apply_stock_delta(
+                    self.db, item.product_id, item.quantity, outgoing=True, respect_reserved=True
+                )
+                InventoryService.record_transaction(
+                    self.db, inventory.id, "OUT", item.quantity, "Sale", invoice_number
+                )
         
         self.db.commit()
         self.db.refresh(sale)
         return sale
     
-    def get_all_sales(self, skip: int = 0, limit: int = 100, search: Optional[str] = None, status_filter: Optional[str] = None) -> List[Sale]:
-        """Get all sales with pagination, search and filters"""
-        query = self.db.query(Sale)
+    def _filtered_sales(self, model, search: Optional[str] = None, status_filter: Optional[str] = None):
+        """Sales (live or archived model) with search and status filters applied"""
+        query = self.db.query(model)
         
         # Apply search filter
         if search:
             search_term = f"%{search}%"
-            query = query.join(Customer).filter(
-                (Sale.invoice_number.ilike(search_term)) |
+            query = query.join(Customer, Customer.id == model.customer_id).filter(
+                (model.invoice_number.ilike(search_term)) |
                 (Customer.name.ilike(search_term))
             )
         
         # Apply status filter
         if status_filter:
-            query = query.filter(Sale.status == status_filter)
+            query = query.filter(model.status == status_filter)
         
-        return query.offset(skip).limit(limit).all()
+        return query
     
-    def get_sales_count(self, search: Optional[str] = None, status_filter: Optional[str] = None) -> int:
-        """Get total count of sales with optional search and filters"""
-        query = self.db.query(Sale)
-        
-        # Apply search filter
-        if search:
-            search_term = f"%{search}%"
-            query = query.join(Customer).filter(
-                (Sale.invoice_number.ilike(search_term)) |
-                (Customer.name.ilike(search_term))
-            )
+    @staticmethod
+    def _list_options():
+        """Load what a sales list renders (customer, items) in one query each instead of per sale"""
+        return selectinload(Sale.customer), selectinload(Sale.items)
+    
+    def get_all_sales(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        include_archived: bool = False
+    ) -> List[Sale]:
+        """Get all sales with pagination, search and filters"""
+        if not include_archived:
+            return self._filtered_sales(Sale, search, status_filter).options(*self._list_options()).offset(skip).limit(limit).all()
         
-        # Apply status filter
-        if status_filter:
-            query = query.filter(Sale.status == status_filter)
+        # Page over ids from both tables, then load each side in one query
+        live_ids = self._filtered_sales(Sale, search, status_filter).with_entities(
+            Sale.id.label("id"), literal(False).label("archived")
+        )
+        archived_ids = self._filtered_sales(SaleArchive, search, status_filter).with_entities(
+            SaleArchive.id.label("id"), literal(True).label("archived")
+        )
+        ids = live_ids.union_all(archived_ids).subquery()
+        page = self.db.query(ids.c.id, ids.c.archived).order_by(ids.c.id).offset(skip).limit(limit).all()
         
-        return query.count()
+        live = {s.id: s for s in self.db.query(Sale).options(*self._list_options()).filter(
+            Sale.id.in_([i for i, archived in page if not archived])
+        )}
+        archived = {s.id: s for s in self.db.query(SaleArchive).options(selectinload(SaleArchive.items)).filter(
+            SaleArchive.id.in_([i for i, archived in page if archived])
+        )}
+        return [archived[i] if is_archived else live[i] for i, is_archived in page]
+    
+    def get_sales_count(
+        self,
+        search: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        include_archived: bool = False
+    ) -> int:
+        """Get total count of sales with optional search and filters"""
+        count = self._filtered_sales(Sale, search, status_filter).count()
+        if include_archived:
+            count += self._filtered_sales(SaleArchive, search, status_filter).count()
+        return count
     
-    def get_sale_by_id(self, sale_id: int) -> Optional[Sale]:
+    def _outstanding_sales(self, customer_id: Optional[int] = None):
+        """Open sales whose maintained amount_paid is below final_amount"""
+        query = self.db.query(Sale).filter(
+            Sale.status.notin_(["canceled", "cancelled"]),
+            Sale.final_amount > Sale.amount_paid
+        )
+        if customer_id:
+            query = query.filter(Sale.customer_id == customer_id)
+        return query
+    
+    def get_outstanding_sales(self, skip: int = 0, limit: int = 100, customer_id: Optional[int] = None) -> List[Sale]:
+        """Get sales with an unpaid balance, oldest first"""
+        return self._outstanding_sales(customer_id).options(*self._list_options()).order_by(
+            Sale.sale_date, Sale.id
+        ).offset(skip).limit(limit).all()
+    
+    def get_outstanding_sales_count(self, customer_id: Optional[int] = None) -> int:
+        """Get number of sales with an unpaid balance"""
+        return self._outstanding_sales(customer_id).count()
+    
+    def get_sale_by_id(self, sale_id: int, include_archived: bool = False) -> Optional[Sale]:
         """Get sale by ID"""
-        return self.db.query(Sale).filter(Sale.id == sale_id).first()
+        sale = self.db.query(Sale).filter(Sale.id == sale_id).first()
+        if not sale and include_archived:
+            sale = self.db.query(SaleArchive).filter(SaleArchive.id == sale_id).first()
+        return sale
     
     def update_sale(self, sale_id: int, sale_data: SaleUpdate) -> Sale:
         """Update sale information"""
@@ -138,6 +211,12 @@ class SaleService:
                 detail="Sale not found"
             )
         
+        # Confirm or release the stock held by a pending sale
+        if sale.status == "pending" and sale_data.status == "completed":
+            ReservationService(self.db).commit_sale(sale.id, commit=False)
+        elif sale.status == "pending" and sale_data.status in ("canceled", "cancelled"):
+            ReservationService(self.db).release_sale(sale.id, commit=False)
+        
         update_dict = sale_data.dict(exclude_unset=True) if hasattr(sale_data, 'dict') else sale_data.__dict__
         for key, value in update_dict.items():
             if value is not None:
@@ -156,13 +235,21 @@ class SaleService:
                 detail="Sale not found"
             )
         
-        # Restore inventory
-        for item in sale.items:
-            inventory = self.db.query(Inventory).filter(
-                Inventory.product_id == item.product_id
-            ).first()
-            if inventory:
-                inventory.quantity_on_hand += item.quantity
+        # Restore inventory; a pending sale only held stock
+        reservations = ReservationService(self.db)
+        if sale.status == "pending":
+            reservations.release_sale(sale.id, commit=False)
+        else:
+            for item in sale.items:
+                inventory = InventoryService.find_inventory_by_product(self.db, item.product_id)
+                if inventory:
+                    InventoryService.apply_stock_delta(
+                        self.db, item.product_id, item.quantity, outgoing=False
+                    )
+                    InventoryService.record_transaction(
+                        self.db, inventory.id, "IN", item.quantity, "Sale deleted", sale.invoice_number
+                    )
+        reservations.detach_sale(sale.id)
         
         # Delete sale (cascades to items)
         self.db.delete(sale)
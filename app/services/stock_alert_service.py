@@ -0,0 +1,52 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.schemas.inventory_schema import LowStockAlert
+from typing import Callable, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+LowStockListener = Callable[[LowStockAlert], None]
+
+# Session.info key holding alerts queued until the transaction commits
+LOW_STOCK_ALERTS_KEY = "low_stock_alerts"
+
+class StockAlertService:
+    """Push notifications for inventory crossing its reorder level"""
+    _listeners: List[LowStockListener] = []
+    
+    @staticmethod
+    def register_listener(listener: LowStockListener) -> LowStockListener:
+        """Register a callback fired after commit when an item enters or leaves low stock"""
+        StockAlertService._listeners.append(listener)
+        return listener
+    
+    @staticmethod
+    def unregister_listener(listener: LowStockListener):
+        if listener in StockAlertService._listeners:
+            StockAlertService._listeners.remove(listener)
+    
+    @staticmethod
+    def queue_alert(db: Session, alert: dict):
+        """Queue an alert on the session; dispatched after commit, dropped on rollback"""
+        db.info.setdefault(LOW_STOCK_ALERTS_KEY, []).append(alert)
+    
+    @staticmethod
+    def notify(alert: LowStockAlert):
+        for listener in list(StockAlertService._listeners):
+            try:
+                listener(alert)
+            except Exception as e:
+                logger.error("Low stock listener failed for product %s: %s", alert.product_id, str(e))
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_low_stock_alerts(session):
+    alerts = session.info.pop(LOW_STOCK_ALERTS_KEY, None)
+    if not alerts:
+        return
+    for alert in alerts:
+        StockAlertService.notify(LowStockAlert(**alert))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_low_stock_alerts(session):
+    session.info.pop(LOW_STOCK_ALERTS_KEY, None)
@@ -0,0 +1,32 @@
+"""inventory low stock flag
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('inventory', sa.Column('is_low_stock', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.execute(
+        "UPDATE inventory SET is_low_stock = "
+        "CASE WHEN COALESCE(quantity_on_hand, 0) <= COALESCE(reorder_level, 10) THEN 1 ELSE 0 END"
+    )
+    op.create_index(op.f('ix_inventory_is_low_stock'), 'inventory', ['is_low_stock'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_inventory_is_low_stock'), table_name='inventory')
+    op.drop_column('inventory', 'is_low_stock')
@@ -0,0 +1,82 @@
+"""unique inventory per product
+
+Merges duplicate inventory rows per product into the lowest id: quantities are
+summed and every ledger/reservation row is re-pointed at the survivor. Snapshots
+of merged products are dropped so the next compaction rebuilds them from the
+combined ledger.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REPOINT_TABLES = [
+    'inventory_transactions',
+    'inventory_transactions_archive',
+    'stock_reservations',
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    duplicates = bind.execute(sa.text(
+        "SELECT product_id, MIN(id), SUM(COALESCE(quantity_on_hand, 0)), SUM(COALESCE(quantity_reserved, 0)) "
+        "FROM inventory GROUP BY product_id HAVING COUNT(*) > 1"
+    )).fetchall()
+
+    for product_id, survivor_id, quantity_on_hand, quantity_reserved in duplicates:
+        others = [r[0] for r in bind.execute(
+            sa.text("SELECT id FROM inventory WHERE product_id = :p AND id <> :s"),
+            {"p": product_id, "s": survivor_id}
+        )]
+        merged = sa.bindparam("merged", expanding=True)
+        for table in REPOINT_TABLES:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET inventory_id = :s WHERE inventory_id IN :merged").bindparams(merged),
+                {"s": survivor_id, "merged": others}
+            )
+        bind.execute(
+            sa.text("DELETE FROM inventory_snapshots WHERE inventory_id IN :merged OR inventory_id = :s").bindparams(merged),
+            {"s": survivor_id, "merged": others}
+        )
+        bind.execute(
+            sa.text(
+                "UPDATE inventory SET quantity_on_hand = :q, quantity_reserved = :r, "
+                "is_low_stock = CASE WHEN :q <= COALESCE(reorder_level, 10) THEN 1 ELSE 0 END "
+                "WHERE id = :s"
+            ),
+            {"q": quantity_on_hand, "r": quantity_reserved, "s": survivor_id}
+        )
+        bind.execute(
+            sa.text("DELETE FROM inventory WHERE id IN :merged").bindparams(merged),
+            {"merged": others}
+        )
+
+    _replace_product_index(unique=True)
+
+
+def downgrade() -> None:
+    _replace_product_index(unique=False)
+
+
+def _replace_product_index(unique: bool) -> None:
+    """Rebuild ix_inventory_product_id without ever leaving inventory.product_id unindexed:
+    InnoDB refuses to drop the only index backing the products foreign key (error 1553).
+    A temporary index covers the column while the real one is swapped, which works on every
+    dialect (unlike RENAME INDEX); inventory has one row per product, so building twice is cheap."""
+    op.create_index('ix_inventory_product_id_tmp', 'inventory', ['product_id'], unique=unique)
+    op.drop_index('ix_inventory_product_id', table_name='inventory')
+    op.create_index('ix_inventory_product_id', 'inventory', ['product_id'], unique=unique)
+    op.drop_index('ix_inventory_product_id_tmp', table_name='inventory')
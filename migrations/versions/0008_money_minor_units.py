@@ -0,0 +1,65 @@
+"""money columns as integer minor units
+
+Every FLOAT money column becomes a BIGINT count of minor units
+(10 ** CURRENCY_DECIMALS per unit), rounded half away from zero.
+PROMOTIONS.discount_value is scaled too so percentages keep two decimals.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCALE = 10 ** settings.CURRENCY_DECIMALS
+
+MONEY_COLUMNS = {
+    'products': [('price', False), ('cost', True)],
+    'sales': [('total_amount', False), ('discount', True), ('tax', True), ('final_amount', False)],
+    'sale_items': [('unit_price', False), ('discount', True), ('line_total', False)],
+    'promotions': [('discount_value', False), ('min_purchase', True), ('max_discount', True)],
+    'payments': [('amount', False)],
+    'sales_archive': [('total_amount', False), ('discount', True), ('tax', True), ('final_amount', False)],
+    'sale_items_archive': [('unit_price', False), ('discount', True), ('line_total', False)],
+    'payments_archive': [('amount', False)],
+}
+
+
+def upgrade() -> None:
+    for table, columns in MONEY_COLUMNS.items():
+        assignments = ", ".join(f"{name} = ROUND({name} * {SCALE})" for name, _ in columns)
+        op.execute(f"UPDATE {table} SET {assignments}")
+        with op.batch_alter_table(table) as batch_op:
+            for name, nullable in columns:
+                batch_op.alter_column(
+                    name,
+                    existing_type=sa.Float(),
+                    type_=sa.BigInteger(),
+                    existing_nullable=nullable
+                )
+
+
+def downgrade() -> None:
+    for table, columns in MONEY_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for name, nullable in columns:
+                batch_op.alter_column(
+                    name,
+                    existing_type=sa.BigInteger(),
+                    type_=sa.Float(),
+                    existing_nullable=nullable
+                )
+        assignments = ", ".join(f"{name} = {name} / {SCALE}.0" for name, _ in columns)
+        op.execute(f"UPDATE {table} SET {assignments}")
@@ -0,0 +1,35 @@
+"""opening inventory snapshots
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stock that existed before the ledger was complete has no IN rows to replay from zero,
+    # so anchor every inventory at its current quantity and the ledger position right now
+    op.execute(
+        "INSERT INTO inventory_snapshots (inventory_id, product_id, quantity_on_hand, last_transaction_id, snapshot_at) "
+        "SELECT i.id, i.product_id, i.quantity_on_hand, "
+        "COALESCE((SELECT MAX(t.id) FROM inventory_transactions t WHERE t.inventory_id = i.id), 0), "
+        "CURRENT_TIMESTAMP "
+        "FROM inventory i"
+    )
+
+
+def downgrade() -> None:
+    # Opening snapshots stay valid point-in-time data; nothing to undo
+    pass
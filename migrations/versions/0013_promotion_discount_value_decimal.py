@@ -0,0 +1,48 @@
+"""promotion discount_value as decimal
+
+discount_value holds a percentage for PERCENTAGE promotions, so it leaves
+the minor-unit Money encoding from 0008 and becomes an exact DECIMAL(12, 2)
+in natural units (10% is 10.00, a fixed discount of 50,000 is 50000.00).
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCALE = 10 ** settings.CURRENCY_DECIMALS
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('promotions') as batch_op:
+        batch_op.alter_column(
+            'discount_value',
+            existing_type=sa.BigInteger(),
+            type_=sa.Numeric(12, 2),
+            existing_nullable=False
+        )
+    op.execute(f"UPDATE promotions SET discount_value = discount_value / {SCALE}.0")
+
+
+def downgrade() -> None:
+    op.execute(f"UPDATE promotions SET discount_value = ROUND(discount_value * {SCALE})")
+    with op.batch_alter_table('promotions') as batch_op:
+        batch_op.alter_column(
+            'discount_value',
+            existing_type=sa.Numeric(12, 2),
+            type_=sa.BigInteger(),
+            existing_nullable=False
+        )
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+
+# Tests run against a throwaway file-backed SQLite database; set before app.core.config is imported
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="furniture_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DB_DIR, 'test.db')}"
+os.environ["DEBUG"] = "False"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from app.core.security import get_current_user
+from app.database.db import Base, SessionLocal, engine
+from app.database.models import User
+from app.database.query_stats import assert_max_queries
+from app.database.schema_check import ALEMBIC_INI
+from fastapi.testclient import TestClient
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Schema built by the real migrations, once per session"""
+    # No ini file: its logging section would reconfigure the app's loggers
+    config = Config()
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    command.upgrade(config, "head")
+    yield engine
+    engine.dispose()
+    shutil.rmtree(_TEST_DB_DIR, ignore_errors=True)
+
+@pytest.fixture(autouse=True)
+def _clean_tables(database):
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def admin_user(db):
+    user = User(username="admin", email="admin@example.com", hashed_password="x", full_name="Admin", role="admin")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    return user
+
+@pytest.fixture
+def client(admin_user):
+    """TestClient over the test database, authenticated as admin_user (no lifespan: no background tasks)"""
+    from app.main import app
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+@pytest.fixture
+def max_queries():
+    """Query budget for an endpoint:
+        
+        def test_list_products(client, max_queries):
+            with max_queries(3):
+                client.get("/api/products/")
+    """
+    return assert_max_queries
@@ -0,0 +1,101 @@
+from app.database.db import SessionLocal
+from app.database.models import Inventory, InventoryTransaction, Product
+from app.schemas.inventory_schema import InventoryTransactionCreate
+from app.services.inventory_service import InventoryService
+from fastapi import HTTPException
+import pytest
+import threading
+
+OPENING_STOCK = 30
+THREADS = 8
+CHANGES_PER_THREAD = 25
+
+def _create_product(db, quantity_on_hand: int) -> int:
+    product = Product(name="Oak table", code="OAK-TABLE-1", category="table", price=1500000)
+    db.add(product)
+    db.flush()
+    db.add(Inventory(product_id=product.id, quantity_on_hand=quantity_on_hand, reorder_level=5))
+    db.commit()
+    return product.id
+
+def test_concurrent_stock_changes_never_oversell(db):
+    product_id = _create_product(db, OPENING_STOCK)
+    applied, observed, unexpected = [], [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(THREADS)
+    
+    def worker(n: int):
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            for i in range(CHANGES_PER_THREAD):
+                # Two OUTs of 3 per IN of 2: demand outruns supply, so stock keeps hitting zero
+                outgoing = (n + i) % 3 != 0
+                quantity = 3 if outgoing else 2
+                try:
+                    inventory = InventoryService.add_transaction(session, InventoryTransactionCreate(
+                        product_id=product_id,
+                        quantity=quantity,
+                        transaction_type="out" if outgoing else "in",
+                        reason="Stress test"
+                    ))
+                except HTTPException as e:
+                    if e.status_code != 400:
+                        with lock:
+                            unexpected.append(e)
+                    continue
+                with lock:
+                    applied.append(-quantity if outgoing else quantity)
+                    observed.append(inventory.quantity_on_hand)
+        except Exception as e:
+            with lock:
+                unexpected.append(e)
+        finally:
+            session.close()
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert not unexpected
+    assert any(delta < 0 for delta in applied) and len(applied) < THREADS * CHANGES_PER_THREAD
+    assert min(observed) >= 0
+    
+    db.expire_all()
+    inventory = db.query(Inventory).filter(Inventory.product_id == product_id).one()
+    assert inventory.quantity_on_hand == OPENING_STOCK + sum(applied)
+    assert inventory.quantity_on_hand >= 0
+    assert inventory.is_low_stock == (inventory.quantity_on_hand <= inventory.reorder_level)
+    
+    ledger = db.query(InventoryTransaction).filter(InventoryTransaction.inventory_id == inventory.id).all()
+    assert len(ledger) == len(applied)
+    assert sum(t.quantity if t.transaction_type == "IN" else -t.quantity for t in ledger) == sum(applied)
+
+def test_outgoing_stock_cannot_take_reserved_units(db):
+    product_id = _create_product(db, 10)
+    db.query(Inventory).filter(Inventory.product_id == product_id).update({Inventory.quantity_reserved: 8})
+    db.commit()
+    
+    with pytest.raises(HTTPException) as e:
+        InventoryService.apply_stock_delta(db, product_id, 3, outgoing=True, respect_reserved=True)
+    assert e.value.status_code == 400
+    
+    inventory = InventoryService.apply_stock_delta(db, product_id, 2, outgoing=True, respect_reserved=True)
+    db.commit()
+    assert inventory.quantity_on_hand == 8
+
+def test_stock_delta_with_null_reorder_level_uses_the_default(db):
+    product_id = _create_product(db, 12)
+    db.query(Inventory).filter(Inventory.product_id == product_id).update({Inventory.reorder_level: None})
+    db.commit()
+    
+    inventory = InventoryService.apply_stock_delta(db, product_id, 1, outgoing=True)
+    db.commit()
+    assert (inventory.quantity_on_hand, inventory.is_low_stock) == (11, False)
+    
+    inventory = InventoryService.apply_stock_delta(db, product_id, 2, outgoing=True)
+    db.commit()
+    assert (inventory.quantity_on_hand, inventory.is_low_stock) == (9, True)
+    assert inventory.reorder_level is None
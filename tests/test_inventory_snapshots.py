@@ -0,0 +1,47 @@
+from app.database.models import Inventory, InventorySnapshot, InventoryTransaction, Product
+from app.services.inventory_snapshot_service import InventorySnapshotService
+from datetime import datetime, timedelta
+import pytest
+
+T0 = datetime(2026, 3, 1, 12, 0, 0)
+
+@pytest.fixture
+def ledger(db):
+    """A ledger whose ids and created_at disagree: row 2 was committed late, after row 3"""
+    product = Product(name="Teak bench", code="TEAK-BENCH", category="bench", price=900000)
+    db.add(product)
+    db.flush()
+    inventory = Inventory(product_id=product.id, quantity_on_hand=12, reorder_level=2)
+    db.add(inventory)
+    db.flush()
+    for transaction_type, quantity, created_at in (
+        ("IN", 10, T0 - timedelta(hours=2)),
+        ("IN", 5, T0 + timedelta(hours=1)),
+        ("OUT", 3, T0 - timedelta(hours=1)),
+    ):
+        db.add(InventoryTransaction(
+            inventory_id=inventory.id, transaction_type=transaction_type, quantity=quantity,
+            reason="Snapshot test", created_at=created_at
+        ))
+        db.flush()
+    db.commit()
+    return product.id
+
+def test_snapshot_never_hides_a_late_ledger_row(db, ledger):
+    service = InventorySnapshotService(db)
+    assert service.compact(as_of=T0) == 1
+    
+    assert service.get_stock_at(ledger, T0).quantity_on_hand == 7
+    assert service.get_stock_at(ledger, T0 + timedelta(hours=2)).quantity_on_hand == 12
+    
+    report = service.get_movement_report(ledger, T0, T0 + timedelta(hours=2))
+    assert (report.opening_quantity, report.closing_quantity, report.total_in, report.transaction_count) == (7, 12, 5, 1)
+
+def test_compact_defaults_to_the_database_clock(db, ledger):
+    service = InventorySnapshotService(db)
+    assert service.compact() == 1
+    
+    snapshot = db.query(InventorySnapshot).one()
+    assert isinstance(snapshot.snapshot_at, datetime)
+    assert snapshot.quantity_on_hand == 12
+    assert service.get_stock_at(ledger, snapshot.snapshot_at).quantity_on_hand == 12
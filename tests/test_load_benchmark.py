@@ -0,0 +1,15 @@
+from app.cli import load_benchmark
+from app.cli.seed_dataset import seed
+import json
+
+def test_benchmark_runs_every_route_without_errors(tmp_path):
+    """Smoke run on a tiny seeded dataset: every scenario answers with an expected status"""
+    seed(products=40, customers=30, suppliers=5, sales=60, promotions=5, days=30, paid_ratio=0.5, batch_size=50)
+    output = tmp_path / "bench.json"
+    
+    exit_code = load_benchmark.main(["--requests", "4", "--concurrency", "2", "--output", str(output)])
+    
+    result = json.loads(output.read_text())
+    assert {key: stats["statuses"] for key, stats in result["endpoints"].items() if stats["errors"]} == {}
+    assert exit_code == 0
+    assert not result["not_covered"] and not result["stale_scenarios"]
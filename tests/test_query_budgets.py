@@ -0,0 +1,59 @@
+from app.database.models import (
+    Customer, Inventory, InventoryTransaction, Payment, Product, Promotion, Sale, SaleItem, Supplier, promotion_product
+)
+from datetime import date, datetime, timedelta
+import pytest
+
+@pytest.fixture
+def populated(db, admin_user):
+    """More rows than one page of every list endpoint, each with the relations the lists render"""
+    for i in range(1, 31):
+        db.add(Supplier(id=i, name=f"Supplier {i}"))
+        db.add(Product(id=i, name=f"Product {i}", code=f"P-{i}", category="chair", price=100000 + i, supplier_id=i))
+        db.add(Inventory(id=i, product_id=i, quantity_on_hand=i, reorder_level=10, is_low_stock=i <= 10))
+        db.add(Customer(id=i, name=f"Customer {i}", phone=f"09000000{i:02d}"))
+    db.flush()
+    for i in range(1, 31):
+        db.add(Sale(
+            id=i, invoice_number=f"INV-{i}", customer_id=i, user_id=admin_user.id, sale_date=datetime.now(),
+            total_amount=300000, final_amount=300000, amount_paid=100000, status="completed"
+        ))
+        db.add(SaleItem(sale_id=i, product_id=i, quantity=1, unit_price=150000, line_total=150000))
+        db.add(SaleItem(sale_id=i, product_id=(i % 30) + 1, quantity=1, unit_price=150000, line_total=150000))
+        db.add(Payment(sale_id=i, payment_method="CASH", amount=100000, status="completed"))
+    for i in range(1, 61):
+        db.add(InventoryTransaction(inventory_id=(i % 30) + 1, transaction_type="IN", quantity=1, reason="Receipt"))
+    for i in range(1, 26):
+        db.add(Promotion(
+            id=i, name=f"Promotion {i}", discount_type="PERCENTAGE", discount_value=10,
+            start_date=date.today() - timedelta(days=1), end_date=date.today() + timedelta(days=30)
+        ))
+    db.flush()
+    db.execute(promotion_product.insert(), [{"promotion_id": i, "product_id": i} for i in range(1, 26)])
+    db.commit()
+
+# Queries per request for one page of each list endpoint. Related rows are loaded per page, not per
+# row, so every budget is a small constant well below the page size: a lazy load added inside a list
+# loop (N+1) exceeds it. Authentication is overridden, so the real user lookup is not counted.
+BUDGETS = {
+    "/api/products/?page=1&limit=20": 3,
+    "/api/customers/?page=1&limit=20": 3,
+    "/api/suppliers/?page=1&limit=20": 2,
+    "/api/sales/?page=1&limit=20": 4,
+    "/api/sales/outstanding?page=1&limit=20": 4,
+    "/api/payments/?page=1&limit=20": 4,
+    "/api/promotions/?page=1&limit=20": 2,
+    "/api/promotions/active/list": 3,
+    "/api/inventory/?skip=0&limit=20": 1,
+    "/api/inventory/transactions?skip=0&limit=50": 2,
+    "/api/inventory/low-stock/list": 1,
+    "/api/reports/customers?page=1&limit=20": 2,
+    "/api/reports/inventory?page=1&limit=20": 2,
+}
+
+@pytest.mark.parametrize("path", sorted(BUDGETS))
+def test_list_endpoint_query_budget(client, populated, max_queries, path):
+    with max_queries(BUDGETS[path]):
+        response = client.get(path)
+    assert response.status_code == 200
+    assert response.json()["data"]
@@ -0,0 +1,85 @@
+from app.database.db import Base, engine
+from app.database.models import Customer, Inventory, InventoryTransaction, Payment, Product, Sale, SaleItem, User
+from app.services.inventory_service import InventoryService
+from app.services.payment_service import PaymentService
+from app.services.report_service import ReportService
+from app.services.sale_service import SaleService
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event
+import pytest
+import re
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite syntax")
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(.*)$")
+
+# Service calls behind the list, report and dashboard endpoints. Unfiltered inventory status
+# counts are left out: they aggregate every inventory row, and a covering index for them would
+# slow down every stock update.
+HOT_QUERIES = {
+    "revenue_report": lambda db: ReportService(db).get_revenue_report(30),
+    "top_products": lambda db: ReportService(db).get_top_products(10),
+    "dashboard_summary": lambda db: ReportService(db).get_dashboard_summary(),
+    "customer_report": lambda db: ReportService(db).get_customer_report(0, 20),
+    "customer_report_count": lambda db: ReportService(db).get_customer_report_count(),
+    "inventory_report": lambda db: ReportService(db).get_inventory_report(0, 20, "low", "chair"),
+    "inventory_report_count": lambda db: ReportService(db).get_inventory_report_count("low", "chair"),
+    "inventory_status_counts_by_category": lambda db: ReportService(db).get_inventory_status_counts("chair"),
+    "outstanding_sales": lambda db: SaleService(db).get_outstanding_sales(0, 20),
+    "outstanding_sales_by_customer": lambda db: SaleService(db).get_outstanding_sales(0, 20, customer_id=1),
+    "sales_by_status": lambda db: SaleService(db).get_all_sales(0, 20, status_filter="completed"),
+    "payments_by_status": lambda db: PaymentService(db).get_all_payments(0, 20, status="completed"),
+    "low_stock": lambda db: InventoryService.get_low_stock_products(db),
+    "inventory_transactions": lambda db: InventoryService.get_transactions_list(db, 0, 20),
+}
+
+@contextmanager
+def _captured_selects():
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+def _full_table_scans(statement: str, parameters) -> list:
+    """Plan lines that read a table without any index"""
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    scans = []
+    for row in plan:
+        match = _SCAN.match(row[-1])
+        if match and match.group(1) in Base.metadata.tables and "USING" not in match.group(2):
+            scans.append(row[-1])
+    return scans
+
+@pytest.fixture
+def seeded(db):
+    db.add(User(id=1, username="admin", email="admin@example.com", hashed_password="x", role="admin"))
+    db.add(Customer(id=1, name="Customer 1", phone="0900000001"))
+    db.add(Product(id=1, name="Oak chair", code="OAK-CHAIR", category="chair", price=500000))
+    db.add(Inventory(id=1, product_id=1, quantity_on_hand=3, reorder_level=10, is_low_stock=True))
+    db.add(InventoryTransaction(inventory_id=1, transaction_type="IN", quantity=3, reason="Opening stock"))
+    db.add(Sale(
+        id=1, invoice_number="INV-1", customer_id=1, user_id=1, sale_date=datetime.now(),
+        total_amount=500000, final_amount=500000, amount_paid=200000, status="completed"
+    ))
+    db.add(SaleItem(sale_id=1, product_id=1, quantity=1, unit_price=500000, line_total=500000))
+    db.add(Payment(sale_id=1, payment_method="CASH", amount=200000, status="completed"))
+    db.commit()
+    return db
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_indexes(seeded, name):
+    with _captured_selects() as statements:
+        HOT_QUERIES[name](seeded)
+    assert statements
+    
+    scans = {statement: _full_table_scans(statement, parameters) for statement, parameters in statements}
+    assert not {s: p for s, p in scans.items() if p}, f"{name} runs a full table scan"
@@ -0,0 +1,47 @@
+from app.database.db import SessionLocal, engine
+from app.database.models import Inventory, Product, StockReservation
+from app.services.reservation_service import RESERVATION_EXPIRED, RESERVATION_RELEASED, ReservationService
+from sqlalchemy import event
+import pytest
+
+@pytest.fixture
+def held(db):
+    """Two expired HELD reservations of 2 units each on one inventory row"""
+    product = Product(name="Walnut desk", code="WALNUT-DESK", category="desk", price=2500000)
+    db.add(product)
+    db.flush()
+    db.add(Inventory(product_id=product.id, quantity_on_hand=10, reorder_level=2))
+    db.commit()
+    service = ReservationService(db)
+    ids = [service.reserve(product.id, 2, ttl_seconds=-1).id for _ in range(2)]
+    return product.id, ids
+
+@pytest.mark.parametrize("update_returning", [True, False], ids=["returning", "rowcount"])
+def test_expire_stale_skips_holds_released_after_its_select(db, held, monkeypatch, update_returning):
+    product_id, (raced_id, stale_id) = held
+    monkeypatch.setattr(engine.dialect, "update_returning", update_returning)
+    
+    # A release lands between the sweeper's SELECT and its status UPDATE
+    raced = []
+    
+    def release_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE stock_reservations") and not raced:
+            raced.append(raced_id)
+            other = SessionLocal()
+            try:
+                ReservationService(other).release(raced_id)
+            finally:
+                other.close()
+    
+    event.listen(engine, "before_cursor_execute", release_first)
+    try:
+        assert ReservationService(db).expire_stale() == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", release_first)
+    assert raced
+    
+    db.expire_all()
+    statuses = dict(db.query(StockReservation.id, StockReservation.status))
+    assert statuses == {raced_id: RESERVATION_RELEASED, stale_id: RESERVATION_EXPIRED}
+    inventory = db.query(Inventory).filter(Inventory.product_id == product_id).one()
+    assert inventory.quantity_reserved == 0
@@ -0,0 +1,44 @@
+from alembic import command
+from alembic.config import Config
+from app.core.config import settings
+from app.database.schema_check import ALEMBIC_INI, SchemaRevisionError, legacy_revision
+from sqlalchemy import create_engine, text
+import os
+import pytest
+
+@pytest.fixture
+def scratch(tmp_path, monkeypatch):
+    """Empty SQLite database that migrations/env.py will target, and a helper to migrate it"""
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    engine = create_engine(url)
+    config = Config()
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    yield engine, lambda revision: command.upgrade(config, revision)
+    engine.dispose()
+
+def _drop_version_table(engine):
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+
+@pytest.mark.parametrize("revision", ["0001", "0005", "0011"])
+def test_unversioned_schema_matches_its_revision(scratch, revision):
+    engine, upgrade = scratch
+    upgrade(revision)
+    assert legacy_revision(engine) is None
+    
+    _drop_version_table(engine)
+    assert legacy_revision(engine) == revision
+
+def test_empty_database_is_not_legacy(scratch):
+    engine, _ = scratch
+    assert legacy_revision(engine) is None
+
+def test_schema_with_a_gap_is_refused(scratch):
+    engine, upgrade = scratch
+    upgrade("0001")
+    _drop_version_table(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE inventory_snapshots (id INTEGER PRIMARY KEY)"))
+    with pytest.raises(SchemaRevisionError):
+        legacy_revision(engine)